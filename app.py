@@ -15,7 +15,11 @@ from drillmodules.drill_string.select_drilling_apparatus import (
     selected_drill_pipes,
     selected_drill_collars,
 )
+from drillmodules.drill_string.buckling import buckling_profile
 from drillmodules.rss_model.rss import RSSDataGenerator, SimulatedStation
+from drillmodules.well_plan.well_path import WellPath
+from drillmodules.well_plan.diff import diff_paths, changed_intervals
+from drillmodules.well_plan.workbook import load_well
 
 if "gen_well" not in st.session_state:
     st.session_state.gen_well = InterpWell()
@@ -70,6 +74,14 @@ def well_inputs():
     formation_aggr = []
     ccs = []
 
+    st.sidebar.subheader("Drillbotics Workbook")
+    workbook_path = st.sidebar.text_input("Targets/formations workbook (.xlsx path)", "")
+    if workbook_path and st.sidebar.button("Load workbook"):
+        try:
+            load_well(workbook_path, well)
+        except Exception as e:
+            display_error(f"Could not load workbook '{workbook_path}': {e}")
+
     st.sidebar.subheader("Rig Coordinates")
     rig_coord = st.sidebar.text_input(
         "Enter Rig Position Coordinates(East,North,Depth)",
@@ -224,12 +236,12 @@ def setup_well(inputted_data):
     if kop == 0:
         well.suggest_kop()
 
-    max_dls_row = well_data[well_data["dls"] == well_data["dls"].max()]
-    x = max_dls_row["X"].values[0]
-    y = max_dls_row["Y"].values[0]
-    z = max_dls_row["Z"].values[0]
-    md = max_dls_row["md"].values[0]
-    max_dls = max_dls_row["dls"].values[0]
+    # The plan's dls is in radians per 100 ft and its md is not along hole
+    plan_path = WellPath.from_well_data(well_data)
+    row = int(np.argmax(well_data["dls"].to_numpy()))
+    x, y, z = plan_path.x[row], plan_path.y[row], plan_path.z[row]
+    md = plan_path.along_hole_depth[row]
+    max_dls = np.degrees(well_data["dls"].iloc[row])
 
     st.markdown(
         f"<h4 style='color: rgb(200,100,100)'>[Max Dogleg: {max_dls:.2f}° per 100 ft @ ({x:.2f},{y:.2f},{z:.2f}), MD of {md:.2f}]</h4>",
@@ -325,7 +337,16 @@ def best_choices(tool, tool_selection_instance):
     num = st.sidebar.number_input(
         f"Number of best Drill {tool.capitalize()}:", 1, 30, 5, 1
     )
-    selected = tool_selection_instance.get_optimum(num)
+    weights = {}
+    if tool == "strings":
+        # Scores are cached per pipe, so re-ranking on a change is instant
+        weights["tw"] = st.sidebar.slider("Torque weight", 0.0, 1.0, 0.1, 0.05)
+        weights["dw"] = st.sidebar.slider("Drag weight", 0.0, 1.0, 0.1, 0.05)
+        weights["bw"] = st.sidebar.slider("Buckling weight", 0.0, 1.0, 0.8, 0.05)
+        if sum(weights.values()) == 0:
+            display_error("At least one of the weights must be above 0")
+            weights = {}
+    selected = tool_selection_instance.get_optimum(num, **weights)
     best = selected[f"Best {tool}"]
 
     best_choices = []
@@ -542,6 +563,23 @@ def display_simulated_graph():
     st.plotly_chart(fig)
 
 
+def display_plan_diff(plan_data, rss_data):
+    """Shows where the simulated path departs from the plan"""
+    try:
+        path_diff = diff_paths(plan_data, rss_data)
+    except ValueError:
+        return
+
+    with st.expander("What changed (Plan vs Simulation)"):
+        summary = path_diff.summary
+        st.markdown(
+            f"Max separation: <b>{summary['max separation']:.2f} ft</b> @ MD {summary['max separation md']:.2f}, "
+            f"final separation: <b>{summary['final separation']:.2f} ft</b>",
+            unsafe_allow_html=True,
+        )
+        st.dataframe(changed_intervals(path_diff, tolerance=10))
+
+
 def display_parameters():
     data = st.session_state.cumulating_rss_data
     target = st.session_state.rss_current_target
@@ -602,10 +640,8 @@ def display_current_sim(sim_placeholder, buckling_placeholder, tob_placeholder):
         buckling = 0 if np.isnan(buckling) else buckling
 
         buckling_intensity = (
-            "primary"
-            if buckling < st.session_state.drillpipe._buckling_force(1000)
-            else "danger"
-        )  # NOTE: Axial force should not be dtermined here
+            "danger" if rss_data is not None and drilled_buckling(rss_data) else "primary"
+        )
         st.markdown(
             f"<span class='btn alert alert-{buckling_intensity}'><b>Buckling</b>: <br> {buckling:.2f}<span>",
             unsafe_allow_html=True,
@@ -619,6 +655,32 @@ def display_current_sim(sim_placeholder, buckling_placeholder, tob_placeholder):
         )
 
 
+def drilled_buckling(rss_data):
+    """
+    `True` if the chosen string buckles anywhere along the drilled path,
+    from its effective axial force profile at the current WOB
+    """
+    coords = np.array([station.coordinates for station in rss_data], dtype=float)
+    if len(np.unique(coords, axis=0)) < 2:
+        return False
+
+    drilled_path = WellPath(
+        *coords.T,
+        inclination=[station.inclination for station in rss_data],
+        azimuth=[station.azimuth for station in rss_data],
+        md=[station.md for station in rss_data],
+    )
+    drillcollar = st.session_state.drillcollar
+    profile = buckling_profile(
+        drilled_path,
+        st.session_state.drillpipe,
+        drillcollar,
+        getattr(drillcollar, "collar_length", 0),
+        rss_data[-1].wob,
+    )
+    return bool(profile.sinusoidal.any())
+
+
 def plot_rop():
     data = st.session_state.cumulating_rss_data
     rop = [station.rop_axial for station in data]
@@ -750,6 +812,7 @@ def simulation_display():
                     )
 
                 st.dataframe(simulation_data)
+                display_plan_diff(plan_data, namedtuple_data)
                 break
 
             display_current_sim(
@@ -802,25 +865,26 @@ def change_simulation_state(action):
 
 def prepare_drillstring_choice():
     well_data = st.session_state.gen_well.output_data[0]
-    selected_drillpipes = selected_drill_pipes(
+    selected_drillcollars = selected_drill_collars(
         well_data=well_data,
-        friction_co=0.2,
-        string_force=324,
         youngs_modulus=30000000,
         inner_mud_weight=15,
         outer_mud_weight=7.3,
         hole_diameter=10,
-        internal_fluid_pressure=12800,
-        external_fluid_pressure=4790,
-        buoyancy_factor=0.8,
     )
 
-    selected_drillcollars = selected_drill_collars(
+    # Pipes are screened above the best collar, over its collar length
+    best_collar = selected_drillcollars.get_optimum(1)["Best collars"][0]
+    selected_drillpipes = selected_drill_pipes(
         well_data=well_data,
+        friction_co=0.2,
+        string_force=324,
         youngs_modulus=30000000,
         inner_mud_weight=15,
         outer_mud_weight=7.3,
         hole_diameter=10,
+        buoyancy_factor=0.8,
+        drillcollar=best_collar,
     )
 
     st.session_state.selected_drillpipes = selected_drillpipes
@@ -1,3 +1,13 @@
+from collections import namedtuple
+import numpy as np
+
+
+BitSweep = namedtuple(
+    "BitSweep",
+    ["WOB", "RPM", "formation_aggressiveness", "CCS", "ROP", "ROPlateral", "TOB"],
+)
+
+
 def rop_tob_drillbotics(
     formation_aggressiveness,
     bit_aggressiveness_factor,
@@ -31,8 +41,34 @@ def rop_tob_drillbotics(
         - CCS: [psi] (confined compressive strength of the rock)
         - side_force: [] (scaling factor for side cutting aggressiveness of the bit)
 
-    Returns: ROP, ROPlateral, TOB
+    Every input may be a scalar or an array; arrays broadcast against each
+    other with numpy rules, so whole grids are evaluated in one call.
+
+    Returns: ROP, ROPlateral, TOB (floats for scalar inputs, else arrays)
     """
+    inputs = (
+        formation_aggressiveness,
+        bit_aggressiveness_factor,
+        WOB,
+        RPM,
+        Eff,
+        D,
+        CCS,
+        side_force,
+        side_cutting_factor,
+    )
+    if not all(np.ndim(i) == 0 for i in inputs):
+        (
+            formation_aggressiveness,
+            bit_aggressiveness_factor,
+            WOB,
+            RPM,
+            Eff,
+            D,
+            CCS,
+            side_force,
+            side_cutting_factor,
+        ) = (np.asarray(i, dtype=float) for i in inputs)
 
     mu = formation_aggressiveness * bit_aggressiveness_factor
     ROP = (
@@ -44,3 +80,58 @@ def rop_tob_drillbotics(
     ROPlateral = side_cutting_factor * side_force * RPM / (D * CCS)  # [ft/hr]
 
     return ROP, ROPlateral, TOB
+
+
+def rop_tob_sweep(
+    WOB,
+    RPM,
+    formation_aggressiveness,
+    CCS,
+    bit_aggressiveness_factor=1.2,
+    Eff=0.35,
+    D=12.25,
+    side_force=0.3,
+    side_cutting_factor=1.1,
+):
+    """
+    Evaluates `rop_tob_drillbotics` over a full WOB x RPM x formation grid
+    in one vectorized call.
+
+    Input Variables, Units:
+        - WOB: [lbs] 1D array of weights on bit
+        - RPM: [RPM] 1D array of bit speeds
+        - formation_aggressiveness: [] 1D array, one value per formation
+        - CCS: [psi] 1D array, one value per formation
+        - the other inputs are as in `rop_tob_drillbotics`; each may also be
+          an array broadcastable to (formations,)
+
+    Returns: BitSweep with ROP, ROPlateral and TOB cubes of shape
+        (len(WOB), len(RPM), formations)
+    """
+    WOB = np.asarray(WOB, dtype=float).ravel()
+    RPM = np.asarray(RPM, dtype=float).ravel()
+    formation_aggressiveness = np.asarray(formation_aggressiveness, dtype=float).ravel()
+    CCS = np.asarray(CCS, dtype=float).ravel()
+
+    rop, rop_lateral, tob = rop_tob_drillbotics(
+        formation_aggressiveness=formation_aggressiveness[None, None, :],
+        bit_aggressiveness_factor=bit_aggressiveness_factor,
+        WOB=WOB[:, None, None],
+        RPM=RPM[None, :, None],
+        Eff=Eff,
+        D=D,
+        CCS=CCS[None, None, :],
+        side_force=side_force,
+        side_cutting_factor=side_cutting_factor,
+    )
+    shape = (len(WOB), len(RPM), len(CCS))
+
+    return BitSweep(
+        WOB=WOB,
+        RPM=RPM,
+        formation_aggressiveness=formation_aggressiveness,
+        CCS=CCS,
+        ROP=np.broadcast_to(rop, shape),
+        ROPlateral=np.broadcast_to(rop_lateral, shape),
+        TOB=np.broadcast_to(tob, shape),
+    )
@@ -0,0 +1,118 @@
+"""
+Bit Model Calibration module
+
+This module fits the coefficients of `rop_tob_drillbotics` per formation
+interval from drilling logs (recorded, or simulated by `RSSDataGenerator`):
+
+    - bit_aggressiveness_factor from TOB = D * mu * WOB / 36
+    - Eff from ROP = 13.33 * RPM * mu * WOB * Eff / (D * CCS)
+    - side_cutting_factor from ROPlateral = scf * side_force * RPM / (D * CCS)
+
+Each is a one-coefficient least squares fit through the origin, so every
+interval's fit is two sums; the sums of all intervals are taken at once
+with `np.bincount`.
+"""
+import numpy as np
+import pandas as pd
+
+from drillmodules.formation.schedule import DepthSchedule, merge_breakpoints
+
+LOG_COLUMNS = ["depth", "WOB", "RPM", "ROP", "TOB", "ROPlateral"]
+
+
+def _log_frame(logs):
+    """Log columns from a DataFrame, a dict or `SimulatedStation`s"""
+    if isinstance(logs, (pd.DataFrame, dict)):
+        return pd.DataFrame(logs)
+
+    stations = list(logs)
+    return pd.DataFrame(
+        {
+            "depth": [s.coordinates[-1] for s in stations],
+            "WOB": [s.wob for s in stations],
+            "RPM": [s.rpm for s in stations],
+            "ROP": [s.rop_axial for s in stations],
+            "TOB": [s.tob for s in stations],
+            "ROPlateral": [s.rop_lateral for s in stations],
+        }
+    )
+
+
+def _fit_through_origin(x, y, interval, intervals):
+    """Least squares slope of y = c * x for every interval; NaN if unfit"""
+    valid = np.isfinite(x) & np.isfinite(y)
+    sxy = np.bincount(interval[valid], weights=(x * y)[valid], minlength=intervals)
+    sxx = np.bincount(interval[valid], weights=(x * x)[valid], minlength=intervals)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(sxx > 0, sxy / sxx, np.nan)
+
+
+def calibrate_bit(
+    logs,
+    formation_aggressiveness,
+    CCS,
+    intervals=None,
+    D=12.25,
+    side_force=0.3,
+):
+    """
+    Fits bit model coefficients for every interval of a log
+
+    Input Variables, Units:
+        - logs: DataFrame/dict with columns "depth" [ft], "WOB" [lbs],
+            "RPM", "ROP" [ft/hr], "TOB" [ft-lbs] and optionally
+            "ROPlateral" [ft/hr]; or `SimulatedStation`s
+        - formation_aggressiveness, CCS: [(depth, value)] or `DepthSchedule`
+        - intervals: depths where the intervals start; defaults to the
+            formation breakpoints
+        - D: [inches] bit diameter
+        - side_force: [] side cutting aggressiveness (scalar or per sample)
+
+    Returns: dict of step `DepthSchedule`s for "bit_aggressiveness_factor",
+        "Eff" and "side_cutting_factor", which `RSSDataGenerator` takes as
+        they are. Intervals without usable samples keep the value of the
+        interval above them (or below, at the top).
+    """
+    logs = _log_frame(logs)
+    formation_aggressiveness = DepthSchedule.from_pairs(formation_aggressiveness)
+    CCS = DepthSchedule.from_pairs(CCS)
+    if intervals is None:
+        intervals, _ = merge_breakpoints(formation_aggressiveness, CCS)
+    intervals = np.unique(np.asarray(intervals, dtype=float))
+
+    depth = logs["depth"].to_numpy(dtype=float)
+    column = {
+        name: logs[name].to_numpy(dtype=float) if name in logs else np.full(len(logs), np.nan)
+        for name in LOG_COLUMNS
+    }
+    fa = formation_aggressiveness(depth)
+    ccs = CCS(depth)
+
+    # Samples above the first interval go into the first one
+    interval = np.clip(np.searchsorted(intervals, depth, side="right") - 1, 0, None)
+    count = len(intervals)
+
+    bit_aggressiveness = _fit_through_origin(
+        D * fa * column["WOB"] / 36, column["TOB"], interval, count
+    )
+    mu = fa * bit_aggressiveness[interval]
+    Eff = _fit_through_origin(
+        13.33 * column["RPM"] * mu * column["WOB"] / (D * ccs), column["ROP"], interval, count
+    )
+    side_cutting = _fit_through_origin(
+        side_force * column["RPM"] / (D * ccs), column["ROPlateral"], interval, count
+    )
+
+    def schedule(values):
+        fitted = np.isfinite(values)
+        depths = intervals[fitted]
+        if len(depths):
+            # The first fitted value also covers unfitted intervals above it
+            depths[0] = intervals[0]
+        return DepthSchedule(depths, values[fitted])
+
+    return {
+        "bit_aggressiveness_factor": schedule(bit_aggressiveness),
+        "Eff": schedule(Eff),
+        "side_cutting_factor": schedule(side_cutting),
+    }
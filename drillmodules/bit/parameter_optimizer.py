@@ -0,0 +1,228 @@
+"""
+Drilling Parameter Optimizer module
+
+This module chooses WOB and RPM for every formation interval, either for
+maximum ROP or for minimum mechanical specific energy (MSE), under torque
+and buckling (WOB) limits. Given the string, the WOB limit of every
+interval is the largest WOB that does not buckle it with the bit there
+(`buckling_limited_wob`).
+
+Every formation's whole WOB x RPM grid is evaluated at once with
+`rop_tob_sweep`. Optima are cached by formation signature, so repeated
+formations and reruns cost nothing; the cache keeps the `CACHE_SIZE` most
+recently used optima.
+"""
+from collections import OrderedDict
+import numpy as np
+
+from drillmodules.bit.bit_model import rop_tob_sweep
+from drillmodules.drill_string.buckling import buckling_limited_wob
+from drillmodules.formation.schedule import merge_breakpoints
+
+DEFAULT_WOB_GRID = np.linspace(2000, 60000, 59)  # [lbs]
+DEFAULT_RPM_GRID = np.linspace(40, 200, 33)  # [RPM]
+
+# Formation signature -> (WOB, RPM, ROP, TOB, MSE), least recently used first
+CACHE_SIZE = 4096
+_optimum_cache = OrderedDict()
+
+
+def mechanical_specific_energy(WOB, RPM, TOB, ROP, D):
+    """
+    Teale's mechanical specific energy [psi]
+
+    Input Variables, Units:
+        - WOB: [lbs], RPM: [RPM], TOB: [ft-lbs], ROP: [ft/hr], D: [inches]
+    """
+    area = np.pi * np.asarray(D, dtype=float) ** 2 / 4
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rotary = 120 * np.pi * RPM * TOB / (area * ROP)
+    return WOB / area + np.where(np.asarray(ROP) > 0, rotary, np.inf)
+
+
+def optimize_parameters(
+    formation_aggressiveness,
+    CCS,
+    objective="rop",
+    bit_aggressiveness_factor=1.2,
+    Eff=0.35,
+    D=12.25,
+    side_force=0.3,
+    side_cutting_factor=1.1,
+    max_torque=np.inf,
+    max_wob=np.inf,
+    min_rop=0,
+    mse_tolerance=0.01,
+    WOB_grid=DEFAULT_WOB_GRID,
+    RPM_grid=DEFAULT_RPM_GRID,
+    well_path=None,
+    drillpipe=None,
+    drillcollar=None,
+    collar_length=None,
+):
+    """
+    Optimum WOB/RPM schedule for the formation intervals of a well
+
+    Input Variables, Units:
+        - formation_aggressiveness: [(depth, value)] or `DepthSchedule`
+        - CCS: [(depth, psi)] or `DepthSchedule`
+        - objective: "rop" for maximum ROP or "mse" for minimum MSE
+        - max_torque: [ft-lbs] torque on bit limit (e.g. connection MUT)
+        - max_wob: [lbs] weight on bit limit
+        - min_rop: [ft/hr] slowest acceptable ROP when minimizing MSE
+        - mse_tolerance: parameters within this fraction of the minimum
+          MSE are equally efficient and the fastest of them wins; MSE
+          barely changes over the grid (the rotary term does not depend
+          on RPM), so the bare minimum is arbitrary
+        - WOB_grid, RPM_grid: candidate WOBs [lbs] and RPMs
+        - well_path, drillpipe, drillcollar, collar_length: optional
+          string (as in `buckling_profile`); every interval's WOB is then
+          also kept below the string's `buckling_limited_wob` with the bit
+          in that interval. The collar's own `collar_length` by default
+        - other inputs as in `rop_tob_drillbotics`
+
+    Returns: dict of (depth, value) schedules for "WOB", "RPM", "ROP",
+        "TOB" and "MSE", one entry per formation interval. Intervals with
+        no feasible parameters get NaNs; `RSSDataGenerator` drills those
+        with its default WOB ramp and RPM.
+    """
+    if objective not in ("rop", "mse"):
+        raise Exception(f"Invalid optimization objective, '{objective}'!")
+
+    depths, (aggressiveness, ccs) = merge_breakpoints(formation_aggressiveness, CCS)
+    WOB_grid = np.asarray(WOB_grid, dtype=float)
+    RPM_grid = np.asarray(RPM_grid, dtype=float)
+
+    max_wobs = np.full(len(depths), max_wob, dtype=float)
+    if well_path is not None and (drillpipe is not None or drillcollar is not None):
+        if collar_length is None:
+            collar_length = getattr(drillcollar, "collar_length", 0)
+        max_wobs = np.minimum(
+            max_wobs,
+            buckling_limited_wob(
+                well_path, drillpipe, drillcollar, collar_length, WOB_grid, depths
+            ),
+        )
+
+    settings = (
+        objective,
+        bit_aggressiveness_factor,
+        Eff,
+        D,
+        side_force,
+        side_cutting_factor,
+        max_torque,
+        min_rop,
+        mse_tolerance,
+        WOB_grid.tobytes(),
+        RPM_grid.tobytes(),
+    )
+    signatures = [
+        (a, c, w) + settings for a, c, w in zip(aggressiveness, ccs, max_wobs.tolist())
+    ]
+    missing = sorted({sig for sig in signatures if sig not in _optimum_cache})
+
+    if missing:
+        _optimum_cache.update(
+            zip(
+                missing,
+                _solve(
+                    np.array([m[0] for m in missing]),
+                    np.array([m[1] for m in missing]),
+                    objective,
+                    bit_aggressiveness_factor,
+                    Eff,
+                    D,
+                    side_force,
+                    side_cutting_factor,
+                    max_torque,
+                    np.array([m[2] for m in missing]),
+                    min_rop,
+                    mse_tolerance,
+                    WOB_grid,
+                    RPM_grid,
+                ),
+            )
+        )
+
+    optima = [_optimum_cache[sig] for sig in signatures]
+    for sig in signatures:
+        _optimum_cache.move_to_end(sig)
+    while len(_optimum_cache) > CACHE_SIZE:
+        _optimum_cache.popitem(last=False)
+
+    return {
+        name: [(depth, optimum[i]) for depth, optimum in zip(depths.tolist(), optima)]
+        for i, name in enumerate(("WOB", "RPM", "ROP", "TOB", "MSE"))
+    }
+
+
+def _solve(
+    aggressiveness,
+    ccs,
+    objective,
+    bit_aggressiveness_factor,
+    Eff,
+    D,
+    side_force,
+    side_cutting_factor,
+    max_torque,
+    max_wob,
+    min_rop,
+    mse_tolerance,
+    WOB_grid,
+    RPM_grid,
+):
+    """
+    Optimum (WOB, RPM, ROP, TOB, MSE) of every formation in one sweep;
+    `max_wob` has one value per formation
+    """
+    sweep = rop_tob_sweep(
+        WOB=WOB_grid,
+        RPM=RPM_grid,
+        formation_aggressiveness=aggressiveness,
+        CCS=ccs,
+        bit_aggressiveness_factor=bit_aggressiveness_factor,
+        Eff=Eff,
+        D=D,
+        side_force=side_force,
+        side_cutting_factor=side_cutting_factor,
+    )
+    wob = sweep.WOB[:, None, None]
+    rpm = sweep.RPM[None, :, None]
+    mse = mechanical_specific_energy(wob, rpm, sweep.TOB, sweep.ROP, D)
+
+    feasible = (sweep.TOB <= max_torque) & (wob <= max_wob) & (sweep.ROP >= min_rop)
+    if objective == "mse":
+        # The fastest of the parameters within tolerance of the least MSE
+        least = np.min(np.where(feasible, mse, np.inf), axis=(0, 1))
+        feasible &= mse <= least * (1 + mse_tolerance)
+    score = np.where(feasible, -sweep.ROP, np.inf)
+
+    # (WOB x RPM, formations) -> best grid point per formation
+    flat = score.reshape(-1, score.shape[-1])
+    best = np.argmin(flat, axis=0)
+    formations = np.arange(flat.shape[1])
+    found = np.isfinite(flat[best, formations])
+    w_idx, r_idx = np.unravel_index(best, score.shape[:2])
+
+    def pick(cube):
+        values = np.broadcast_to(cube, score.shape)[w_idx, r_idx, formations]
+        return np.where(found, values, np.nan)
+
+    results = np.stack(
+        (
+            np.where(found, sweep.WOB[w_idx], np.nan),
+            np.where(found, sweep.RPM[r_idx], np.nan),
+            pick(sweep.ROP),
+            pick(sweep.TOB),
+            pick(mse),
+        ),
+        axis=1,
+    )
+    return [tuple(row) for row in results.tolist()]
+
+
+def clear_cache():
+    """Forgets every cached optimum"""
+    _optimum_cache.clear()
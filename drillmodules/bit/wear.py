@@ -0,0 +1,182 @@
+"""
+Bit Wear module
+
+This module tracks how dull the bit gets as it drills. Every step adds
+bit work (WOB x revolutions / rock strength) to a running prefix sum, and
+the drilling efficiency drops with the cumulative work:
+
+    Eff_worn = Eff * max(min_efficiency, exp(-wear_coefficient * work))
+
+Because the work is kept as a prefix sum, the wear state after any step
+(or over any interval) is an O(1) lookup.
+"""
+import numpy as np
+
+WEAR_COEFFICIENT = 1e-8  # [1 / (lbs rev / psi)]
+MIN_EFFICIENCY = 0.2  # Fraction of the sharp bit efficiency left when dull
+
+
+def work_increments(WOB, RPM, CCS, hours):
+    """
+    Bit work of drilling steps
+
+    Input Variables, Units:
+        - WOB: [lbs], RPM: [RPM], CCS: [psi], hours: [hr] step durations
+
+    Every input may be a scalar or an array.
+
+    Returns: WOB x revolutions / CCS [lbs rev / psi]
+    """
+    return np.asarray(WOB, dtype=float) * (60 * np.asarray(RPM) * hours) / CCS
+
+
+def wear_efficiency(work, wear_coefficient=WEAR_COEFFICIENT, min_efficiency=MIN_EFFICIENCY):
+    """Fraction of the sharp bit efficiency left after cumulative `work`"""
+    return np.maximum(min_efficiency, np.exp(-wear_coefficient * np.asarray(work)))[()]
+
+
+class BitWear:
+    """
+    Wear state of a bit as a prefix sum of the work of every step
+
+    Attributes:
+    -----------
+        - wear_coefficient: How fast efficiency drops with work
+        - min_efficiency: Efficiency fraction of a fully dull bit
+        - cumulative: Work done after 0, 1, ... len(self) steps
+
+    Steps are added all at once (`BitWear(increments)`) or one at a time
+    while simulating (`append`).
+    """
+
+    def __init__(
+        self,
+        increments=(),
+        wear_coefficient=WEAR_COEFFICIENT,
+        min_efficiency=MIN_EFFICIENCY,
+        initial_work=0,
+    ):
+        increments = np.asarray(increments, dtype=float).ravel()
+        self.wear_coefficient = wear_coefficient
+        self.min_efficiency = min_efficiency
+        self._size = len(increments)
+        self._cumulative = np.empty(max(64, 2 * (self._size + 1)))
+        self._cumulative[0] = initial_work
+        self._cumulative[1 : self._size + 1] = initial_work + np.cumsum(increments)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def cumulative(self):
+        cumulative = self._cumulative[: self._size + 1]
+        cumulative.setflags(write=False)
+        return cumulative
+
+    def append(self, increment):
+        """Adds the work of one more step"""
+        if self._size + 1 == len(self._cumulative):
+            self._cumulative = np.concatenate(
+                (self._cumulative, np.empty(len(self._cumulative)))
+            )
+        self._cumulative[self._size + 1] = self._cumulative[self._size] + increment
+        self._size += 1
+
+    def work_at(self, step=None):
+        """Cumulative work after `step` steps (all steps by default)"""
+        return self._cumulative[self._size if step is None else step]
+
+    def work_between(self, start, end):
+        """Work done from step `start` to step `end`"""
+        return self._cumulative[end] - self._cumulative[start]
+
+    def efficiency_at(self, step=None):
+        """Efficiency fraction after `step` steps (all steps by default)"""
+        return wear_efficiency(self.work_at(step), self.wear_coefficient, self.min_efficiency)
+
+    @property
+    def efficiency(self):
+        """Efficiency fraction at the start of every step"""
+        return wear_efficiency(
+            self._cumulative[: self._size], self.wear_coefficient, self.min_efficiency
+        )
+
+
+def wear_along_depth(
+    delta_depth,
+    WOB,
+    RPM,
+    CCS,
+    ROP,
+    initial_work=0,
+    wear_coefficient=WEAR_COEFFICIENT,
+    min_efficiency=MIN_EFFICIENCY,
+):
+    """
+    Wear of a bit drilling consecutive depth intervals, without stepping
+
+    With exponential wear the work per foot grows as the bit dulls, but
+    the efficiency falls linearly with the prefix sum of the sharp bit
+    work per foot, so the whole profile is one cumsum.
+
+    Input Variables, Units:
+        - delta_depth: [ft] length of every interval
+        - WOB: [lbs], RPM: [RPM], CCS: [psi] per interval (or scalars)
+        - ROP: [ft/hr] sharp bit ROP per interval (or scalar)
+        - initial_work: work the bit has already done
+
+    Returns: (efficiency at the end of every interval, hours spent in
+        every interval, BitWear with one step per interval)
+    """
+    efficiency, hours, work = wear_profile(
+        delta_depth, WOB, RPM, CCS, ROP, initial_work, wear_coefficient, min_efficiency
+    )
+    wear = BitWear(
+        np.diff(work, prepend=initial_work),
+        wear_coefficient=wear_coefficient,
+        min_efficiency=min_efficiency,
+        initial_work=initial_work,
+    )
+    return efficiency, hours, wear
+
+
+def wear_profile(
+    delta_depth,
+    WOB,
+    RPM,
+    CCS,
+    ROP,
+    initial_work=0,
+    wear_coefficient=WEAR_COEFFICIENT,
+    min_efficiency=MIN_EFFICIENCY,
+):
+    """
+    `wear_along_depth` for many scenarios at once: inputs broadcast to
+    (..., intervals) and the intervals run along the last axis
+
+    Returns: (efficiency, hours, cumulative work), each (..., intervals)
+    """
+    ROP = np.asarray(ROP, dtype=float)
+    # Work a sharp bit would do in every interval
+    sharp_work = work_increments(WOB, RPM, CCS, np.asarray(delta_depth, dtype=float) / ROP)
+    A = np.cumsum(sharp_work, axis=-1)
+
+    k, m = wear_coefficient, min_efficiency
+    e0 = wear_efficiency(initial_work, k, m)
+    efficiency = np.maximum(m, e0 - k * A)
+
+    # Past the floor every foot costs 1/m times the sharp work
+    A_floor = (e0 - m) / k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        before_floor = -np.log(e0 - k * A) / k
+    work = np.where(
+        A <= A_floor,
+        before_floor,
+        max(initial_work, -np.log(m) / k) + (A - A_floor) / m,
+    )
+
+    start_efficiency = np.concatenate(
+        (np.full(efficiency.shape[:-1] + (1,), e0), efficiency[..., :-1]), axis=-1
+    )
+    hours = delta_depth / (ROP * (start_efficiency + efficiency) / 2)
+    return efficiency, hours, work
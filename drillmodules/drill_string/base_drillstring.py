@@ -43,7 +43,7 @@ class DrillStringObjBase:
         pipe_weight,
         outer_diameter,
         inner_diameter,
-        more_info={},
+        more_info=None,
     ):
         self.friction_co = friction_co
         self.string_force = (string_force,) #TODO check
@@ -57,7 +57,7 @@ class DrillStringObjBase:
         self.pipe_weight = pipe_weight
         self.outer_diameter = outer_diameter
         self.inner_diameter = inner_diameter
-        self.info = more_info
+        self.info = dict(more_info or {})
 
     def more_info(self):
         """
@@ -67,7 +67,7 @@ class DrillStringObjBase:
         Prem Tube Tensile (lbs), pipe_weight, inner_diameter, outer_diameter
 
         """
-        info = self.info
+        info = dict(self.info)
         info["pipe_weight"] = self.pipe_weight
         info["inner_diameter"] = self.inner_diameter
         info["outer_diameter"] = self.outer_diameter
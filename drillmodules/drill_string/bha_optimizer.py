@@ -0,0 +1,389 @@
+"""
+BHA Optimizer module
+
+This module searches complete string designs, drill pipe x drill collar x
+collar length x heavy weight section, for the lowest torque, drag,
+buckling and string weight that still carries the required WOB:
+
+    - pipes (and collars) with the same dimensions as another but a weaker
+      tensile or make up torque rating are dominated and dropped
+    - for every collar and heavy weight section only the shortest collar
+      length that keeps the neutral point in the BHA, without helical
+      buckling, is kept; longer collars only add weight, torque and drag
+    - every remaining BHA is evaluated with all pipes at once, the pipes
+      being (pipes, 1) columns of `torque_and_drag` and `buckling_profile`
+
+The BHAs are sharded across a process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import numpy as np
+import pandas as pd
+
+from drillmodules.well_plan.well_path import WellPath
+from .buckling import buckling_profile
+from .catalog import indexed_pipe_catalog, indexed_collar_catalog
+from .drill_collar import DrillCollar
+from .drill_pipe import DrillPipe
+from .select_drilling_apparatus import _ranked
+from .torque_drag import torque_and_drag, string_columns, STEEL_DENSITY
+
+# Name -> (weight [lb/ft], OD [in], ID [in]) of standard heavy weight pipes
+HEAVY_WEIGHT_PIPES = {
+    '3 1/2" HWDP': (25.3, 3.5, 2.0625),
+    '4 1/2" HWDP': (41.0, 4.5, 2.75),
+    '5" HWDP': (49.3, 5.0, 3.0),
+}
+
+DESIGN_COLUMNS = [
+    "Score",
+    "Pipe row",
+    "Pipe grade",
+    "Pipe connection",
+    "Pipe OD (in)",
+    "Pipe weight (lb/ft)",
+    "Collar row",
+    "Collar connection",
+    "Collar OD (in)",
+    "Collar type",
+    "Collar length (ft)",
+    "Heavy weight",
+    "Heavy weight length (ft)",
+    "Surface torque (ft-lbs)",
+    "Drag (lbs)",
+    "Hookload (lbs)",
+    "Buckled fraction",
+    "String weight (lbs)",
+]
+
+
+def non_dominated(keys, ratings):
+    """
+    Mask of the rows not dominated by another row with the same keys
+
+    A row is dominated when another row with equal keys has every rating
+    at least as high and one higher, or is identical and comes first.
+    NaN ratings count as the lowest.
+    """
+    keys = np.asarray(keys, dtype=float)
+    ratings = np.nan_to_num(np.asarray(ratings, dtype=float), nan=-np.inf)
+    same = np.all(keys[:, None, :] == keys[None, :, :], axis=-1)
+    at_least = np.all(ratings[None, :, :] >= ratings[:, None, :], axis=-1)
+    better = np.any(ratings[None, :, :] > ratings[:, None, :], axis=-1)
+    earlier = np.tri(len(keys), k=-1, dtype=bool)
+    dominated = same & at_least & (better | earlier)
+    return ~dominated.any(axis=1)
+
+
+def _columns(catalog, rows, *names):
+    """(rows, names) array of catalog columns"""
+    return np.column_stack([catalog.columns[name][rows] for name in names])
+
+
+def _shortest_feasible_bha(
+    well_path, collar, collar_lengths, heavy_weight, heavy_weight_length, design_WOB
+):
+    """
+    Shortest collar length of a BHA whose neutral point stays in the BHA
+    at `design_WOB`, without helical buckling; None if there is none
+    """
+    md = well_path.along_hole_depth
+    for collar_length in sorted(collar_lengths):
+        bha_length = collar_length + heavy_weight_length
+        if bha_length >= md[-1]:
+            break
+        profile = buckling_profile(
+            well_path,
+            None,
+            collar,
+            collar_length,
+            design_WOB,
+            heavy_weight=heavy_weight,
+            heavy_weight_length=heavy_weight_length,
+        )
+        in_bha = md >= md[-1] - bha_length
+        top = np.argmax(in_bha)
+        if profile.effective_force[top] >= 0 and not profile.helical[in_bha].any():
+            return collar_length
+    return None
+
+
+def _evaluate_bhas(task):
+    """
+    Worker: feasible designs of a shard of BHAs with every pipe
+
+    Returns a list of (bha, pipe positions, metrics) with metrics a
+    (5, designs) array of surface torque, drag, hookload, buckled fraction
+    and string weight
+    """
+    well_path, pipes, pipe_ratings, collars, collar_ratings, shard, settings = task
+    WOB, TOB = settings["WOB"], settings["TOB"]
+    md = well_path.along_hole_depth
+    lengths = well_path.chord_lengths
+
+    results = []
+    for collar_row, heavy_weight_name, heavy_weight_length in shard:
+        collar = collars[collar_row]
+        heavy_weight = settings["heavy_weights"].get(heavy_weight_name)
+        collar_length = _shortest_feasible_bha(
+            well_path,
+            collar,
+            settings["collar_lengths"],
+            heavy_weight,
+            heavy_weight_length,
+            settings["design_factor"] * WOB,
+        )
+        if collar_length is None:
+            continue
+
+        string = (pipes, collar, collar_length)
+        sections = dict(heavy_weight=heavy_weight, heavy_weight_length=heavy_weight_length)
+        loads = torque_and_drag(
+            well_path,
+            *string,
+            WOB=WOB,
+            TOB=TOB,
+            friction_co=settings["friction_co"],
+            mud_weight=settings["outer_mud_weight"],
+            **sections,
+        )
+        buckling = buckling_profile(well_path, *string, WOB, **sections)
+
+        in_collars = md >= md[-1] - collar_length
+        in_pipe = md < md[-1] - (collar_length + heavy_weight_length)
+        surface_torque = loads.surface_torque[:, 3]
+        collar_torque = loads.torque[:, 3, np.argmax(in_collars)]
+        hookload = loads.hookload[:, 1]
+        weight = string_columns(md, *string, **sections).weight
+
+        feasible = (
+            ~(buckling.sinusoidal & in_pipe).any(axis=1)
+            & (surface_torque <= pipe_ratings["mut_min"])
+            & (collar_torque <= collar_ratings["mut_min"][collar_row])
+            & (hookload <= settings["tension_margin"] * pipe_ratings["tensile"])
+        )
+        if not feasible.any():
+            continue
+        metrics = np.stack(
+            (
+                surface_torque,
+                hookload - loads.hookload[:, 2],
+                hookload,
+                buckling.sinusoidal.mean(axis=1),
+                (weight * lengths).sum(axis=-1),
+            )
+        )
+        rows = np.flatnonzero(feasible)
+        bha = (collar_row, collar_length, heavy_weight_name, heavy_weight_length)
+        results.append((bha, rows, metrics[:, rows]))
+    return results
+
+
+def optimize_bha(
+    well_data,
+    WOB=30000,
+    TOB=3000,
+    collar_lengths=(90, 180, 270, 360, 450, 540),
+    heavy_weight_lengths=(0, 270, 540),
+    heavy_weight_pipes=HEAVY_WEIGHT_PIPES,
+    grades=None,
+    collar_types=None,
+    friction_co=0.25,
+    youngs_modulus=30000000,
+    inner_mud_weight=10,
+    outer_mud_weight=10,
+    hole_diameter=10,
+    design_factor=1.15,
+    tension_margin=0.9,
+    tw=0.3,
+    dw=0.3,
+    bw=0.2,
+    ww=0.2,
+    quantity=10,
+    processes=None,
+):
+    """
+    Ranked complete string designs for a well
+
+    Input Variables, Units:
+        - well_data: well path (see `WellPath.from_well_data`) with X, Y, Z
+        - WOB: [lbs], TOB: [ft-lbs] while drilling
+        - collar_lengths: [ft] collar lengths to search
+        - heavy_weight_lengths: [ft] heavy weight section lengths to search,
+          0 for none
+        - heavy_weight_pipes: name -> (weight [lb/ft], OD [in], ID [in])
+        - grades, collar_types: optional lists of the pipe grades and collar
+          types to search (all by default)
+        - friction_co: [], youngs_modulus: [psi], mud weights: [ppg],
+          hole_diameter: [in]
+        - design_factor: [] the BHA must carry design_factor x WOB below
+          the neutral point
+        - tension_margin: [] largest tripping out hookload / pipe tensile
+        - tw, dw, bw, ww: weights of torque, drag, buckling and string
+          weight in the score
+        - quantity: designs returned
+        - processes: worker processes; None for one per CPU, 1 to run in
+          this process
+
+    A design is feasible when the pipe does not buckle, the surface torque
+    is below the pipe make up torque, the torque at the top of the collars
+    below the collar make up torque and the hookload within the margin.
+
+    Returns: DataFrame of the best feasible designs, by accending score
+    (`DESIGN_COLUMNS`); metrics are normalized by their largest value
+    among the feasible designs before weighting.
+    """
+    well_path = WellPath.from_well_data(well_data)
+    pipe_catalog, collar_catalog = indexed_pipe_catalog(), indexed_collar_catalog()
+
+    common = {
+        "youngs_modulus": youngs_modulus,
+        "hole_diameter": hole_diameter,
+        "inner_mud_weight": inner_mud_weight,
+        "outer_mud_weight": outer_mud_weight,
+    }
+
+    def make_pipe(weight, outer_diameter, inner_diameter):
+        return DrillPipe(
+            **common,
+            friction_co=friction_co,
+            string_force=0,
+            internal_fluid_pressure=0,
+            external_fluid_pressure=0,
+            buoyancy_factor=1 - outer_mud_weight / STEEL_DENSITY,
+            pipe_weight=weight,
+            pipe_outer_diameter=outer_diameter,
+            pipe_inner_diameter=inner_diameter,
+        )
+
+    # Dominated components are never part of the best design
+    pipe_constraints = {} if grades is None else {"grade_code": list(grades)}
+    pipe_rows = np.flatnonzero(
+        pipe_catalog.mask(**pipe_constraints, outer_diameter=(None, hole_diameter))
+    )
+    pipe_rows = pipe_rows[
+        non_dominated(
+            _columns(pipe_catalog, pipe_rows, "weight", "outer_diameter", "inner_diameter"),
+            _columns(pipe_catalog, pipe_rows, "tensile", "mut_min"),
+        )
+    ]
+    collar_constraints = {} if collar_types is None else {"type_code": list(collar_types)}
+    collar_rows = np.flatnonzero(
+        collar_catalog.mask(**collar_constraints, outer_diameter=(None, hole_diameter))
+    )
+    collar_rows = collar_rows[
+        non_dominated(
+            _columns(
+                collar_catalog,
+                collar_rows,
+                "weight",
+                "outer_diameter",
+                "inner_diameter",
+                "type_code",
+            ),
+            _columns(collar_catalog, collar_rows, "mut_min"),
+        )
+    ]
+    if len(pipe_rows) == 0 or len(collar_rows) == 0:
+        return pd.DataFrame(columns=DESIGN_COLUMNS)
+
+    pipes = make_pipe(
+        pipe_catalog.weight[pipe_rows, None],
+        pipe_catalog.outer_diameter[pipe_rows, None],
+        pipe_catalog.inner_diameter[pipe_rows, None],
+    )
+    pipe_ratings = {
+        "mut_min": np.nan_to_num(pipe_catalog.mut_min[pipe_rows], nan=-np.inf),
+        "tensile": pipe_catalog.tensile[pipe_rows],
+    }
+    collars = {
+        row: DrillCollar(
+            **common,
+            collar_weight=collar_catalog.weight[row],
+            collar_outer_diameter=collar_catalog.outer_diameter[row],
+            collar_inner_diameter=collar_catalog.inner_diameter[row],
+        )
+        for row in collar_rows
+    }
+    collar_ratings = {"mut_min": collar_catalog.mut_min}
+
+    sections = [(None, 0)] + [
+        (name, length)
+        for name in heavy_weight_pipes
+        for length in heavy_weight_lengths
+        if length > 0
+    ]
+    bhas = [(row, name, length) for row in collar_rows for name, length in sections]
+    settings = {
+        "WOB": WOB,
+        "TOB": TOB,
+        "collar_lengths": collar_lengths,
+        "design_factor": design_factor,
+        "tension_margin": tension_margin,
+        "friction_co": friction_co,
+        "outer_mud_weight": outer_mud_weight,
+        "heavy_weights": {
+            name: make_pipe(*dims) for name, dims in heavy_weight_pipes.items()
+        },
+    }
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    shard_count = max(1, min(len(bhas), 4 * processes))
+    tasks = [
+        (well_path, pipes, pipe_ratings, collars, collar_ratings, shard, settings)
+        for shard in (bhas[i::shard_count] for i in range(shard_count))
+        if shard
+    ]
+    if processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            shards = list(pool.map(_evaluate_bhas, tasks))
+    else:
+        shards = [_evaluate_bhas(task) for task in tasks]
+    results = [result for shard in shards for result in shard]
+    if not results:
+        return pd.DataFrame(columns=DESIGN_COLUMNS)
+
+    # One column per design
+    metrics = np.concatenate([result[2] for result in results], axis=1)
+    pipe_positions = np.concatenate([result[1] for result in results])
+    bha_index = np.repeat(np.arange(len(results)), [len(result[1]) for result in results])
+
+    torque, drag, hookload, buckled, weight = metrics
+    scores = 0
+    for metric, metric_weight in ((torque, tw), (drag, dw), (buckled, bw), (weight, ww)):
+        largest = np.max(np.abs(metric))
+        scores = scores + metric_weight * (metric / largest if largest > 0 else metric)
+    scores = scores / (tw + dw + bw + ww)
+
+    best = _ranked(scores, quantity)
+    designs = []
+    for design in best:
+        collar_row, collar_length, heavy_weight_name, heavy_weight_length = results[
+            bha_index[design]
+        ][0]
+        pipe_row = pipe_rows[pipe_positions[design]]
+        designs.append(
+            [
+                scores[design],
+                pipe_row,
+                pipe_catalog.grades[pipe_catalog.grade_code[pipe_row]],
+                pipe_catalog.connections[pipe_catalog.connection_code[pipe_row]],
+                pipe_catalog.outer_diameter[pipe_row],
+                pipe_catalog.weight[pipe_row],
+                collar_row,
+                collar_catalog.connections[collar_catalog.connection_code[collar_row]],
+                collar_catalog.outer_diameter[collar_row],
+                collar_catalog.types[collar_catalog.type_code[collar_row]],
+                collar_length,
+                heavy_weight_name,
+                heavy_weight_length,
+                torque[design],
+                drag[design],
+                hookload[design],
+                buckled[design],
+                weight[design],
+            ]
+        )
+    return pd.DataFrame(designs, columns=DESIGN_COLUMNS)
@@ -0,0 +1,230 @@
+"""
+Buckling module
+
+This module computes the axial force at every station of a string lying
+in a well path and checks it for buckling:
+
+    - true axial force from the weight in air of the string below, the
+      weight on bit and the fluid pressure on the bit face and shoulders
+      (pressure-area method)
+    - effective axial force, true force + external pressure x OD area
+      - internal pressure x ID area, which decides buckling
+    - sinusoidal (Dawson-Paslay) and helical critical loads, with the
+      vertical well limits (Wu & Juvkam-Wold) where the hole is steep
+    - the collar length that keeps the neutral point in the collars
+
+Loads below a station are reverse cumulative sums, so a whole string, or
+a whole catalog of strings given as (n, 1) columns, is checked in one
+vectorized pass.
+"""
+from collections import namedtuple
+import numpy as np
+
+from drillmodules.well_plan.well_path import WellPath
+from drillmodules.drill_string.hydraulics import HYDROSTATIC_GRADIENT
+from drillmodules.drill_string.torque_drag import (
+    element_geometry,
+    string_columns,
+    _below,
+    EMPTY,
+    STEEL_DENSITY,
+)
+
+BucklingProfile = namedtuple(
+    "BucklingProfile",
+    [
+        "md",
+        "axial_force",
+        "effective_force",
+        "sinusoidal_load",
+        "helical_load",
+        "sinusoidal",
+        "helical",
+    ],
+)
+
+
+def buckling_profile(
+    well_path,
+    drillpipe,
+    drillcollar,
+    collar_length,
+    WOB=0,
+    internal_pressure=None,
+    external_pressure=None,
+    heavy_weight=None,
+    heavy_weight_length=0,
+):
+    """
+    Axial force and buckling checks at every station
+
+    Input Variables, Units:
+        - well_path: `WellPath` or well data with X, Y, Z; the bit is at
+          the last station and Z is positive down
+        - drillpipe: `DrillPipe` or None to check the collars only
+        - drillcollar: `DrillCollar` or None for a string of pipe only
+        - collar_length: [ft] collars just above the bit
+        - WOB: [lbs] weight on bit
+        - internal_pressure, external_pressure: [psi] inside and outside the
+          string, scalars or per station (e.g. from
+          `circulating_hydraulics`); hydrostatic from the components' mud
+          weights by default
+        - heavy_weight: optional `DrillPipe` of heavy weight pipe over
+          `heavy_weight_length` [ft] above the collars
+
+    Attributes of the components may be (n, 1) columns, e.g. a catalog, to
+    get (n, stations) arrays.
+
+    Returns: BucklingProfile(
+        md: [ft] (stations,) along hole depth,
+        axial_force: [lbs] true axial force, negative in compression,
+        effective_force: [lbs] effective axial force, negative in compression,
+        sinusoidal_load, helical_load: [lbs] critical compressions,
+        sinusoidal, helical: bool, where the compression exceeds them,
+    )
+    """
+    if drillpipe is None and drillcollar is None:
+        raise Exception("A drill pipe or a drill collar is needed!")
+
+    well_path = WellPath.from_well_data(well_path)
+    lengths, cos_inc, _, _ = element_geometry(well_path)
+    md = well_path.along_hole_depth
+    tvd = well_path.z - well_path.z[0]
+    sin_inc = np.sqrt(np.maximum(1 - cos_inc**2, 0))
+
+    (
+        section,
+        weight,
+        outer,
+        inner,
+        youngs_modulus,
+        inner_mud_weight,
+        outer_mud_weight,
+    ) = string_columns(
+        md, drillpipe, drillcollar, collar_length, heavy_weight, heavy_weight_length
+    )
+    hole_diameter = (drillpipe if drillpipe is not None else drillcollar).hole_diameter
+
+    if internal_pressure is None:
+        internal_pressure = HYDROSTATIC_GRADIENT * inner_mud_weight * tvd
+    if external_pressure is None:
+        external_pressure = HYDROSTATIC_GRADIENT * outer_mud_weight * tvd
+    internal_pressure = internal_pressure + np.zeros_like(weight)
+    external_pressure = external_pressure + np.zeros_like(weight)
+    outer_area = np.pi * outer**2 / 4
+    inner_area = np.pi * inner**2 / 4
+
+    # Pressure on the shoulders where the string changes size, each taken
+    # at the station above it, and on the bit face
+    shoulders = np.zeros_like(weight)
+    shoulders[..., :-1] = external_pressure[..., :-1] * (
+        outer_area[..., 1:] - outer_area[..., :-1]
+    ) + internal_pressure[..., :-1] * (inner_area[..., :-1] - inner_area[..., 1:])
+    bit_face = -external_pressure[..., -1:] * (
+        outer_area[..., -1:] - inner_area[..., -1:]
+    )
+
+    axial_force = (
+        -WOB
+        + bit_face
+        + _below(weight * lengths * cos_inc)
+        + np.cumsum(shoulders[..., ::-1], axis=-1)[..., ::-1]
+    )
+    effective_force = (
+        axial_force - internal_pressure * inner_area + external_pressure * outer_area
+    )
+
+    # Critical loads; w is the buoyed weight [lbf/in], r the radial clearance
+    buoyed = (
+        weight
+        + 0.0408 * (inner_mud_weight * inner**2 - outer_mud_weight * outer**2)
+    ) / 12
+    stiffness = youngs_modulus * np.pi / 64 * (outer**4 - inner**4)
+    clearance = (hole_diameter - outer) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inclined = np.sqrt(np.maximum(stiffness * buoyed * sin_inc / clearance, 0))
+    vertical = np.cbrt(stiffness * buoyed**2)
+    sinusoidal_load = np.maximum(2 * inclined, 2.55 * vertical)
+    helical_load = np.maximum(2 * np.sqrt(2) * inclined, 5.55 * vertical)
+
+    compression = np.where(section != EMPTY, -effective_force, -np.inf)
+    return BucklingProfile(
+        md=md,
+        axial_force=axial_force,
+        effective_force=effective_force,
+        sinusoidal_load=sinusoidal_load,
+        helical_load=helical_load,
+        sinusoidal=compression > sinusoidal_load,
+        helical=compression > helical_load,
+    )
+
+
+def neutral_point_lengths(well_path, drillcollar, WOB, design_factor=1.15):
+    """
+    Shortest collar length whose buoyed weight along the hole carries
+    `design_factor` x `WOB`, so the neutral point stays in the collars
+
+    Input Variables, Units:
+        - well_path: `WellPath` or well data with X, Y, Z
+        - drillcollar: `DrillCollar`, its attributes may be (n, 1) columns
+        - WOB: [lbs] weight on bit
+
+    Returns: [ft] collar length, (n, 1) for column attributes; the whole
+    path where the collars can not carry the WOB
+    """
+    well_path = WellPath.from_well_data(well_path)
+    lengths, cos_inc, _, _ = element_geometry(well_path)
+    md = well_path.along_hole_depth
+
+    # Axial weight per lb/ft of collar below every station, from the bit up
+    support = np.maximum.accumulate(_below(lengths * cos_inc)[::-1])
+    buoyed = drillcollar.collar_weight * (
+        1 - drillcollar.outer_mud_weight / STEEL_DENSITY
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        needed = np.where(buoyed > 0, design_factor * WOB / buoyed, np.inf)
+    stations = np.minimum(np.searchsorted(support, needed), len(md) - 1)
+    return md[-1] - md[::-1][stations]
+
+
+def buckling_limited_wob(
+    well_path, drillpipe, drillcollar, collar_length, WOB_grid, depths=None
+):
+    """
+    Largest WOB that buckles the string nowhere, with the bit at the bottom
+    of every depth interval
+
+    Input Variables, Units:
+        - well_path, drillpipe, drillcollar, collar_length: as in
+          `buckling_profile`
+        - WOB_grid: [lbs] candidate WOBs
+        - depths: [ft] sorted TVD breakpoints of the intervals, e.g. of a
+          formation schedule; one interval, the whole path, by default
+
+    Returns: [lbs] (intervals,) largest candidate WOB without sinusoidal
+    buckling, 0 where every candidate buckles
+    """
+    well_path = WellPath.from_well_data(well_path)
+    WOB_grid = np.sort(np.asarray(WOB_grid, dtype=float).ravel())
+    depths = np.asarray([-np.inf] if depths is None else depths, dtype=float)
+    uppers = np.append(depths[1:], np.inf)
+
+    limits = np.zeros(len(depths))
+    for i, upper in enumerate(uppers):
+        # The bit drills the interval down to its last station above `upper`
+        above = np.flatnonzero(well_path.z < upper)
+        bit = max(above[-1] if len(above) else 0, 1) + 1
+        drilled = WellPath(
+            well_path.x[:bit],
+            well_path.y[:bit],
+            well_path.z[:bit],
+            well_path.inclination[:bit],
+            well_path.azimuth[:bit],
+            well_path.md[:bit],
+        )
+        profile = buckling_profile(
+            drilled, drillpipe, drillcollar, collar_length, WOB_grid[:, None]
+        )
+        straight = ~profile.sinusoidal.any(axis=-1)
+        limits[i] = WOB_grid[straight].max() if straight.any() else 0
+    return limits
@@ -0,0 +1,314 @@
+"""
+Catalog module
+
+This module loads the drill pipe and drill collar API sheets
+(`drill_pipes_api_sheet.xlsx`, `drill_collars_api_sheet.xlsx`) once per
+process as immutable columns.
+
+The parsed columns are also kept in a sidecar cache next to the sheet
+(see `drillmodules.sidecar`), so a new process reads a small `.npz`
+instead of parsing Excel.
+
+`PipeCatalog` and `CollarCatalog` hold the columns used for selection as
+typed arrays with sorted indexes, so constraint queries ("OD between 4
+and 5.5, grade S-135") are answered with `searchsorted` and masks. The
+indexes of the sheets are also built once per process
+(`indexed_pipe_catalog`, `indexed_collar_catalog`).
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from drillmodules.sidecar import cached_arrays
+
+SHEETS_DIR = os.path.dirname(os.path.realpath(__file__))
+PIPE_SHEET = os.path.join(SHEETS_DIR, "drill_pipes_api_sheet.xlsx")
+COLLAR_SHEET = os.path.join(SHEETS_DIR, "drill_collars_api_sheet.xlsx")
+
+# Sheet path -> (mtime, Catalog) of the sheets loaded by this process
+_catalogs = {}
+# (class, sheet path) -> (mtime, indexed catalog) built by this process
+_indexed = {}
+
+
+class Catalog:
+    """
+    Immutable columns of an API sheet
+
+    Columns are read only numpy arrays, in sheet order. Numeric columns
+    keep their dtype, text columns are str arrays and columns mixing both
+    (e.g. a mistyped number) are object arrays, as pandas reads them.
+    """
+
+    def __init__(self, columns):
+        self._columns = dict(columns)
+        for values in self._columns.values():
+            values.setflags(write=False)
+
+    def __len__(self):
+        return len(next(iter(self._columns.values()), ()))
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    @property
+    def column_names(self):
+        return list(self._columns)
+
+    def frame(self, columns=None):
+        """A new DataFrame of the catalog, or of some of its columns"""
+        columns = self.column_names if columns is None else columns
+        return pd.DataFrame({name: self._columns[name].copy() for name in columns})
+
+
+def parse_sheet(path):
+    """
+    Parses an API sheet into plain arrays, as stored in the sidecar cache
+
+    Column i is stored as "c{i}"; a column mixing numbers and text also
+    gets "n{i}", its numbers (NaN for text).
+    """
+    data = pd.read_excel(path)
+    arrays = {"columns": np.array(list(data.columns), dtype=str)}
+    kinds = []
+    for i, name in enumerate(data.columns):
+        column = data[name]
+        if pd.api.types.is_numeric_dtype(column):
+            arrays[f"c{i}"] = column.to_numpy()
+            kinds.append("number")
+            continue
+
+        is_text = column.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+        arrays[f"c{i}"] = column.astype(str).to_numpy(dtype=str)
+        if is_text.all():
+            kinds.append("text")
+        else:
+            arrays[f"n{i}"] = np.where(
+                is_text, np.nan, pd.to_numeric(column, errors="coerce")
+            )
+            kinds.append("mixed")
+    arrays["kinds"] = np.array(kinds, dtype=str)
+    return arrays
+
+
+def _columns(arrays):
+    """Catalog columns back from the sidecar arrays"""
+    columns = {}
+    for i, (name, kind) in enumerate(
+        zip(arrays["columns"].tolist(), arrays["kinds"].tolist())
+    ):
+        values = arrays[f"c{i}"]
+        if kind == "mixed":
+            numbers = arrays[f"n{i}"]
+            mixed = values.astype(object)
+            is_number = ~np.isnan(numbers)
+            mixed[is_number] = [
+                int(v) if float(v).is_integer() else float(v) for v in numbers[is_number]
+            ]
+            values = mixed
+        elif kind == "text":
+            values = values.astype(object)
+        columns[name] = np.array(values)
+    return columns
+
+
+def load_catalog(path):
+    """
+    `Catalog` of an API sheet; parsed at most once per process and only
+    when its sidecar cache is out of date
+    """
+    mtime = os.stat(path).st_mtime_ns
+    loaded = _catalogs.get(path)
+    if loaded is not None and loaded[0] == mtime:
+        return loaded[1]
+
+    catalog = Catalog(_columns(cached_arrays(path, parse_sheet)))
+    _catalogs[path] = (mtime, catalog)
+    return catalog
+
+
+def load_indexed(catalog_class, path):
+    """
+    `catalog_class` (e.g. `PipeCatalog`) of an API sheet; indexed at most
+    once per process and again only when the sheet changes
+    """
+    mtime = os.stat(path).st_mtime_ns
+    key = (catalog_class, path)
+    loaded = _indexed.get(key)
+    if loaded is not None and loaded[0] == mtime:
+        return loaded[1]
+
+    indexed = catalog_class(load_catalog(path))
+    _indexed[key] = (mtime, indexed)
+    return indexed
+
+
+def pipe_catalog():
+    """`Catalog` of drill_pipes_api_sheet.xlsx"""
+    return load_catalog(PIPE_SHEET)
+
+
+def collar_catalog():
+    """`Catalog` of drill_collars_api_sheet.xlsx"""
+    return load_catalog(COLLAR_SHEET)
+
+
+def indexed_pipe_catalog():
+    """Shared `PipeCatalog` of drill_pipes_api_sheet.xlsx"""
+    return load_indexed(PipeCatalog, PIPE_SHEET)
+
+
+def indexed_collar_catalog():
+    """Shared `CollarCatalog` of drill_collars_api_sheet.xlsx"""
+    return load_indexed(CollarCatalog, COLLAR_SHEET)
+
+
+def _mut(values):
+    """MUT column as floats; text entries (mistyped numbers) are NaN"""
+    return np.array(
+        [np.nan if isinstance(v, str) else v for v in values], dtype=float
+    )
+
+
+class _ColumnCatalog:
+    """
+    Typed columns of a catalog with a sorted index per column
+
+    Text columns are stored as codes into their sorted labels (e.g.
+    `grade_code` into `grades`), so every query is a `searchsorted` on a
+    sorted index and a boolean mask over the rows.
+    """
+
+    # Typed column -> sheet column, filled in by the subclasses
+    NUMBERS = {}
+    # Coded column -> (labels attribute, sheet column)
+    CODES = {}
+
+    def __init__(self, catalog):
+        self.table = catalog
+        self.columns = {}
+        for column, name in self.NUMBERS.items():
+            values = catalog[name]
+            self.columns[column] = (
+                _mut(values) if values.dtype == object else values.astype(float)
+            )
+        for column, (labels, name) in self.CODES.items():
+            values, codes = np.unique(catalog[name].astype(str), return_inverse=True)
+            values.setflags(write=False)
+            setattr(self, labels, values)
+            self.columns[column] = codes
+
+        self._order = {}
+        self._sorted = {}
+        for column, values in self.columns.items():
+            values.setflags(write=False)
+            setattr(self, column, values)
+            # NaN sorts last and is never inside a range
+            order = np.argsort(values, kind="stable")
+            self._order[column] = order
+            self._sorted[column] = values[order]
+
+    def __len__(self):
+        return len(self.table)
+
+    def between(self, column, low=None, high=None):
+        """Mask of the rows with low <= column <= high; None is unbounded"""
+        values = self._sorted[column]
+        start = np.searchsorted(values, -np.inf if low is None else low, side="left")
+        stop = np.searchsorted(values, np.inf if high is None else high, side="right")
+        mask = np.zeros(len(values), dtype=bool)
+        mask[self._order[column][start:stop]] = True
+        return mask
+
+    def equal(self, column, value):
+        """Mask of the rows whose column is `value`, a label for coded columns"""
+        if column in self.CODES:
+            labels = getattr(self, self.CODES[column][0])
+            code = np.searchsorted(labels, value)
+            if code == len(labels) or labels[code] != value:
+                return np.zeros(len(self), dtype=bool)
+            value = code
+        return self.between(column, value, value)
+
+    def mask(self, **constraints):
+        """
+        Mask of the rows meeting all constraints
+
+        A constraint is column=(low, high) for a range (None is
+        unbounded), column=value for equality or column=[values] for any
+        of the values, e.g.
+            mask(outer_diameter=(4, 5.5), tensile=(400000, None), grade_code="S-135")
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, condition in constraints.items():
+            if column not in self.columns:
+                raise Exception(f"Unknown catalog column {column}!")
+            if isinstance(condition, tuple):
+                mask &= self.between(column, *condition)
+            elif isinstance(condition, (list, set, np.ndarray)):
+                mask &= np.logical_or.reduce(
+                    [self.equal(column, value) for value in condition]
+                    + [np.zeros(len(self), dtype=bool)]
+                )
+            else:
+                mask &= self.equal(column, condition)
+        return mask
+
+    def rows(self, **constraints):
+        """Catalog rows meeting all constraints, see `mask`"""
+        return np.flatnonzero(self.mask(**constraints))
+
+
+class PipeCatalog(_ColumnCatalog):
+    """
+    Drill pipe catalog as typed columns
+
+    Columns: outer_diameter, inner_diameter, weight [lb/ft], tensile [lbs],
+    mut_min, mut_max [ft-lbs], and grade_code, connection_code into
+    `grades`, `connections`
+    """
+
+    NUMBERS = {
+        "outer_diameter": "OD (in)",
+        "inner_diameter": "TUBE ID (in)",
+        "weight": "Nominal Weight (lb/ft)",
+        "tensile": "Prem Tube Tensile (lbs)",
+        "mut_min": "MUT Min (ft-lbs) ",
+        "mut_max": "MUT Max (ft-lbs)",
+    }
+    CODES = {
+        "grade_code": ("grades", "Grade"),
+        "connection_code": ("connections", "Connection"),
+    }
+
+    def __init__(self, catalog=None):
+        super().__init__(pipe_catalog() if catalog is None else catalog)
+
+
+class CollarCatalog(_ColumnCatalog):
+    """
+    Drill collar catalog as typed columns
+
+    Columns: outer_diameter, inner_diameter, weight [lb/ft], mut_min,
+    mut_max [ft-lbs], and connection_code, type_code into `connections`,
+    `types`
+    """
+
+    NUMBERS = {
+        "outer_diameter": "OD (in)",
+        "inner_diameter": "Collar ID (in)",
+        "weight": "Adjusted Weight (lb/ft)",
+        "mut_min": "MUT Min (ft-lbs)",
+        "mut_max": "MUT Max (ft-lbs)",
+    }
+    CODES = {
+        "connection_code": ("connections", "Connection"),
+        "type_code": ("types", "Type"),
+    }
+
+    def __init__(self, catalog=None):
+        super().__init__(collar_catalog() if catalog is None else catalog)
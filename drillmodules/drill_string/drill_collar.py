@@ -33,7 +33,7 @@ class DrillCollar:
         collar_weight,
         collar_outer_diameter,
         collar_inner_diameter,
-        more_info={},
+        more_info=None,
     ):
         self.youngs_modulus = youngs_modulus
         self.hole_diameter = hole_diameter
@@ -42,7 +42,7 @@ class DrillCollar:
         self.collar_weight = collar_weight
         self.collar_outer_diameter = collar_outer_diameter
         self.collar_inner_diameter = collar_inner_diameter
-        self.info = more_info
+        self.info = dict(more_info or {})
 
     def more_info(self):
         """
@@ -51,7 +51,7 @@ class DrillCollar:
         MUT Min (ft-lbs), MUT Max (ft-lbs),	Type
 
         """
-        info = self.info
+        info = dict(self.info)
         info["weight"] = self.collar_weight
         info["collar_inner_diameter"] = self.collar_inner_diameter
         info["collar_outer_diameter"] = self.collar_outer_diameter
@@ -91,15 +91,19 @@ class DrillCollar:
         -------
             value of buckling on the string
         """
-        numerator = (
-            self.youngs_modulus
-            * self.inertia
-            * self.buoyed_pipe_weight
-            * np.sin(curr_azimuth)
+        return self._paslay_buckling_from_sin(np.sin(curr_azimuth))
+
+    def _paslay_buckling_from_sin(self, sin_azimuth):
+        """
+        Paslay buckling from an already computed sine of the azimuth.
+        Works on scalars and station arrays alike; pipe attributes given as
+        columns (n, 1) give an (n, stations) matrix.
+        """
+        # 2 * sqrt(E * I * w * sin / r), split so only the product is 2D
+        coefficient = 2 * np.sqrt(
+            self.youngs_modulus * self.inertia * self.buoyed_pipe_weight / self.pipe_radius
         )
-        denominator = self.pipe_radius
-        numerator = 0 if numerator < 0 else numerator
-        buckling_val = 2 * np.sqrt(numerator / denominator)
+        buckling_val = coefficient * np.sqrt(np.maximum(sin_azimuth, 0))
 
         return buckling_val
 
@@ -138,3 +142,20 @@ class DrillCollar:
 
         return self.critical_buckling(drillcollar_length) < self._paslay_buckling(curr_azimuth)
 
+    def bucklings(self, drillcollar_length, well_path):
+        """
+        Determines if there's buckling at every station of a well path
+
+        Parameters
+        ----------
+            drillcollar_length: legnth of drillcollar
+            well_path: `WellPath` whose memoized trigonometry is used
+
+        Returns
+        -------
+            np bool array, `True` where there's buckling
+        """
+
+        return self.critical_buckling(drillcollar_length) < self._paslay_buckling_from_sin(
+            well_path.sin_azi
+        )
@@ -17,8 +17,10 @@ class DrillPipe:
         - friction_co: Friction coefficient
         - string_force: Force in the drill string in pounds
         - youngs_modulus: Young's modulus of the drill string in psi
-        - internal_fluid_pressure: Internal fluid pressure in pipe in psi
-        - external_fluid_pressure: External fluid pressure of pipe in psi
+        - internal_fluid_pressure: Internal fluid pressure in pipe in psi, a
+            scalar or one value per station (e.g. from `circulating_hydraulics`)
+        - external_fluid_pressure: External fluid pressure of pipe in psi, a
+            scalar or one value per station
         - hole_diameter: Diameter of hole
         - inner_mud_weight: Initial mud weight
         - outer_mud_weight: Final mud weight
@@ -43,7 +45,7 @@ class DrillPipe:
         pipe_weight,
         pipe_outer_diameter,
         pipe_inner_diameter,
-        more_info={},
+        more_info=None,
     ):
         self.friction_co = friction_co
         self.string_force = (string_force,)  # TODO check
@@ -57,7 +59,7 @@ class DrillPipe:
         self.pipe_weight = pipe_weight
         self.pipe_outer_diameter = pipe_outer_diameter
         self.pipe_inner_diameter = pipe_inner_diameter
-        self.info = more_info
+        self.info = dict(more_info or {})
 
     def more_info(self):
         """
@@ -67,7 +69,7 @@ class DrillPipe:
         Prem Tube Tensile (lbs), pipe_weight, pipe_inner_diameter, pipe_outer_diameter
 
         """
-        info = self.info
+        info = dict(self.info)
         info["pipe_weight"] = self.pipe_weight
         info["pipe_inner_diameter"] = self.pipe_inner_diameter
         info["pipe_outer_diameter"] = self.pipe_outer_diameter
@@ -178,15 +180,19 @@ class DrillPipe:
         -------
             value of buckling on the string
         """
-        numerator = (
-            self.youngs_modulus
-            * self.inertia
-            * self.buoyed_pipe_weight
-            * np.sin(curr_azimuth)
+        return self._paslay_buckling_from_sin(np.sin(curr_azimuth))
+
+    def _paslay_buckling_from_sin(self, sin_azimuth):
+        """
+        Paslay buckling from an already computed sine of the azimuth.
+        Works on scalars and station arrays alike; pipe attributes given as
+        columns (n, 1) give an (n, stations) matrix.
+        """
+        # 2 * sqrt(E * I * w * sin / r), split so only the product is 2D
+        coefficient = 2 * np.sqrt(
+            self.youngs_modulus * self.inertia * self.buoyed_pipe_weight / self.pipe_radius
         )
-        denominator = self.pipe_radius
-        numerator = 0 if numerator < 0 else numerator
-        buckling_val = 2 * np.sqrt(numerator / denominator)
+        buckling_val = coefficient * np.sqrt(np.maximum(sin_azimuth, 0))
 
         return buckling_val
 
@@ -226,5 +232,102 @@ class DrillPipe:
 
         return self._buckling_force(axial_force) < self._paslay_buckling(curr_azimuth)
 
+    def drag_terms(self, well_path):
+        """
+        Station terms of the drag: drag = force_term + weight_factor * weight_term
+
+        Parameters
+        ----------
+            well_path: `WellPath` whose memoized trigonometry is used
+
+        Returns
+        -------
+            (force_term, weight_factor, weight_term); the terms are per station
+            and the factor is per pipe
+        """
+        delta_incli = well_path.delta_inclination
+        bent = delta_incli > 0
+
+        force_term = np.where(
+            bent, self.string_force[0] * np.exp(-self.friction_co * well_path.abs_azimuth), 0
+        )
+        weight_term = np.where(
+            bent,
+            well_path.segment_lengths
+            * (well_path.pre_sin_inc - well_path.sin_inc)
+            / np.where(bent, delta_incli, 1),
+            0,
+        )
+
+        return force_term, self.buoyancy_factor[0] * self.pipe_weight, weight_term
+
+    def get_drags(self, well_path):
+        """
+        Calculates the drag at every station of a well path
+
+        Parameters
+        ----------
+            well_path: `WellPath` whose memoized trigonometry is used
+
+        Returns
+        -------
+            np array of drag on the drill string at every station. Pipe
+            attributes given as columns (n, 1) give an (n, stations) matrix
+        """
+        # Station terms first, so only the last product is 2D
+        force_term, weight_factor, weight_term = self.drag_terms(well_path)
+
+        return force_term + weight_factor * weight_term
+
+    def torque_factors(self, well_path):
+        """
+        Factors of the torque: torque = pipe_factor * station_factor
+
+        Parameters
+        ----------
+            well_path: `WellPath` of the stations
+
+        Returns
+        -------
+            (pipe_factor, station_factor)
+        """
+        return (
+            self.friction_co * self.pipe_radius * self.string_force[0],
+            well_path.abs_azimuth,
+        )
+
+    def get_torques(self, well_path):
+        """
+        Calculates the torque at every station of a well path
+
+        Parameters
+        ----------
+            well_path: `WellPath` of the stations
+
+        Returns
+        -------
+            np array of torque on the drill string at every station
+        """
+        pipe_factor, station_factor = self.torque_factors(well_path)
+
+        return pipe_factor * station_factor
+
+    def bucklings(self, axial_force, well_path):
+        """
+        Determines if there's buckling at every station of a well path
+
+        Parameters
+        ----------
+            axial_force: Axial force
+            well_path: `WellPath` whose memoized trigonometry is used
+
+        Returns
+        -------
+            np bool array, `True` where there's buckling
+        """
+        return self._buckling_force(axial_force) < self._paslay_buckling_from_sin(
+            well_path.sin_azi
+        )
+
     def get_side_cutting_factor(self):
         return 0.3  # NOTE: Not constant
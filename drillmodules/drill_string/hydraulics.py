@@ -0,0 +1,168 @@
+"""
+Hydraulics module
+
+This module computes circulating pressures along the string with a
+Bingham plastic mud (field units, API RP 13D style):
+
+    - frictional pressure loss in the pipe/collar bore and in the annulus,
+      laminar or turbulent by Reynolds number
+    - bit nozzle pressure drop and standpipe pressure
+    - pressure inside and outside the string, and ECD, at every station
+
+Everything is computed for all stations and all flow rates at once, as
+(flow rates, stations) arrays. The pressure profiles can be handed to
+`DrillPipe` as `internal_fluid_pressure`/`external_fluid_pressure`.
+"""
+from collections import namedtuple
+import numpy as np
+
+from drillmodules.well_plan.well_path import WellPath
+from .torque_drag import string_columns
+
+HYDROSTATIC_GRADIENT = 0.052  # [psi/ft per ppg]
+CRITICAL_REYNOLDS = 2100
+
+Hydraulics = namedtuple(
+    "Hydraulics",
+    [
+        "flow_rate",
+        "md",
+        "tvd",
+        "bore_loss",
+        "annular_loss",
+        "bit_loss",
+        "standpipe_pressure",
+        "internal_pressure",
+        "external_pressure",
+        "ecd",
+    ],
+)
+
+
+def pipe_gradient(flow_rate, inner_diameter, mud_weight, plastic_viscosity, yield_point):
+    """
+    Frictional pressure gradient inside a pipe
+
+    Input Variables, Units:
+        - flow_rate: [gpm], inner_diameter: [in], mud_weight: [ppg]
+        - plastic_viscosity: [cp], yield_point: [lbf/100 ft^2]
+
+    Inputs broadcast. Returns: [psi/ft]
+    """
+    d = np.asarray(inner_diameter, dtype=float)
+    velocity = flow_rate / (2.448 * d**2)  # [ft/s]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        apparent_viscosity = plastic_viscosity + 6.66 * yield_point * d / velocity
+        reynolds = 928 * mud_weight * velocity * d / apparent_viscosity
+
+    laminar = plastic_viscosity * velocity / (1500 * d**2) + yield_point / (225 * d)
+    turbulent = (
+        mud_weight**0.75 * velocity**1.75 * plastic_viscosity**0.25 / (1800 * d**1.25)
+    )
+    return np.where(reynolds > CRITICAL_REYNOLDS, turbulent, laminar)
+
+
+def annular_gradient(
+    flow_rate, hole_diameter, outer_diameter, mud_weight, plastic_viscosity, yield_point
+):
+    """
+    Frictional pressure gradient in the annulus around a pipe
+
+    Input Variables, Units:
+        - flow_rate: [gpm], hole_diameter, outer_diameter: [in]
+        - mud_weight: [ppg], plastic_viscosity: [cp],
+          yield_point: [lbf/100 ft^2]
+
+    Inputs broadcast. Returns: [psi/ft]
+    """
+    gap = np.asarray(hole_diameter, dtype=float) - outer_diameter
+    velocity = flow_rate / (2.448 * (hole_diameter**2 - outer_diameter**2))  # [ft/s]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        apparent_viscosity = plastic_viscosity + 5 * yield_point * gap / velocity
+        reynolds = 757 * mud_weight * velocity * gap / apparent_viscosity
+
+    laminar = plastic_viscosity * velocity / (1000 * gap**2) + yield_point / (200 * gap)
+    turbulent = (
+        mud_weight**0.75 * velocity**1.75 * plastic_viscosity**0.25 / (1396 * gap**1.25)
+    )
+    return np.where(reynolds > CRITICAL_REYNOLDS, turbulent, laminar)
+
+
+def circulating_hydraulics(
+    well_path,
+    drillpipe,
+    drillcollar,
+    collar_length,
+    flow_rates,
+    mud_weight=10,
+    plastic_viscosity=20,
+    yield_point=15,
+    nozzle_area=0.75,
+    surface_loss=50,
+):
+    """
+    Circulating pressures at every station for every flow rate
+
+    Input Variables, Units:
+        - well_path: `WellPath` or well data; the bit is at the last station
+        - drillpipe: `DrillPipe`, drillcollar: `DrillCollar` or None for a
+          string of pipe only; the hole diameter is the pipe's
+        - collar_length: [ft] collars just above the bit
+        - flow_rates: [gpm] 1D array
+        - mud_weight: [ppg], plastic_viscosity: [cp],
+          yield_point: [lbf/100 ft^2]
+        - nozzle_area: [in^2] total flow area of the bit nozzles
+        - surface_loss: [psi] surface equipment loss
+
+    Returns: Hydraulics with (flow rates, stations) arrays
+        - bore_loss: [psi] friction inside the string, surface to station
+        - annular_loss: [psi] annular friction, station to surface
+        - bit_loss, standpipe_pressure: [psi] (flow rates,)
+        - internal_pressure, external_pressure: [psi] inside and outside
+          the string at every station
+        - ecd: [ppg] equivalent circulating density at every station
+    """
+    well_path = WellPath.from_well_data(well_path)
+    flow_rates = np.asarray(flow_rates, dtype=float).ravel()[:, None]
+    lengths = well_path.chord_lengths
+    md = well_path.along_hole_depth
+    tvd = well_path.z - well_path.z[0]
+
+    # Dimensions of the string at every station
+    columns = string_columns(md, drillpipe, drillcollar, collar_length)
+    inner, outer = columns.inner_diameter, columns.outer_diameter
+    hole = drillpipe.hole_diameter
+    rheology = (mud_weight, plastic_viscosity, yield_point)
+
+    # Segment i (station i-1 to i) has the dimensions of station i
+    bore = pipe_gradient(flow_rates, inner, *rheology) * lengths
+    annulus = annular_gradient(flow_rates, hole, outer, *rheology) * lengths
+
+    # Both flows pass every segment between the surface and a station
+    bore_loss = np.cumsum(bore, axis=1)
+    annular_loss = np.cumsum(annulus, axis=1)
+    annular_total = annular_loss[:, -1:]
+
+    bit_loss = mud_weight * flow_rates**2 / (12031 * nozzle_area**2)
+    standpipe = surface_loss + bore_loss[:, -1:] + bit_loss + annular_total
+
+    hydrostatic = HYDROSTATIC_GRADIENT * mud_weight * tvd
+    external = hydrostatic + annular_loss
+    internal = standpipe - surface_loss - bore_loss + hydrostatic
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ecd = np.where(
+            tvd > 0, mud_weight + annular_loss / (HYDROSTATIC_GRADIENT * tvd), mud_weight
+        )
+
+    return Hydraulics(
+        flow_rate=flow_rates[:, 0],
+        md=md,
+        tvd=tvd,
+        bore_loss=bore_loss,
+        annular_loss=annular_loss,
+        bit_loss=bit_loss[:, 0],
+        standpipe_pressure=standpipe[:, 0],
+        internal_pressure=internal,
+        external_pressure=external,
+        ecd=ecd,
+    )
@@ -4,12 +4,55 @@ Select Drill string model
 This model is used in selecting the best drill string based
 on drill data or well plan data
 """
-import os
+from functools import cached_property
 import pandas as pd
 import numpy as np
 
 from .drill_pipe import DrillPipe
 from .drill_collar import DrillCollar
+from .catalog import (
+    pipe_catalog,
+    collar_catalog,
+    indexed_pipe_catalog,
+    indexed_collar_catalog,
+)
+from .buckling import buckling_profile, neutral_point_lengths
+from drillmodules.well_plan.well_path import WellPath
+
+
+def _ranked(values, quantity, largest=False):
+    """
+    Positions of the `quantity` smallest (or largest) values, in the order
+    a stable ascending argsort gives them, found with a partition instead of
+    a full sort
+    """
+    if largest:
+        # Stable ascending tail: reversed, negated head
+        head = _ranked(-values[::-1], quantity)
+        return (len(values) - 1 - head)[::-1]
+
+    if quantity >= len(values):
+        return np.argsort(values, kind="stable")
+    kth = np.partition(values, quantity - 1)[quantity - 1]
+    if np.isnan(kth):
+        return np.argsort(values, kind="stable")[:quantity]
+
+    below = np.flatnonzero(values < kth)
+    ties = np.flatnonzero(values == kth)[: quantity - len(below)]
+    chosen = np.concatenate((below, ties))
+    return chosen[np.argsort(values[chosen], kind="stable")]
+
+
+def _best_and_worst(scores, candidates, quantity):
+    """
+    Candidate rows with the `quantity` lowest and `quantity` + 1 highest
+    scores, both in accending order of score
+    """
+    candidate_scores = scores[candidates]
+    return (
+        candidates[_ranked(candidate_scores, quantity)],
+        candidates[_ranked(candidate_scores, quantity + 1, largest=True)],
+    )
 
 
 class SelectDrillPipe:
@@ -31,6 +74,9 @@ class SelectDrillPipe:
         buoyancy_factor,
         drill_strings_data: pd.Series,
         well_data: pd.Series,
+        WOB=20000,
+        drillcollar=None,
+        collar_length=None,
     ):
         """
         Initializes the drill strings
@@ -40,8 +86,11 @@ class SelectDrillPipe:
             - friction_co: Friction coefficient
             - string_force: Force on string
             - youngs_modulus: Young's modulus
-            - internal_fluid_pressure: Internal fluid pressure
-            - external_fluid_pressure: External fluid pressure- inner_mud_weight: Inner mud weight
+            - internal_fluid_pressure: Internal fluid pressure (scalar or per
+                    station, e.g. from `circulating_hydraulics`); None for
+                    hydrostatic from inner_mud_weight
+            - external_fluid_pressure: External fluid pressure (scalar or per
+                    station); None for hydrostatic from outer_mud_weight
             - hole_diameter: Diameter of hole
             - inner_mud_weight: Inner mud weight
             - outer_mud_weight: Outer mud weight
@@ -50,90 +99,139 @@ class SelectDrillPipe:
                     ['pipe_weight', 'pipe_outer_diameter', 'pipe_inner_diameter']...
 
             - well_data: pd dataframe of the well path with columns,
-                    ['inclination', 'azimuth', 'md']
+                    ['inclination', 'azimuth', 'md'], or a `WellPath`
+            - WOB: Weight on bit; the pipes are checked for sinusoidal
+                    buckling against their effective axial force profile
+                    (see `buckling_profile`) above `collar_length` of
+                    `drillcollar`
+            - drillcollar: `DrillCollar` below the pipes, e.g. from
+                    `SelectDrillCollar.drill_collar`; None for pipe only
+            - collar_length: Length of the collars; the drill collar's own
+                    `collar_length` by default
         """
 
-        _drill_strings_data = [
-            {
-                "friction_co": friction_co,
-                "string_force": string_force,
-                "youngs_modulus": youngs_modulus,
-                "internal_fluid_pressure": internal_fluid_pressure,
-                "external_fluid_pressure": external_fluid_pressure,
-                "hole_diameter": hole_diameter,
-                "inner_mud_weight": inner_mud_weight,
-                "outer_mud_weight": outer_mud_weight,
-                "buoyancy_factor": buoyancy_factor,
-                "pipe_weight": string_data[0],
-                "pipe_outer_diameter": string_data[1],
-                "pipe_inner_diameter": string_data[2],
-                "more_info": {
-                    "Connection": string_data[3],
-                    "Grade": string_data[4],
-                    "Range": string_data[5],
-                    "Wall (in)": string_data[6],
-                    "Adjusted Weight (lb/ft)": string_data[7],
-                    "TJ OD (in)": string_data[8],
-                    "TJ ID (in)": string_data[9],
-                    "TJ YIELD (ft-lbs)": string_data[10],
-                    "MUT Min (ft-lbs)": string_data[11],
-                    "MUT Max (ft-lbs)": string_data[12],
-                    "Prem Tube Tensile (lbs)": string_data[13],
-                },
-            }
-            for string_data in drill_strings_data.itertuples(name=None, index=False)
-        ]
-
-        self.drill_string_objs = np.array([])
-        axial_force = 6.5  # NOTE: Note right
-        for stringData in _drill_strings_data:
-            ds = DrillPipe(**stringData)
-            torques, drags, bucklings = np.array([]), np.array([]), np.array([])
-
-            incs, azis, mds = (
-                np.array(well_data["inclination"]),
-                np.array(well_data["azimuth"]),
-                np.array(well_data["md"]),
-            )
-
-            pre_incl, pre_azi, pre_md = incs[0], azis[0], mds[0]
-            for inc, azi, md in zip(incs, azis, mds):
-                delta_l = md - pre_md
-
-                torque = np.array([ds.get_torque(pre_azi, azi)])
-                drag = np.array([ds.get_drag(pre_azi, azi, pre_incl, inc, delta_l)])
-                buckling = np.array([ds.buckling(axial_force, azi)])
+        common = {
+            "friction_co": friction_co,
+            "string_force": string_force,
+            "youngs_modulus": youngs_modulus,
+            "internal_fluid_pressure": internal_fluid_pressure,
+            "external_fluid_pressure": external_fluid_pressure,
+            "hole_diameter": hole_diameter,
+            "inner_mud_weight": inner_mud_weight,
+            "outer_mud_weight": outer_mud_weight,
+            "buoyancy_factor": buoyancy_factor,
+        }
+        self._common = common
+        self._drill_strings_data = drill_strings_data
+        if collar_length is None:
+            collar_length = getattr(drillcollar, "collar_length", 0)
+
+        # One path for all pipes, so its trigonometry is computed only once
+        well_path = WellPath.from_well_data(well_data)
+
+        # The whole catalog as one pipe with (pipes, 1) columns, so every
+        # kernel broadcasts to a (pipes, stations) matrix
+        dims = drill_strings_data.iloc[:, :3].to_numpy(dtype=float)
+        catalog = DrillPipe(
+            **common,
+            pipe_weight=dims[:, :1],
+            pipe_outer_diameter=dims[:, 1:2],
+            pipe_inner_diameter=dims[:, 2:3],
+        )
+        self._catalog = catalog
+        self._well_path = well_path
+        self._shape = (len(dims), len(well_path))
+
+        profile = buckling_profile(
+            well_path,
+            catalog,
+            drillcollar,
+            collar_length,
+            WOB,
+            internal_pressure=internal_fluid_pressure,
+            external_pressure=external_fluid_pressure,
+        )
+        # Collars buckling are not the pipe's doing
+        if drillcollar is None:
+            in_collars = np.zeros(len(profile.md), dtype=bool)
+        else:
+            in_collars = profile.md >= profile.md[-1] - collar_length
+        self.buckles = np.ascontiguousarray(
+            np.broadcast_to(profile.sinusoidal & ~in_collars, self._shape)
+        )
+        self.buckle_counts = self.buckles.sum(axis=1)
 
-                torques = np.concatenate((torques, torque), axis=0)
-                drags = np.concatenate((drags, drag), axis=0)
-                bucklings = np.concatenate((bucklings, buckling), axis=0)
+        # Remove all strings that buckle at atleast one station
+        self.candidates = np.flatnonzero(self.buckle_counts == 0)
 
-                pre_incl, pre_azi, pre_md = inc, azi, md
+        # If all strings buckle, then return all of them
+        if len(self.candidates) == 0:
+            self.candidates = np.arange(len(dims))
 
-            ds.__setattr__("torques", torques)
-            ds.__setattr__("drags", drags)
-            ds.__setattr__("buckles", bucklings)
-            ds.__setattr__("total_score", 0)
+        self.total_scores = None
 
-            self.drill_string_objs = np.concatenate(
-                (self.drill_string_objs, np.array([ds])), axis=0
-            )
+    @cached_property
+    def torques(self):
+        """(pipes, stations) torque matrix, computed on first access"""
+        return np.ascontiguousarray(
+            np.broadcast_to(self._catalog.get_torques(self._well_path), self._shape)
+        )
 
-        tmp_strings = self.drill_string_objs.copy()
+    @cached_property
+    def drags(self):
+        """(pipes, stations) drag matrix, computed on first access"""
+        return np.ascontiguousarray(
+            np.broadcast_to(self._catalog.get_drags(self._well_path), self._shape)
+        )
 
-        # Remove all strings that buckle at atleast one station
-        self.drill_string_objs = np.array(
-            [obj for obj in self.drill_string_objs if np.nansum(obj.buckles) == 0]
+    def drill_string(self, row):
+        """`DrillPipe` of catalog row `row`, with its torques, drags and buckles"""
+        string_data = self._drill_strings_data.iloc[row].tolist()
+        ds = DrillPipe(
+            **self._common,
+            pipe_weight=string_data[0],
+            pipe_outer_diameter=string_data[1],
+            pipe_inner_diameter=string_data[2],
+            more_info={
+                "Connection": string_data[3],
+                "Grade": string_data[4],
+                "Range": string_data[5],
+                "Wall (in)": string_data[6],
+                "Adjusted Weight (lb/ft)": string_data[7],
+                "TJ OD (in)": string_data[8],
+                "TJ ID (in)": string_data[9],
+                "TJ YIELD (ft-lbs)": string_data[10],
+                "MUT Min (ft-lbs)": string_data[11],
+                "MUT Max (ft-lbs)": string_data[12],
+                "Prem Tube Tensile (lbs)": string_data[13],
+            },
+        )
+        # Only this row of the matrices, unless they are already computed
+        stations = self._shape[1:]
+        for name, kernel in (
+            ("torques", lambda: ds.get_torques(self._well_path)),
+            ("drags", lambda: ds.get_drags(self._well_path)),
+        ):
+            if name in self.__dict__:
+                values = self.__dict__[name][row]
+            else:
+                values = np.broadcast_to(kernel(), stations).copy()
+            setattr(ds, name, values)
+        ds.buckles = self.buckles[row].astype(float)
+        ds.total_score = (
+            self.total_scores[row] if self.total_scores is not None else 0
         )
+        return ds
 
-        # If all strings buckle, then return all of them
-        if len(self.drill_string_objs) == 0:
-            self.drill_string_objs = tmp_strings
+    @property
+    def drill_string_objs(self):
+        """`DrillPipe`s of the candidate strings"""
+        return np.array([self.drill_string(row) for row in self.candidates])
 
-    def _sorted_drill_strings(self, tw=0.1, dw=0.1, bw=0.8):
+    def _scores(self, tw=0.1, dw=0.1, bw=0.8):
         """
-        Sorts drillstrings in decending order of the optimum
-        one for the given well
+        Scores every catalog row (NaN for rows that are not candidates);
+        the higher the score, the less valuable the string is
 
         Input
         -----
@@ -147,71 +245,134 @@ class SelectDrillPipe:
             be considered more in the selection. E.G, torque would be scaled to
             tw / (tw + dw + bw).
 
-        Return
-        ------
-            All drill strings sorted in accending order of best
+            The station work is done once, in `score_components`, so new
+            weights only cost a dot product over the pipes.
         """
+        components, weighted = self.score_components
+        weights = np.array([tw, dw, bw], dtype=float)
+        return components @ np.where(weighted, weights / weights.sum(), 1)
 
-        # max_buckle is 1 since it's a boolean at each station
-        max_torque = 0
-        max_drag = 0
-
-        for string_obj in self.drill_string_objs:
-            max_torque = np.nanmax(
-                np.concatenate((string_obj.torques, np.array([max_torque])), axis=0)
-            )
-            max_drag = np.nanmax(
-                np.concatenate((string_obj.drags, np.array([max_drag])), axis=0)
-            )
+    @cached_property
+    def score_components(self):
+        """
+        Torque, drag and buckling parts of the score of every catalog row,
+        computed on first access
 
-        for string in self.drill_string_objs:
-            # All values are normalized to 0-1
-            normalised_weighted_torques = (
-                (string.torques / max_torque) * (tw / (tw + dw + bw))
-                if max_torque > 0
-                else string.torques
-            )
+        Returns: ((pipes, 3) parts, NaN for rows that are not candidates,
+        and (3,) whether each part is scaled by its weight share). A part
+        is not scaled when its component is never positive, as it can not
+        be normalized.
+        """
+        rows = self.candidates
+        stats = self._component_stats()
+        if stats is None:
+            parts, maxima = self._matrix_components()
+        else:
+            mean_torque, mean_drag, mean_buckle, max_torque, max_drag = stats
+            # Mean over stations of the mean of the three is the mean of
+            # the three row means
+            parts = np.column_stack((mean_torque, mean_drag, mean_buckle)) / 3
+            maxima = (max_torque, max_drag)
+
+        # All values are normalized to 0-1; max_buckle is 1 since it's a
+        # boolean at each station
+        weighted = np.array([maxima[0] > 0, maxima[1] > 0, True])
+        components = np.full((self._shape[0], 3), np.nan)
+        components[rows] = parts / np.where(weighted, maxima + (1,), 1)
+        components.setflags(write=False)
+        weighted.setflags(write=False)
+        return components, weighted
+
+    def _component_stats(self):
+        """
+        Row means of the torques, drags and buckles of the candidates, and
+        the largest torque and drag among them, without the matrices
+
+        torque = pipe_factor * station_factor and drag = force_term +
+        weight_factor * weight_term, so a row mean is a product or a sum of
+        means; the largest product or sum is at the extremes of the pipe
+        factors. Returns None when the stations have NaNs, whose means
+        need the matrices.
+        """
+        rows = self.candidates
+        catalog, well_path = self._catalog, self._well_path
+        pipe_factor, station_factor = catalog.torque_factors(well_path)
+        force_term, weight_factor, weight_term = catalog.drag_terms(well_path)
+        station_terms = (station_factor, force_term, weight_term)
+        if any(np.isnan(np.sum(term)) for term in station_terms):
+            return None
+
+        pipe_factor = np.broadcast_to(pipe_factor, (self._shape[0], 1))[rows, 0]
+        weight_factor = np.broadcast_to(weight_factor, (self._shape[0], 1))[rows, 0]
+        mean_torque = pipe_factor * station_factor.mean()
+        mean_drag = force_term.mean() + weight_factor * weight_term.mean()
+        mean_buckle = self.buckle_counts[rows] / self._shape[1]
+
+        pipe_extremes = [pipe_factor.min(), pipe_factor.max()]
+        station_extremes = [station_factor.min(), station_factor.max()]
+        max_torque = max(np.max(np.outer(pipe_extremes, station_extremes)), 0)
+        max_drag = max(
+            np.max(force_term + weight_factor.min() * weight_term),
+            np.max(force_term + weight_factor.max() * weight_term),
+            0,
+        )
+        return mean_torque, mean_drag, mean_buckle, max_torque, max_drag
 
-            normalised_weighted_drags = (
-                (string.drags / max_drag) * (dw / (tw + dw + bw))
-                if max_drag > 0
-                else string.drags
-            )
+    def _matrix_components(self):
+        """
+        `score_components` parts of the candidates from the (pipes,
+        stations) matrices, ignoring NaNs, and the largest torque and drag
+        """
+        rows = self.candidates
+        torques = self.torques[rows]
+        drags = self.drags[rows]
+        buckles = self.buckles[rows]
+
+        # Mean of the three at every station, ignoring NaNs, then over
+        # stations; the count does not depend on the weights, so every
+        # component is averaged on its own
+        count = 3 - np.isnan(torques).astype(int) - np.isnan(drags)
+        parts = np.column_stack(
+            [
+                np.mean(values / count, axis=1)
+                for values in (np.nan_to_num(torques), np.nan_to_num(drags), buckles)
+            ]
+        )
+        maxima = (np.nanmax(torques, initial=0), np.nanmax(drags, initial=0))
+        return parts, maxima
 
-            normalised_weighted_buckles = string.buckles * bw / (tw + dw + bw)
+    def _sorted_drill_strings(self, tw=0.1, dw=0.1, bw=0.8):
+        """
+        Sorts candidate drillstrings in decending order of the optimum
+        one for the given well (see `_scores` for the weights)
 
-            score_at_stations = np.nanmean(
-                [
-                    normalised_weighted_drags,
-                    normalised_weighted_torques,
-                    normalised_weighted_buckles,
-                ],
-                axis=0,
-            )
-            score = np.nanmean(score_at_stations)
-            string.total_score = score
+        Return
+        ------
+            Catalog rows of the candidate strings sorted in accending
+            order of best
+        """
+        self.total_scores = self._scores(tw, dw, bw)
 
         # Note that the higher the score, the less valuable the string is
-        sorted_indices = np.argsort(
-            [instance.total_score for instance in self.drill_string_objs]
-        )
-        sorted_strings = self.drill_string_objs[sorted_indices]
-
-        return sorted_strings
+        return self.candidates[
+            np.argsort(self.total_scores[self.candidates], kind="stable")
+        ]
 
-    def get_optimum(self, quantity=5):
+    def get_optimum(self, quantity=5, tw=0.1, dw=0.1, bw=0.8):
         """
         Returns a dict with data for string selection
         Other data includes: Best score, Worst score, Average score, Worst strings, Best strings
-        Number of Worst and Best strings returned is `quantity`
+        Number of Worst and Best strings returned is `quantity`; tw, dw and bw
+        weigh torque, drag and buckling (see `_scores`)
         """
-        strings = self._sorted_drill_strings()
+        self.total_scores = scores = self._scores(tw, dw, bw)
+        best, worst = _best_and_worst(scores, self.candidates, quantity)
         data = {
-            "Best score": strings[0].total_score,
-            "Worst score": strings[-1].total_score,
-            "Average score": np.nanmean([s.total_score for s in strings]),
-            f"Worst strings": strings[-quantity - 1 :],
-            f"Best strings": strings[:quantity],
+            "Best score": scores[best[0]],
+            "Worst score": scores[worst[-1]],
+            "Average score": np.nanmean(scores[self.candidates]),
+            f"Worst strings": np.array([self.drill_string(row) for row in worst]),
+            f"Best strings": np.array([self.drill_string(row) for row in best]),
         }
 
         return data
@@ -226,6 +387,8 @@ class SelectDrillCollar:
         outer_mud_weight,
         drill_collars_data: pd.Series,
         well_data: pd.Series,
+        WOB=20000,
+        collar_length=None,
     ):
         """
         Initializes the drill collars
@@ -240,63 +403,94 @@ class SelectDrillCollar:
                     ['collar_weight', 'collar_outer_diameter', 'collar_inner_diameter']
 
             - well_data: pd dataframe of the well path with columns,
-                    ['inclination', 'azimuth', 'md']
+                    ['inclination', 'azimuth', 'md'], or a `WellPath`
+            - WOB: Weight on bit; the collars are checked for sinusoidal
+                    buckling against their effective axial force profile
+                    (see `buckling_profile`)
+            - collar_length: Length of the collars; by default every collar
+                    gets the length that keeps the neutral point in it
+                    (see `neutral_point_lengths`), kept in `collar_lengths`
         """
 
-
-        _drill_collars_data = [
-            {
-                "youngs_modulus": youngs_modulus,
-                "hole_diameter": hole_diameter,
-                "inner_mud_weight": inner_mud_weight,
-                "outer_mud_weight": outer_mud_weight,
-                "collar_weight": collar_data[0],
-                "collar_outer_diameter": collar_data[1],
-                "collar_inner_diameter": collar_data[2],
-                "more_info": {
-                    "Connection": collar_data[3],
-                    "MUT Min (ft-lbs)": collar_data[4],
-                    "MUT Max (ft-lbs)": collar_data[5],
-                    "Type": collar_data[6],
-                },
-            }
-            for collar_data in drill_collars_data.itertuples(name=None, index=False)
-        ]
-
-        self.drill_collar_objs = np.array([])
-        axial_force = 234  # NOTE: Note right
-        for collarData in _drill_collars_data:
-            dc = DrillCollar(**collarData)
-            bucklings = np.array([])
-
-            incs, azis, mds = (
-                np.array(well_data["inclination"]),
-                np.array(well_data["azimuth"]),
-                np.array(well_data["md"]),
+        common = {
+            "youngs_modulus": youngs_modulus,
+            "hole_diameter": hole_diameter,
+            "inner_mud_weight": inner_mud_weight,
+            "outer_mud_weight": outer_mud_weight,
+        }
+        self._common = common
+        self._drill_collars_data = drill_collars_data
+
+        well_path = WellPath.from_well_data(well_data)
+
+        # The whole catalog as one collar with (collars, 1) columns, so the
+        # buckling profile is a (collars, stations) matrix
+        dims = drill_collars_data.iloc[:, :3].to_numpy(dtype=float)
+        catalog = DrillCollar(
+            **common,
+            collar_weight=dims[:, :1],
+            collar_outer_diameter=dims[:, 1:2],
+            collar_inner_diameter=dims[:, 2:3],
+        )
+        self._catalog = catalog
+        self._well_path = well_path
+        self._shape = (len(dims), len(well_path))
+
+        if collar_length is None:
+            collar_length = neutral_point_lengths(well_path, catalog, WOB)
+        self.collar_lengths = np.broadcast_to(
+            np.asarray(collar_length, dtype=float), (len(dims), 1)
+        )[:, 0].copy()
+
+        self.buckles = np.ascontiguousarray(
+            np.broadcast_to(
+                buckling_profile(
+                    well_path, None, catalog, collar_length, WOB
+                ).sinusoidal,
+                self._shape,
             )
+        )
+        counts = self.buckles.sum(axis=1)
+        # Buckled stations; the fraction ranks collars buckling as much by
+        # length, the shorter (lighter, less torque and drag) first
+        self.total_scores = counts + self.collar_lengths / (
+            2 * max(well_path.along_hole_depth[-1], 1)
+        )
 
-            for inc, azi, md in zip(incs, azis, mds):
-
-                buckling = np.array([dc.buckling(axial_force, azi)])
-                bucklings = np.concatenate((bucklings, buckling), axis=0)
-
-            dc.__setattr__("buckles", bucklings)
-            dc.__setattr__("total_score", 0)
-
-            self.drill_collar_objs = np.concatenate(
-                (self.drill_collar_objs, np.array([dc])), axis=0
-            )
+        # Remove all collars that buckle at atleast one station
+        self.candidates = np.flatnonzero(counts == 0)
 
-        tmp_strings = self.drill_collar_objs.copy()
+        # If all collars buckle, then consider all of them
+        if len(self.candidates) == 0:
+            self.candidates = np.arange(len(dims))
 
-        # Remove all collars that buckle at atleast one station
-        self.drill_collar_objs = np.array(
-            [obj for obj in self.drill_collar_objs if np.nansum(obj.buckles) == 0]
+    def drill_collar(self, row):
+        """
+        `DrillCollar` of catalog row `row`, with its buckles and its
+        `collar_length`
+        """
+        collar_data = self._drill_collars_data.iloc[row].tolist()
+        dc = DrillCollar(
+            **self._common,
+            collar_weight=collar_data[0],
+            collar_outer_diameter=collar_data[1],
+            collar_inner_diameter=collar_data[2],
+            more_info={
+                "Connection": collar_data[3],
+                "MUT Min (ft-lbs)": collar_data[4],
+                "MUT Max (ft-lbs)": collar_data[5],
+                "Type": collar_data[6],
+            },
         )
+        dc.buckles = self.buckles[row].astype(float)
+        dc.collar_length = self.collar_lengths[row]
+        dc.total_score = self.total_scores[row]
+        return dc
 
-        # If all collars buckle, then consider all of them
-        if len(self.drill_collar_objs) == 0:
-            self.drill_collar_objs = tmp_strings
+    @property
+    def drill_collar_objs(self):
+        """`DrillCollar`s of the candidate collars"""
+        return np.array([self.drill_collar(row) for row in self.candidates])
 
     def _sorted_drill_collars(self):
         """
@@ -305,19 +499,13 @@ class SelectDrillCollar:
 
         Return
         ------
-            All drill collars sorted in accending order of best
+            Catalog rows of the candidate collars sorted in accending
+            order of best
         """
-
-        for collar in self.drill_collar_objs:
-            collar.total_score = np.sum(collar.buckles)
-            
         # Note that the higher the score, the less valuable the string is
-        sorted_indices = np.argsort(
-            [instance.total_score for instance in self.drill_collar_objs]
-        )
-        sorted_strings = self.drill_collar_objs[sorted_indices]
-
-        return sorted_strings
+        return self.candidates[
+            np.argsort(self.total_scores[self.candidates], kind="stable")
+        ]
 
     def get_optimum(self, quantity=5):
         """
@@ -325,13 +513,14 @@ class SelectDrillCollar:
         Other data includes: Best score, Worst score, Average score, Worst collars, Best collars
         Number of Worst and Best collars returned is `quantity`
         """
-        collars = self._sorted_drill_collars()
+        scores = self.total_scores
+        best, worst = _best_and_worst(scores, self.candidates, quantity)
         data = {
-            "Best score": collars[0].total_score,
-            "Worst score": collars[-1].total_score,
-            "Average score": np.nanmean([s.total_score for s in collars]),
-            f"Worst collars": collars[-quantity - 1 :],
-            f"Best collars": collars[:quantity],
+            "Best score": scores[best[0]],
+            "Worst score": scores[worst[-1]],
+            "Average score": np.nanmean(scores[self.candidates]),
+            f"Worst collars": np.array([self.drill_collar(row) for row in worst]),
+            f"Best collars": np.array([self.drill_collar(row) for row in best]),
         }
 
         return data
@@ -345,15 +534,15 @@ def selected_drill_pipes(
     inner_mud_weight=15,
     outer_mud_weight=7.3,
     hole_diameter=10,
-    internal_fluid_pressure=12800,
-    external_fluid_pressure=4790,
+    internal_fluid_pressure=None,
+    external_fluid_pressure=None,
     buoyancy_factor=0.8,
+    constraints=None,
+    WOB=20000,
+    drillcollar=None,
+    collar_length=None,
 ):
-    drill_strings_api_sheet_path = os.path.dirname(os.path.realpath(__file__))
-    drill_strings_data = pd.read_excel(
-        os.path.join(drill_strings_api_sheet_path, "drill_pipes_api_sheet.xlsx")
-    )
-    drill_strings_data = drill_strings_data[
+    drill_strings_data = pipe_catalog().frame(
         [
             "Nominal Weight (lb/ft)",
             "OD (in)",
@@ -370,8 +559,11 @@ def selected_drill_pipes(
             "MUT Max (ft-lbs)",
             "Prem Tube Tensile (lbs)",
         ]
-    ]
-    # TODO: Investigate removing above reordering
+    )
+    # Only the pipes meeting the constraints, see `PipeCatalog.mask`
+    if constraints:
+        rows = indexed_pipe_catalog().rows(**constraints)
+        drill_strings_data = drill_strings_data.iloc[rows].reset_index(drop=True)
     drill_strings_data[
         ["Nominal Weight (lb/ft)", "OD (in)", "TUBE ID (in)"]
     ] = drill_strings_data[
@@ -392,6 +584,9 @@ def selected_drill_pipes(
         buoyancy_factor=buoyancy_factor,
         well_data=well_data,
         drill_strings_data=drill_strings_data,
+        WOB=WOB,
+        drillcollar=drillcollar,
+        collar_length=collar_length,
     )
 
     return string_selection
@@ -403,12 +598,11 @@ def selected_drill_collars(
     inner_mud_weight=15,
     outer_mud_weight=7.3,
     hole_diameter=10,
+    constraints=None,
+    WOB=20000,
+    collar_length=None,
 ):
-    drill_collars_api_sheet_path = os.path.dirname(os.path.realpath(__file__))
-    drill_collars_data = pd.read_excel(
-        os.path.join(drill_collars_api_sheet_path, "drill_collars_api_sheet.xlsx")
-    )
-    drill_collars_data = drill_collars_data[
+    drill_collars_data = collar_catalog().frame(
         [
             "Adjusted Weight (lb/ft)",
             "OD (in)",
@@ -418,8 +612,11 @@ def selected_drill_collars(
             "MUT Max (ft-lbs)",
             "Type",
         ]
-    ]
-    # TODO: Investigate removing above reordering
+    )
+    # Only the collars meeting the constraints, see `CollarCatalog.mask`
+    if constraints:
+        rows = indexed_collar_catalog().rows(**constraints)
+        drill_collars_data = drill_collars_data.iloc[rows].reset_index(drop=True)
     drill_collars_data[
         ["Adjusted Weight (lb/ft)", "OD (in)", "Collar ID (in)"]
     ] = drill_collars_data[
@@ -435,6 +632,8 @@ def selected_drill_collars(
         hole_diameter=hole_diameter,
         well_data=well_data,
         drill_collars_data=drill_collars_data,
+        WOB=WOB,
+        collar_length=collar_length,
     )
 
     return collar_selection
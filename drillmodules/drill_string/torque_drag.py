@@ -0,0 +1,275 @@
+"""
+Torque and Drag module
+
+This module is a soft-string (Johancsik) torque and drag model: the
+string lies on the low or high side of the hole, the contact force of
+every element comes from the tension at its bottom, its weight and the
+bend of the hole, and friction on it adds to the tension (tripping) or to
+the torque (rotating).
+
+Loads are accumulated from the bit upward with reverse cumulative sums.
+Since the contact force depends on the tension, the sums of the tripping
+operations are repeated, each time with the contact forces of the
+previous tension profile, until the profile stops changing (a handful of
+sweeps). Rotating, all friction goes to the torque and one sum is enough.
+
+Tripping in, tripping out, rotating off bottom and drilling are computed
+together as the rows of (operations, stations) arrays. Components given
+as (n, 1) columns, e.g. a catalog, give (n, operations, stations) arrays.
+"""
+from collections import namedtuple
+import numpy as np
+
+from drillmodules.well_plan.well_path import WellPath
+
+OPERATIONS = ("trip_in", "trip_out", "rotating", "drilling")
+STEEL_DENSITY = 65.5  # [ppg]
+
+StringColumns = namedtuple(
+    "StringColumns",
+    [
+        "section",
+        "weight",
+        "outer_diameter",
+        "inner_diameter",
+        "youngs_modulus",
+        "inner_mud_weight",
+        "outer_mud_weight",
+    ],
+)
+
+# Section codes of `StringColumns.section`
+PIPE, HEAVY_WEIGHT, COLLAR, EMPTY = range(4)
+
+TorqueDrag = namedtuple(
+    "TorqueDrag",
+    [
+        "operations",
+        "md",
+        "tension",
+        "torque",
+        "normal_force",
+        "hookload",
+        "surface_torque",
+        "sweeps",
+        "converged",
+    ],
+)
+
+
+def _below(values):
+    """Sum over the elements below every station; the bit gets 0"""
+    sums = np.cumsum(values, axis=-1)
+    return sums[..., -1:] - sums
+
+
+def string_columns(
+    md, drillpipe, drillcollar, collar_length, heavy_weight=None, heavy_weight_length=0
+):
+    """
+    Dimensions of the string at every station, from the bit up: collars
+    over `collar_length`, heavy weight pipe over `heavy_weight_length`, then
+    drill pipe. A missing component (None) leaves its stations `EMPTY`,
+    with zero dimensions.
+
+    Input Variables, Units:
+        - md: [ft] along hole depth of the stations, the bit is the last
+        - drillpipe, heavy_weight: `DrillPipe`s or None
+        - drillcollar: `DrillCollar` or None
+        - collar_length, heavy_weight_length: [ft], scalars or (n, 1)
+          columns, one per component row
+
+    Returns: StringColumns with the section code and the weight [lb/ft],
+    outer and inner diameters [in], Young's modulus [psi] and inner and
+    outer mud weights [ppg] at every station
+    """
+    md = np.asarray(md, dtype=float)
+    if drillcollar is None:
+        collar_length = 0
+    if heavy_weight is None:
+        heavy_weight_length = 0
+    collar_length = np.asarray(collar_length, dtype=float)
+    heavy_weight_length = np.asarray(heavy_weight_length, dtype=float)
+    in_collars = (collar_length > 0) & (md >= md[-1] - collar_length)
+    in_heavy_weight = (
+        ~in_collars
+        & (heavy_weight_length > 0)
+        & (md >= md[-1] - (collar_length + heavy_weight_length))
+    )
+    section = np.select([in_collars, in_heavy_weight], [COLLAR, HEAVY_WEIGHT], PIPE)
+    if drillpipe is None:
+        section = np.where(section == PIPE, EMPTY, section)
+
+    pipe_attributes = (
+        "pipe_weight",
+        "pipe_outer_diameter",
+        "pipe_inner_diameter",
+        "youngs_modulus",
+        "inner_mud_weight",
+        "outer_mud_weight",
+    )
+    parts = (
+        (drillpipe, pipe_attributes),
+        (heavy_weight, pipe_attributes),
+        (
+            drillcollar,
+            ("collar_weight", "collar_outer_diameter", "collar_inner_diameter")
+            + pipe_attributes[3:],
+        ),
+    )
+    values = [
+        (0.0,) * 6 if part is None else [getattr(part, name) for name in names]
+        for part, names in parts
+    ]
+    conditions = [section == PIPE, section == HEAVY_WEIGHT, section == COLLAR]
+    return StringColumns(
+        section,
+        *(np.select(conditions, column, 0.0) for column in zip(*values)),
+    )
+
+
+def element_geometry(well_path):
+    """
+    Geometry of the elements between stations, from the station coordinates
+
+    Element i runs from station i-1 to station i; element 0 has no length.
+
+    Returns: (lengths [ft], cos_inc, bends, gravity_normal)
+        - cos_inc: cosine of the element inclination
+        - bends: (stations, 3) change of the hole tangent along the
+          element, the tangent at a station being the mean of its elements
+        - gravity_normal: (stations, 3) part of a unit downward load normal
+          to the element
+    """
+    xyz = np.stack((well_path.x, well_path.y, well_path.z), axis=-1)
+    lengths = well_path.chord_lengths
+
+    chords = np.diff(xyz, axis=0, prepend=xyz[:1])
+    moved = lengths > 0
+    if not moved.any():
+        raise Exception("The well path needs at least two distinct stations!")
+
+    # Elements without length take the direction of the one above them
+    # (or the first one for the top of the path)
+    source = np.maximum.accumulate(np.where(moved, np.arange(len(lengths)), 0))
+    source[~moved & (source == 0)] = np.argmax(moved)
+    units = chords[source] / lengths[source][:, None]
+
+    tangents = units.copy()
+    tangents[:-1] += units[1:]
+    tangents /= np.linalg.norm(tangents, axis=1)[:, None]
+    bends = np.diff(tangents, axis=0, prepend=tangents[:1])
+
+    cos_inc = units[:, 2]
+    gravity_normal = -cos_inc[:, None] * units
+    gravity_normal[:, 2] += 1
+    return lengths, cos_inc, bends, gravity_normal
+
+
+def torque_and_drag(
+    well_path,
+    drillpipe,
+    drillcollar,
+    collar_length,
+    WOB=20000,
+    TOB=3000,
+    friction_co=0.25,
+    mud_weight=10,
+    block_weight=0,
+    heavy_weight=None,
+    heavy_weight_length=0,
+    tolerance=1.0,
+    max_sweeps=50,
+):
+    """
+    Tension and torque along the string for all operations at once
+
+    Input Variables, Units:
+        - well_path: `WellPath` or well data with X, Y, Z; the bit is at
+          the last station and Z is positive down
+        - drillpipe: `DrillPipe`, drillcollar: `DrillCollar` or None
+        - collar_length: [ft] collars just above the bit
+        - heavy_weight: optional `DrillPipe` of heavy weight pipe over
+          `heavy_weight_length` [ft] above the collars
+        - WOB: [lbs] weight on bit while drilling
+        - TOB: [ft-lbs] torque on bit while drilling
+        - friction_co: [] friction factor, a scalar or one per station
+        - mud_weight: [ppg] for the buoyancy of the string
+        - block_weight: [lbs] travelling block weight added to the hookload
+        - tolerance: [lbs] largest change of the tension between sweeps
+        - max_sweeps: sweeps before giving up on the tolerance, at least 1
+
+    Components may have (n, 1) columns as attributes.
+
+    Returns: TorqueDrag with (..., operations, stations) arrays in the
+    order of `OPERATIONS`:
+        - tension: [lbs] effective tension, negative in compression
+        - torque: [ft-lbs]
+        - normal_force: [lbs] side force of the element above every station
+        - hookload, surface_torque: (..., operations) at the first station
+        - sweeps: reverse cumulative sums done
+        - converged: False if the tension still changed by more than
+          `tolerance` after `max_sweeps` sweeps
+    """
+    if max_sweeps < 1:
+        raise Exception(f"At least one sweep is needed, got {max_sweeps}!")
+
+    well_path = WellPath.from_well_data(well_path)
+    lengths, cos_inc, bends, gravity_normal = element_geometry(well_path)
+    md = well_path.along_hole_depth
+
+    # Buoyed weight and radius of every element, with an axis for the
+    # operations before the stations
+    columns = string_columns(
+        md, drillpipe, drillcollar, collar_length, heavy_weight, heavy_weight_length
+    )
+    weight = (columns.weight * (1 - mud_weight / STEEL_DENSITY))[..., None, :]
+    radius = columns.outer_diameter[..., None, :] / 24  # [ft]
+
+    # |T bend + w L gravity_normal|^2 = a T^2 + 2 b T + c for every element
+    load = weight * lengths
+    a = np.einsum("ij,ij->i", bends, bends)
+    b = load * np.einsum("ij,ij->i", bends, gravity_normal)
+    c = load**2 * np.einsum("ij,ij->i", gravity_normal, gravity_normal)
+
+    def normal_forces(tension):
+        return np.sqrt(np.maximum(tension * (a * tension + 2 * b) + c, 0))
+
+    # Operations as rows: loads at the bit, and the axial friction
+    # direction of the tripping rows
+    bit_force = np.array([0.0, 0.0, 0.0, -WOB])[:, None]
+    bit_torque = np.array([0.0, 0.0, 0.0, TOB])[:, None]
+    friction_sign = np.array([-1.0, 1.0])[:, None]
+    tripping = (Ellipsis, slice(0, 2), slice(None))
+    rotating = (Ellipsis, slice(2, 4), slice(None))
+
+    # Rotating rows have no axial friction, so their tension is final;
+    # only the tripping rows are swept
+    tension = bit_force + _below(load * cos_inc)
+    frictionless = tension[tripping].copy()
+    sweep, converged = 0, False
+    for sweep in range(1, max_sweeps + 1):
+        friction = friction_sign * friction_co * normal_forces(tension[tripping])
+        updated = frictionless + _below(friction)
+        converged = np.max(np.abs(updated - tension[tripping])) <= tolerance
+        tension[tripping] = updated
+        if converged:
+            break
+
+    normal_force = normal_forces(tension)
+    torque = np.zeros_like(tension)
+    torque[rotating] = bit_torque[2:] + _below(
+        friction_co * normal_force[rotating] * radius
+    )
+
+    return TorqueDrag(
+        operations=OPERATIONS,
+        md=md,
+        tension=tension,
+        torque=torque,
+        normal_force=normal_force,
+        hookload=tension[..., 0] + block_weight,
+        surface_torque=torque[..., 0],
+        sweeps=sweep,
+        converged=converged,
+    )
@@ -0,0 +1,164 @@
+"""
+Torsional Vibration module
+
+This module models stick-slip of the drill string as a lumped torsional
+pendulum: the top drive turns at the surface RPM, the drill pipe is a
+torsional spring and the BHA (collars plus a third of the pipe) is the
+inertia at the bit. The bit-rock torque is the `rop_tob_drillbotics` TOB,
+raised towards a static value as the bit slows down (velocity weakening),
+which is what drives stick-slip.
+
+All surface RPM x WOB combinations of a grid are integrated together; the
+state of the whole grid is one array, and only time is stepped.
+"""
+from collections import namedtuple
+import numpy as np
+
+from drillmodules.bit.bit_model import rop_tob_drillbotics
+
+GRAVITY = 386.09  # [in/s^2], lbm -> lbf s^2 / in
+RPM_TO_RAD = 2 * np.pi / 60
+
+StickSlipMap = namedtuple(
+    "StickSlipMap",
+    ["WOB", "RPM", "severity", "stick_fraction", "bit_rpm_min", "bit_rpm_max"],
+)
+
+
+def torsional_properties(
+    drillpipe, drillcollar, pipe_length, collar_length, poisson_ratio=0.3
+):
+    """
+    Lumped torsional stiffness and inertia of a drill string
+
+    Input Variables, Units:
+        - drillpipe: `DrillPipe`, drillcollar: `DrillCollar`
+        - pipe_length, collar_length: [ft]
+        - poisson_ratio: [] of the pipe steel
+
+    Returns: (stiffness [in-lbf/rad], inertia [lbf-in-s^2])
+    """
+    shear_modulus = drillpipe.youngs_modulus / (2 * (1 + poisson_ratio))
+    polar_moment = 2 * drillpipe.inertia  # [in^4]
+    stiffness = shear_modulus * polar_moment / (pipe_length * 12)
+
+    def mass_inertia(weight, length, od, id):
+        # Thick walled tube: m (ro^2 + ri^2) / 2
+        return weight * length / GRAVITY * (od**2 + id**2) / 8
+
+    pipe_inertia = mass_inertia(
+        drillpipe.pipe_weight,
+        pipe_length,
+        drillpipe.pipe_outer_diameter,
+        drillpipe.pipe_inner_diameter,
+    )
+    collar_inertia = mass_inertia(
+        drillcollar.collar_weight,
+        collar_length,
+        drillcollar.collar_outer_diameter,
+        drillcollar.collar_inner_diameter,
+    )
+    return stiffness, collar_inertia + pipe_inertia / 3
+
+
+def stick_slip_map(
+    WOB,
+    RPM,
+    drillpipe,
+    drillcollar,
+    pipe_length,
+    collar_length,
+    formation_aggressiveness=0.6,
+    bit_aggressiveness_factor=1.2,
+    D=12.25,
+    static_torque_ratio=1.5,
+    weakening_rpm=20,
+    damping_ratio=0.05,
+    periods=30,
+    steps_per_period=400,
+):
+    """
+    Stick-slip severity over a surface WOB x RPM grid
+
+    Input Variables, Units:
+        - WOB: [lbs] 1D array, RPM: [RPM] 1D array of surface RPMs
+        - drillpipe, drillcollar, pipe_length [ft], collar_length [ft]:
+            the string, see `torsional_properties`
+        - formation_aggressiveness, bit_aggressiveness_factor, D [inches]:
+            as in `rop_tob_drillbotics`
+        - static_torque_ratio: [] bit torque at rest / TOB while drilling
+        - weakening_rpm: [RPM] bit speed over which the torque falls from
+            static to TOB
+        - damping_ratio: [] viscous damping of the string (mud, contact)
+        - periods: natural periods simulated; the first half is skipped as
+            start up transient
+        - steps_per_period: time steps per natural period
+
+    Returns: StickSlipMap with (len(WOB), len(RPM)) arrays:
+        - severity: (max - min bit RPM) / (2 x surface RPM); about 0 for
+          smooth drilling, 1 and above for full stick-slip
+        - stick_fraction: fraction of time the bit is stuck
+        - bit_rpm_min, bit_rpm_max: [RPM]
+    """
+    WOB = np.asarray(WOB, dtype=float).ravel()
+    RPM = np.asarray(RPM, dtype=float).ravel()
+    stiffness, inertia = torsional_properties(
+        drillpipe, drillcollar, pipe_length, collar_length
+    )
+    damping = 2 * damping_ratio * np.sqrt(stiffness * inertia)
+
+    _, _, tob = rop_tob_drillbotics(
+        formation_aggressiveness=formation_aggressiveness,
+        bit_aggressiveness_factor=bit_aggressiveness_factor,
+        WOB=WOB[:, None],
+        RPM=RPM[None, :],
+        Eff=1,
+        D=D,
+        CCS=1,
+        side_force=0,
+        side_cutting_factor=0,
+    )
+    shape = (len(WOB), len(RPM))
+    dynamic_torque = np.broadcast_to(12 * tob, shape)  # [in-lbf]
+    static_torque = static_torque_ratio * dynamic_torque
+    surface_speed = np.broadcast_to(RPM[None, :] * RPM_TO_RAD, shape)
+    weakening_speed = weakening_rpm * RPM_TO_RAD
+
+    period = 2 * np.pi * np.sqrt(inertia / stiffness)
+    dt = period / steps_per_period
+    steps = int(periods * steps_per_period)
+    record_from = steps // 2
+
+    # Start up: top drive at speed, bit at rest, string untwisted
+    twist = np.zeros(shape)
+    speed = np.zeros(shape)
+    speed_min = np.full(shape, np.inf)
+    speed_max = np.zeros(shape)
+    stuck_steps = np.zeros(shape)
+
+    for step in range(steps):
+        drive = stiffness * twist + damping * (surface_speed - speed)
+        stuck = (speed <= 0) & (drive <= static_torque)
+        bit_torque = np.where(
+            stuck,
+            drive,
+            dynamic_torque
+            + (static_torque - dynamic_torque) * np.exp(-speed / weakening_speed),
+        )
+        # Semi-implicit Euler; the bit does not turn backwards
+        speed = np.maximum(speed + dt * (drive - bit_torque) / inertia, 0)
+        twist += dt * (surface_speed - speed)
+
+        if step >= record_from:
+            np.minimum(speed_min, speed, out=speed_min)
+            np.maximum(speed_max, speed, out=speed_max)
+            stuck_steps += stuck
+
+    return StickSlipMap(
+        WOB=WOB,
+        RPM=RPM,
+        severity=(speed_max - speed_min) / (2 * surface_speed),
+        stick_fraction=stuck_steps / (steps - record_from),
+        bit_rpm_min=speed_min / RPM_TO_RAD,
+        bit_rpm_max=speed_max / RPM_TO_RAD,
+    )
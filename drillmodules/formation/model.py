@@ -0,0 +1,149 @@
+"""
+Formation Model module
+
+This module holds a layered 3D earth model: every formation top is a
+depth surface on a regular XY grid, so tops can dip and vary laterally.
+
+Tops are read at any (x, y) by bilinear interpolation of the grid and
+properties (formation aggressiveness, CCS, hardness...) belong to the
+layer a point falls in. All lookups take arrays of points.
+"""
+import hashlib
+
+import numpy as np
+
+from drillmodules.formation.schedule import DepthSchedule, merge_breakpoints
+
+# Lookups of the last few point sets (e.g. a plan's stations) are kept
+CACHE_SIZE = 16
+
+
+class FormationModel:
+    """
+    Layered formation model
+
+    Attributes:
+    -----------
+        - x_grid: Increasing X of the grid columns (nx,)
+        - y_grid: Increasing Y of the grid rows (ny,)
+        - tops: Depth of every layer top on the grid (layers, nx, ny),
+            shallowest layer first
+        - properties: {name: value of every layer (layers,)}
+
+    A layer runs from its top down to the next layer's top; points above
+    the first top are in no layer (index -1, NaN properties). Outside the
+    grid the edge values are held.
+    """
+
+    def __init__(self, x_grid, y_grid, tops, properties):
+        self.x_grid = np.asarray(x_grid, dtype=float)
+        self.y_grid = np.asarray(y_grid, dtype=float)
+        tops = np.asarray(tops, dtype=float).reshape(
+            -1, len(self.x_grid), len(self.y_grid)
+        )
+        # Layers may pinch out but never cross
+        self.tops = np.maximum.accumulate(tops, axis=0)
+        self.properties = {
+            name: np.asarray(values, dtype=float) for name, values in properties.items()
+        }
+        for name, values in self.properties.items():
+            if values.shape != (len(self.tops),):
+                raise Exception(
+                    f"Property '{name}' needs one value per layer ({len(self.tops)})!"
+                )
+        self._cache = {}
+
+    @classmethod
+    def from_schedules(cls, x_range=(0, 1), y_range=(0, 1), **schedules):
+        """
+        Flat layered model from 1D (depth, value) lists or `DepthSchedule`s,
+        e.g. the formations entered in the app sidebar
+
+            FormationModel.from_schedules(
+                formation_aggressiveness=[(0, 0.6), (2000, 0.8)],
+                CCS=[(0, 30000), (3500, 20000)],
+            )
+        """
+        depths, values = merge_breakpoints(*schedules.values())
+        tops = np.broadcast_to(depths[:, None, None], (len(depths), 2, 2))
+        return cls(x_range, y_range, tops, dict(zip(schedules, values)))
+
+    @property
+    def layers(self):
+        return len(self.tops)
+
+    def _cell_weights(self, grid, values):
+        """Lower cell index and fractional position along one grid axis"""
+        if len(grid) == 1:
+            return np.zeros(np.shape(values), dtype=int), np.zeros(np.shape(values))
+        values = np.clip(values, grid[0], grid[-1])
+        idx = np.clip(np.searchsorted(grid, values, side="right") - 1, 0, len(grid) - 2)
+        t = (values - grid[idx]) / (grid[idx + 1] - grid[idx])
+        return idx, t
+
+    def top_depths(self, x, y):
+        """
+        Depth of every layer top at points (x, y)
+
+        Output:
+        -------
+            array (layers, points)
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        i, tx = self._cell_weights(self.x_grid, x)
+        j, ty = self._cell_weights(self.y_grid, y)
+        i1 = np.minimum(i + 1, len(self.x_grid) - 1)
+        j1 = np.minimum(j + 1, len(self.y_grid) - 1)
+
+        tops = self.tops
+        return (
+            tops[:, i, j] * (1 - tx) * (1 - ty)
+            + tops[:, i1, j] * tx * (1 - ty)
+            + tops[:, i, j1] * (1 - tx) * ty
+            + tops[:, i1, j1] * tx * ty
+        )
+
+    def formation_index(self, x, y, z):
+        """Layer index of every point (x, y, z); -1 above the first top"""
+        x, y, z = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (x, y, z)))
+        key = (z.shape, hashlib.sha1(b"".join(v.tobytes() for v in (x, y, z))).digest())
+        index = self._cache.get(key)
+        if index is None:
+            tops = self.top_depths(x.ravel(), y.ravel())
+            index = (np.sum(tops <= z.ravel(), axis=0) - 1).reshape(z.shape)
+            index.setflags(write=False)
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = index
+        return index
+
+    def property_at(self, name, x, y, z):
+        """Value of property `name` at every point (x, y, z)"""
+        index = self.formation_index(x, y, z)
+        values = self.properties[name]
+        return np.where(index >= 0, values[np.maximum(index, 0)], np.nan)[()]
+
+    def rock(self, x, y, z):
+        """
+        Every property at points (x, y, z); the "formation_aggressiveness"
+        and "CCS" arrays go straight into `rop_tob_drillbotics`
+
+        Output:
+        -------
+            {name: values}
+        """
+        return {name: self.property_at(name, x, y, z) for name in self.properties}
+
+    def schedules_at(self, x, y):
+        """
+        The formation column under (x, y) as step `DepthSchedule`s
+
+        Output:
+        -------
+            {name: DepthSchedule}
+        """
+        tops = self.top_depths(x, y)[:, 0]
+        return {
+            name: DepthSchedule(tops, values) for name, values in self.properties.items()
+        }
@@ -0,0 +1,107 @@
+"""
+Depth Schedule module
+
+This module holds properties that change with depth (formation
+aggressiveness, CCS, WOB, RPM...) as sorted numpy breakpoints.
+"""
+import numpy as np
+
+
+class DepthSchedule:
+    """
+    A property as a function of depth
+
+    Lookups are binary searches over the sorted breakpoints, for a single
+    depth or for a whole array of depths at once.
+
+    Attributes:
+    -----------
+        - depths: Sorted breakpoint depths
+        - values: Property value at each breakpoint
+        - kind: "step" holds a value until the next breakpoint (like the
+            (depth, value) lists of `RSSDataGenerator`), "linear"
+            interpolates between breakpoints
+
+    Depths above the first breakpoint have no value (NaN); depths below the
+    last one keep the last value.
+    """
+
+    def __init__(self, depths, values, kind="step"):
+        if kind not in ("step", "linear"):
+            raise Exception(f"Invalid schedule kind, '{kind}'!")
+
+        depths = np.asarray(depths, dtype=float).ravel()
+        values = np.asarray(values, dtype=float).ravel()
+        order = np.argsort(depths, kind="stable")
+
+        self.depths = depths[order]
+        self.values = values[order]
+        self.kind = kind
+        self.depths.setflags(write=False)
+        self.values.setflags(write=False)
+
+    @classmethod
+    def from_pairs(cls, pairs, kind="step"):
+        """
+        Creates a schedule from [(depth, value), ...]; schedules are
+        returned as they are
+        """
+        if isinstance(pairs, cls):
+            return pairs
+        pairs = np.asarray(pairs, dtype=float).reshape(-1, 2)
+        return cls(pairs[:, 0], pairs[:, 1], kind=kind)
+
+    def to_pairs(self):
+        """Returns the schedule as [(depth, value), ...]"""
+        return list(zip(self.depths.tolist(), self.values.tolist()))
+
+    def __len__(self):
+        return len(self.depths)
+
+    def index(self, depth):
+        """Index of the breakpoint in effect at depth(s); -1 above the first"""
+        return np.searchsorted(self.depths, depth, side="right") - 1
+
+    def __call__(self, depth):
+        """
+        Value(s) at depth(s)
+
+        Inputs:
+        -------
+            depth: a depth or an array of depths
+
+        Output:
+        -------
+            float for a scalar depth, else np array
+        """
+        if len(self.depths) == 0:
+            return np.full(np.shape(depth), np.nan)[()]
+
+        if self.kind == "linear":
+            return np.interp(depth, self.depths, self.values, left=np.nan)[()]
+
+        idx = self.index(depth)
+        return np.where(idx >= 0, self.values[np.maximum(idx, 0)], np.nan)[()]
+
+    def at_stations(self, station_depths):
+        """Precomputes the value at every station, for O(1) lookups later"""
+        return np.asarray(self(np.asarray(station_depths, dtype=float)), dtype=float)
+
+
+def merge_breakpoints(*schedules):
+    """
+    Depths where any schedule changes, and every schedule's values there
+
+    Inputs:
+    -------
+        schedules: (depth, value) lists or `DepthSchedule`s
+
+    Output:
+    -------
+        (depths, [values of each schedule at depths]); depths above a
+        schedule's first breakpoint take its first value
+    """
+    schedules = [DepthSchedule.from_pairs(s) for s in schedules]
+    depths = np.unique(np.concatenate([s.depths for s in schedules]))
+    values = [s.values[np.clip(s.index(depths), 0, None)] for s in schedules]
+    return depths, values
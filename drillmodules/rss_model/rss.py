@@ -3,7 +3,13 @@ import numpy as np
 from scipy.optimize import minimize
 
 from drillmodules.bit.bit_model import rop_tob_drillbotics
-from drillmodules.well_plan.well_data import calDLS
+from drillmodules.bit.wear import work_increments
+from drillmodules.formation.schedule import DepthSchedule
+from drillmodules.well_plan.well_path import (
+    DOGLEG_AT_EVERY,
+    doglegs_between,
+    tangent_vectors,
+)
 
 
 SECS_IN_HOUR = 3600
@@ -125,6 +131,19 @@ class RSS:
         return self.current_pos
 
 
+def wob_ramp(station_depths, start_WOB=2000, end_WOB=60000):
+    """
+    Default WOB schedule: a step ramp from start_WOB to end_WOB, one step
+    per survey station
+    """
+    well_depth = int(station_depths[-1])
+    delta_station = int(station_depths[1] - station_depths[0])
+    num_steps = int(well_depth // delta_station)
+    delta_WOB = (end_WOB - start_WOB) / num_steps
+    wob_depths = np.arange(0, well_depth, delta_station)[:num_steps]
+    return DepthSchedule(wob_depths, start_WOB + np.arange(len(wob_depths)) * delta_WOB)
+
+
 class RSSDataGenerator:
     def __init__(
         self,
@@ -142,85 +161,138 @@ class RSSDataGenerator:
         side_cutting_factor=1.1,
         t_delta=5,
         minimization_args={"method": "slsqp"},
+        parameter_schedule=None,
+        formation_model=None,
+        bit_wear=None,
     ):
-        stations = []
-        for _, row in plan[["X", "Y", "Z"]].iterrows():
-            stations.append((row["X"], row["Y"], row["Z"]))
-
-        self.stations = stations
-        self.formation_aggressiveness_data = formation_aggressiveness
+        """
+        formation_aggressiveness, CCS: (depth, value) lists or
+            `DepthSchedule`s
+        bit_aggressiveness_factor, Eff, side_cutting_factor: numbers or
+            `DepthSchedule`s (e.g. from `calibrate_bit`)
+        parameter_schedule: optional dict with (depth, value) lists (or
+            `DepthSchedule`s) for "WOB" and "RPM", e.g. from
+            `optimize_parameters`. Replaces the linear WOB ramp and the
+            random RPM when given, except where its values are NaN (e.g.
+            intervals without feasible parameters).
+        formation_model: optional `FormationModel`; formation
+            aggressiveness and CCS are then read at every station's
+            (x, y, z) instead of from the depth lists
+        bit_wear: optional `BitWear`; the bit then dulls with the work of
+            every step, which lowers Eff. A sharp bit is used when None.
+        """
+        station_array = plan[["X", "Y", "Z"]].to_numpy(dtype=float)
+        self.stations = list(map(tuple, station_array))
+        self.station_depths = station_array[:, 2]
+        self.formation_aggressiveness_data = DepthSchedule.from_pairs(formation_aggressiveness)
         self.bit_aggressiveness_factor = bit_aggressiveness_factor
-        
-        well_depth = int(stations[-1][-1])
-        delta_station = int(stations[1][-1] - stations[0][-1])
-        num_steps = int(well_depth // delta_station)
-        start_WOB = 2000
-        end_WOB = 60000
-        delta_WOB = (end_WOB - start_WOB) / num_steps
-        self.pre_WOB = list(zip(range(0, well_depth, delta_station), [start_WOB + i*delta_WOB for i in range(num_steps)]))
-                            
+
+        self.pre_WOB = wob_ramp(self.station_depths)
+        ramp_WOB = self.pre_WOB.at_stations(self.station_depths)
+
         self.RPM_data = RPM
+        self.scheduled_RPM = None
+        if parameter_schedule is not None:
+            self.pre_WOB = DepthSchedule.from_pairs(parameter_schedule["WOB"])
+            self.scheduled_RPM = DepthSchedule.from_pairs(parameter_schedule["RPM"])
         self.Eff = Eff
         self.D = D
-        self.CCS_data = CCS
+        self.CCS_data = DepthSchedule.from_pairs(CCS)
+        self.formation_model = formation_model
+        self.bit_wear = bit_wear
+        # Wear steps done when each station was reached
+        self.station_wear_steps = np.zeros(len(self.stations), dtype=int)
         self.side_cutting_factor = side_cutting_factor
         self.drillcollar = drillcollar
         self.drillpipe = drillpipe
 
+        # Every schedule is looked up once per station, up front
+        self.station_values = {
+            "formation_aggressiveness": self.formation_aggressiveness_data.at_stations(self.station_depths),
+            "WOB": self.pre_WOB.at_stations(self.station_depths),
+            "CCS": self.CCS_data.at_stations(self.station_depths),
+        }
+        for name, coefficient in (
+            ("bit_aggressiveness_factor", bit_aggressiveness_factor),
+            ("Eff", Eff),
+            ("side_cutting_factor", side_cutting_factor),
+        ):
+            self.station_values[name] = (
+                coefficient.at_stations(self.station_depths)
+                if isinstance(coefficient, DepthSchedule)
+                else np.full(len(self.station_depths), coefficient, dtype=float)
+            )
+        # Unscheduled stations fall back to the ramp
+        self.station_values["WOB"] = np.where(
+            np.isnan(self.station_values["WOB"]), ramp_WOB, self.station_values["WOB"]
+        )
+        if formation_model is not None:
+            rock = formation_model.rock(*station_array.T)
+            self.station_values["formation_aggressiveness"] = rock["formation_aggressiveness"]
+            self.station_values["CCS"] = rock["CCS"]
+        if self.scheduled_RPM is not None:
+            self.station_values["RPM"] = self.scheduled_RPM.at_stations(self.station_depths)
+
         self.rss = RSS(
             max_force=max_force,
-            initial_pos=stations[0],
+            initial_pos=self.stations[0],
             t_delta=t_delta,
             minimization_args=minimization_args,
         )
         self.current_pos = 0
 
-    def _get_current_value(self, values):
-        """
-        Given a list of tuples of formation, some_property,
-        chooses the current property based on the self current formation
-        """
-        current_form = self.stations[self.current_pos][-1]
-        for idx, i in enumerate(values):
-            if i[0] <= current_form:
-                try:
-                    if values[idx + 1][0] > current_form:
-                        return i[1]
-                except IndexError:
-                    return i[1]
+    def _station_value(self, name):
+        """Precomputed schedule value at the current station"""
+        return self.station_values[name][self.current_pos]
 
     @property
     def formation_aggressiveness(self):
-        return self._get_current_value(self.formation_aggressiveness_data)
+        return self._station_value("formation_aggressiveness")
 
     @property
     def WOB(self):
-        return self._get_current_value(self.pre_WOB)
+        return self._station_value("WOB")
 
     @property
     def RPM(self):
+        if self.scheduled_RPM is not None and not np.isnan(self._station_value("RPM")):
+            return self._station_value("RPM")
         return self.RPM_data * np.random.uniform(0.75, 1)
 
     @property
     def CCS(self):
-        return self._get_current_value(self.CCS_data)
+        return self._station_value("CCS")
 
     @property
     def side_force(self):
         return self.drillpipe.get_side_cutting_factor()
 
+    @property
+    def wear_factor(self):
+        """Fraction of the sharp bit efficiency left"""
+        if self.bit_wear is None:
+            return 1
+        return self.bit_wear.efficiency_at()
+
+    def wear_at_station(self, station):
+        """Efficiency fraction left when `station` was reached"""
+        if self.bit_wear is None:
+            return 1
+        return self.bit_wear.efficiency_at(self.station_wear_steps[station])
+
     def _getRopAxialRopLatTob(self):
         """Calculates rop, rop_lateral, and tob"""
+        self.current_RPM = self.RPM
         rop, rop_lat, tob = rop_tob_drillbotics(
             formation_aggressiveness=self.formation_aggressiveness,
-            bit_aggressiveness_factor=self.bit_aggressiveness_factor,
+            bit_aggressiveness_factor=self._station_value("bit_aggressiveness_factor"),
             WOB=self.WOB,
-            RPM=self.RPM,
-            Eff=self.Eff,
+            RPM=self.current_RPM,
+            Eff=self._station_value("Eff") * self.wear_factor,
             D=self.D,
             CCS=self.CCS,
             side_force=self.side_force,
-            side_cutting_factor=self.side_cutting_factor,
+            side_cutting_factor=self._station_value("side_cutting_factor"),
         )
 
         return rop, rop_lat, tob
@@ -228,7 +300,9 @@ class RSSDataGenerator:
     def data(self):
         current_z = 0
         pre_sim_coords = np.array([0, 0, 0])
-        pre_md, pre_incli, pre_azi = 0, 0, 0
+        pre_md = 0
+        # Tangent of the previous station, so its trigonometry is reused
+        pre_tangent = tangent_vectors(0.0, 1.0, 0.0, 1.0)
         last_tvd = self.stations[-1][-1]
 
         while last_tvd > current_z:
@@ -247,14 +321,15 @@ class RSSDataGenerator:
             x, y, z = sim_coords
             cur_inclination = np.arctan2(z, np.sqrt(y**2 + x**2))
             cur_azimuth = np.arctan2(x, y)
-            buckling = self.drillpipe._paslay_buckling(cur_azimuth)
-            dls = calDLS(
-                pre_md=pre_md,
-                md=md,
-                pre_azi=pre_azi,
-                azi=cur_azimuth,
-                pre_incli=pre_incli,
-                incli=cur_inclination,
+            sin_azi, cos_azi = np.sin(cur_azimuth), np.cos(cur_azimuth)
+            tangent = tangent_vectors(
+                np.sin(cur_inclination), np.cos(cur_inclination), sin_azi, cos_azi
+            )
+            buckling = self.drillpipe._paslay_buckling_from_sin(sin_azi)
+            dls = (
+                DOGLEG_AT_EVERY * doglegs_between(pre_tangent, tangent) / delta_md
+                if delta_md != 0
+                else 0
             )
 
             _data = SimulatedStation(
@@ -264,19 +339,28 @@ class RSSDataGenerator:
                 tob=tob,
                 wob=self.WOB,
                 md=md,
-                rpm=self.RPM,
+                rpm=self.current_RPM,
                 buckling=buckling,
                 azimuth=cur_azimuth,
                 inclination=cur_inclination,
                 dls=dls,
             )
 
+            if self.bit_wear is not None:
+                self.bit_wear.append(
+                    work_increments(
+                        self.WOB, self.current_RPM, self.CCS, self.rss.t_delta / SECS_IN_HOUR
+                    )
+                )
+
             current_z = sim_coords[-1]
             pre_sim_coords = sim_coords
-            pre_md, pre_incli, pre_azi = md, cur_inclination, cur_azimuth
+            pre_md, pre_tangent = md, tangent
 
             if current_z >= self.stations[self.current_pos][2]:
                 # If we've reached a station, change to the next
+                if self.bit_wear is not None:
+                    self.station_wear_steps[self.current_pos] = len(self.bit_wear)
                 self.current_pos += 1
 
             yield _data
@@ -0,0 +1,139 @@
+"""
+Time to Depth module
+
+This module predicts drilling time along a plan without stepping through
+`RSSDataGenerator.data()`: the ROP of every station comes from the
+formation and parameter schedules in one `rop_tob_drillbotics` call, and
+time is the cumulative sum of dMD / ROP.
+
+Any schedule may also be a batch of what-if schedules; every scenario is
+then predicted in the same vectorized pass.
+"""
+from collections import namedtuple
+import numpy as np
+
+from drillmodules.bit.bit_model import rop_tob_drillbotics
+from drillmodules.bit.wear import wear_profile
+from drillmodules.formation.schedule import DepthSchedule
+from drillmodules.rss_model.rss import wob_ramp
+
+DrillingCurve = namedtuple(
+    "DrillingCurve", ["md", "depth", "rop", "hours", "time", "efficiency"]
+)
+
+
+def _at_stations(value, station_depths):
+    """
+    A number, a schedule or a batch of schedules at the stations
+
+        - number -> number
+        - `DepthSchedule` or [(depth, value)] -> (stations,)
+        - list of `DepthSchedule`s -> (scenarios, stations)
+        - np array -> as it is, it must broadcast to (..., stations)
+    """
+    if np.ndim(value) == 0 and not isinstance(value, DepthSchedule):
+        return value
+    if isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, DepthSchedule):
+        return value.at_stations(station_depths)
+    if all(isinstance(v, DepthSchedule) for v in value):
+        return np.stack([v.at_stations(station_depths) for v in value])
+    return DepthSchedule.from_pairs(value).at_stations(station_depths)
+
+
+def predict_drilling_curve(
+    plan,
+    formation_aggressiveness=[(0, 0.6)],
+    CCS=[(0, 30000)],
+    WOB=None,
+    RPM=130,
+    bit_aggressiveness_factor=1.2,
+    Eff=0.35,
+    D=12.25,
+    formation_model=None,
+    bit_wear=None,
+):
+    """
+    Time vs depth curve of drilling a plan
+
+    Input Variables, Units:
+        - plan: DataFrame with X, Y, Z columns (e.g. `InterpWell.output_data[0]`)
+        - formation_aggressiveness, CCS, WOB [lbs], RPM,
+          bit_aggressiveness_factor, Eff: numbers, schedules, lists of
+          schedules (one per scenario) or arrays (..., stations), with
+          the same meaning as in `RSSDataGenerator`. WOB defaults to the
+          simulator's ramp.
+        - D: [inches] bit diameter
+        - formation_model: optional `FormationModel`, read at every
+          station instead of formation_aggressiveness and CCS
+        - bit_wear: optional `BitWear` of the bit at the start; the bit
+          then dulls along the plan
+
+    Every station is drilled with the parameters of that station, as in
+    `RSSDataGenerator`.
+
+    Returns: DrillingCurve(
+        md: [ft] (stations,), cumulative station to station length,
+        depth: [ft] (stations,) TVD,
+        rop: [ft/hr] (..., stations),
+        hours: [hr] (..., stations) spent reaching every station,
+        time: [hr] (..., stations) cumulative time,
+        efficiency: (..., stations) fraction of the sharp bit efficiency,
+    )
+    """
+    xyz = plan[["X", "Y", "Z"]].to_numpy(dtype=float)
+    depths = xyz[:, 2]
+    segments = np.diff(xyz, axis=0)
+    delta_md = np.concatenate(([0.0], np.sqrt(np.einsum("ij,ij->i", segments, segments))))
+    md = np.cumsum(delta_md)
+
+    if formation_model is not None:
+        rock = formation_model.rock(*xyz.T)
+        formation_aggressiveness, CCS = rock["formation_aggressiveness"], rock["CCS"]
+    if WOB is None:
+        WOB = wob_ramp(depths)
+
+    values = {
+        name: _at_stations(value, depths)
+        for name, value in (
+            ("formation_aggressiveness", formation_aggressiveness),
+            ("CCS", CCS),
+            ("WOB", WOB),
+            ("RPM", RPM),
+            ("bit_aggressiveness_factor", bit_aggressiveness_factor),
+            ("Eff", Eff),
+        )
+    }
+    sharp_rop, _, _ = rop_tob_drillbotics(
+        D=D, side_force=0, side_cutting_factor=0, **values
+    )
+    shape = np.broadcast_shapes(*(np.shape(v) for v in values.values()), depths.shape)
+    sharp_rop = np.broadcast_to(sharp_rop, shape)
+
+    with np.errstate(divide="ignore"):
+        if bit_wear is None:
+            efficiency = np.ones(shape)
+            hours = delta_md / sharp_rop
+        else:
+            efficiency, hours, _ = wear_profile(
+                delta_md,
+                values["WOB"],
+                values["RPM"],
+                values["CCS"],
+                sharp_rop,
+                initial_work=bit_wear.work_at(),
+                wear_coefficient=bit_wear.wear_coefficient,
+                min_efficiency=bit_wear.min_efficiency,
+            )
+    # The first station is where drilling starts
+    hours = np.where(delta_md > 0, hours, 0.0)
+
+    return DrillingCurve(
+        md=md,
+        depth=depths,
+        rop=sharp_rop * efficiency,
+        hours=hours,
+        time=np.cumsum(hours, axis=-1),
+        efficiency=efficiency,
+    )
@@ -0,0 +1,101 @@
+"""
+Sidecar Cache module
+
+This module keeps the parsed content of slow-to-read files (Excel
+workbooks) as numpy arrays in a `.npz` file next to the source, so later
+runs skip the parsing.
+
+A sidecar is used while the source file's modification time is unchanged;
+when the time changes the file is hashed, and only a changed hash means a
+reparse.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+# Bump when a parser's output changes, so old sidecars are ignored
+CACHE_VERSION = 1
+HASH_CHUNK = 1 << 20
+
+
+def sidecar_path(path):
+    """`dir/name.xlsx` -> `dir/.name.xlsx.cache.npz`"""
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}.cache.npz")
+
+
+def file_hash(path):
+    """sha256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_only(arrays):
+    for array in arrays.values():
+        array.setflags(write=False)
+    return arrays
+
+
+def cached_arrays(path, parse, version=CACHE_VERSION):
+    """
+    The arrays `parse(path)` returns, read from the sidecar when current
+
+    Inputs:
+    -------
+        path: source file
+        parse: function path -> {name: np array}; arrays must not be
+            object arrays (strings are fine)
+        version: parser version stored in the sidecar
+
+    Output:
+    -------
+        {name: read only np array}
+    """
+    cache = sidecar_path(path)
+    mtime = os.stat(path).st_mtime_ns
+    content_hash = None
+
+    if os.path.exists(cache):
+        try:
+            with np.load(cache, allow_pickle=False) as stored:
+                arrays = {name: stored[name] for name in stored.files}
+            meta = arrays.pop("__meta__")
+            stored_version, stored_mtime, stored_hash = meta.tolist()
+            if int(stored_version) == version:
+                if int(stored_mtime) == mtime:
+                    return _read_only(arrays)
+                content_hash = file_hash(path)
+                if stored_hash == content_hash:
+                    # Touched but unchanged; remember the new time
+                    _save(cache, arrays, version, mtime, content_hash)
+                    return _read_only(arrays)
+        except (OSError, ValueError, KeyError):
+            pass  # Unreadable sidecar, parse again
+
+    arrays = {name: np.asarray(array) for name, array in parse(path).items()}
+    if content_hash is None:
+        content_hash = file_hash(path)
+    _save(cache, arrays, version, mtime, content_hash)
+    return _read_only(arrays)
+
+
+def _save(cache, arrays, version, mtime, content_hash):
+    """Writes a sidecar; read only locations just go without one"""
+    meta = np.array([str(version), str(mtime), content_hash])
+    # `.name.cache.npz.tmp`; written through a file object so np.savez does
+    # not append another .npz
+    tmp = cache + ".tmp"
+    try:
+        try:
+            with open(tmp, "wb") as f:
+                np.savez(f, __meta__=meta, **arrays)
+            os.replace(tmp, cache)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    except OSError:
+        pass
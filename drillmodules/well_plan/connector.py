@@ -0,0 +1,387 @@
+"""
+Connector module
+
+This module joins (position, tangent) pairs with minimum curvature arcs
+and holds, like `welleng.connector.Connector`, without the dependency.
+
+Every connector solves a whole batch of problems at once: positions and
+vectors are arrays of shape (n, 3) (or (3,) for a single problem) in
+[east, north, down] order, the same as `WellPath.tangents`. Angles are in
+radians and DLS in degrees per `DOGLEG_AT_EVERY` feet.
+
+A connector returns a list of `Section`s (e.g. curve then hold), each
+holding the batch of arcs for one leg. `survey` turns sections into
+stations in the units of a plan from `get_well_data` (inclination in
+radians, azimuth in degrees, DLS in radians per `DOGLEG_AT_EVERY` feet),
+so surveys export and load like any other plan.
+"""
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+from .well_path import DOGLEG_AT_EVERY, doglegs_between, tangent_vectors
+
+# Doglegs smaller than this are treated as straight holds
+MIN_DOGLEG = 1e-9
+
+
+Section = namedtuple(
+    "Section",
+    ["pos1", "vec1", "md1", "pos2", "vec2", "md2", "dogleg", "valid"],
+)
+
+
+def inc_azi_to_vector(inclination, azimuth):
+    """Unit [east, north, down] vectors from inclination and azimuth"""
+    inclination, azimuth = np.asarray(inclination, float), np.asarray(azimuth, float)
+    return tangent_vectors(
+        np.sin(inclination), np.cos(inclination), np.sin(azimuth), np.cos(azimuth)
+    )
+
+
+def vector_to_inc_azi(vectors):
+    """(inclination, azimuth) of unit [east, north, down] vectors"""
+    vectors = np.asarray(vectors, float)
+    inclination = np.arccos(np.clip(vectors[..., 2], -1, 1))
+    azimuth = np.arctan2(vectors[..., 0], vectors[..., 1]) % (2 * np.pi)
+    return inclination, azimuth
+
+
+def _as_batch(values, n=None):
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    if n is not None and len(values) == 1 and n > 1:
+        values = np.repeat(values, n, axis=0)
+    return values
+
+
+def _unit(vectors):
+    norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    return vectors / np.where(norms == 0, 1, norms)[:, None]
+
+
+def _perpendicular(vectors):
+    """Unit vectors perpendicular to unit `vectors`, horizontal where possible"""
+    axis = np.where(np.abs(vectors[:, 2:3]) < 0.9, [[0.0, 0, 1]], [[1.0, 0, 0]])
+    return _unit(np.cross(vectors, axis))
+
+
+def _batch_size(*arrays):
+    return max(len(np.atleast_2d(np.asarray(a, dtype=float))) for a in arrays)
+
+
+def _ratio_factor(dogleg):
+    """Minimum curvature ratio factor 2/dl * tan(dl/2), 1 for straight holds"""
+    dogleg = np.asarray(dogleg, dtype=float)
+    factor = np.ones_like(dogleg)
+    bent = dogleg > MIN_DOGLEG
+    factor[bent] = 2 / dogleg[bent] * np.tan(dogleg[bent] / 2)
+    return factor
+
+
+def _dls_to_curvature(dls):
+    """Curvature in radians per foot from DLS in degrees per 100 ft"""
+    return np.radians(np.asarray(dls, dtype=float)) / DOGLEG_AT_EVERY
+
+
+def _arc(pos1, vec1, vec2, length, md1, valid=None):
+    """Section of one minimum curvature arc between two tangents"""
+    dogleg = doglegs_between(vec1, vec2)
+    pos2 = pos1 + (length * _ratio_factor(dogleg) / 2)[:, None] * (vec1 + vec2)
+    if valid is None:
+        valid = np.ones(len(pos1), dtype=bool)
+    return Section(pos1, vec1, md1, pos2, vec2, md1 + length, dogleg, valid)
+
+
+def connect_hold(pos1, vec1, md, md1=0):
+    """
+    Holds the tangent for a measured depth
+
+    Inputs:
+    -------
+        pos1, vec1: start positions and tangents
+        md: hold lengths
+        md1: start measured depths
+
+    Output:
+    -------
+        [Section]
+    """
+    n = _batch_size(pos1, vec1)
+    pos1, vec1 = _as_batch(pos1, n), _unit(_as_batch(vec1, n))
+    md = np.broadcast_to(np.asarray(md, dtype=float), (n,))
+    md1 = np.broadcast_to(np.asarray(md1, dtype=float), (n,))
+    return [_arc(pos1, vec1, vec1, md, md1)]
+
+
+def connect_vectors(pos1, vec1, vec2, dls=None, md=None, md1=0):
+    """
+    Turns from one tangent to another with a single arc, either at a
+    design DLS or over a given measured depth
+
+    Inputs:
+    -------
+        pos1, vec1: start positions and tangents
+        vec2: end tangents
+        dls: design DLS (degrees per 100 ft); used when `md` is None
+        md: arc lengths
+        md1: start measured depths
+
+    Output:
+    -------
+        [Section]
+    """
+    n = _batch_size(pos1, vec1, vec2)
+    pos1 = _as_batch(pos1, n)
+    vec1, vec2 = _unit(_as_batch(vec1, n)), _unit(_as_batch(vec2, n))
+    md1 = np.broadcast_to(np.asarray(md1, dtype=float), (n,))
+
+    if md is None:
+        if dls is None:
+            raise ValueError("Either dls or md is required!")
+        length = doglegs_between(vec1, vec2) / _dls_to_curvature(dls)
+    else:
+        length = np.broadcast_to(np.asarray(md, dtype=float), (n,))
+
+    return [_arc(pos1, vec1, vec2, length, md1)]
+
+
+def _curve_hold(pos1, vec1, pos2, curvature):
+    """
+    Closed form curve-hold: the build/turn plane holds vec1 and the target,
+    the arc runs until the tangent points at pos2, then holds.
+
+    Returns (tangent half way through the curve, tangent at end of curve,
+    curve length, hold length, valid); the curve may turn by up to 2 pi, so
+    it is cut in two arcs of at most pi each
+    """
+    radius = 1 / curvature
+    d = pos2 - pos1
+    along = np.einsum("ij,ij->i", d, vec1)
+    perp = d - along[:, None] * vec1
+    across = np.sqrt(np.einsum("ij,ij->i", perp, perp))
+
+    # Any normal works when the target is straight ahead
+    fallback = np.cross(vec1, np.array([0.0, 0.0, 1.0]))
+    fallback[np.einsum("ij,ij->i", fallback, fallback) < 1e-12] = [1.0, 0.0, 0.0]
+    normal = np.where((across > 1e-9)[:, None], perp, fallback)
+    normal = _unit(normal - np.einsum("ij,ij->i", normal, vec1)[:, None] * vec1)
+
+    # In plane, the target seen from the arc's centre
+    offset = across - radius
+    centre_distance_sq = along**2 + offset**2
+    valid = centre_distance_sq >= radius**2
+    hold = np.sqrt(np.where(valid, centre_distance_sq - radius**2, 0))
+
+    theta = (np.arctan2(offset, along) + np.arctan2(radius, hold)) % (2 * np.pi)
+    theta[theta > 2 * np.pi - 1e-12] = 0
+
+    def tangent(angle):
+        return np.cos(angle)[:, None] * vec1 + np.sin(angle)[:, None] * normal
+
+    return tangent(theta / 2), tangent(theta), theta * radius, hold, valid
+
+
+def connect_position(pos1, vec1, pos2, dls, md1=0, position_tol=0.1):
+    """
+    Builds/turns at a design DLS until pointing at the target, then holds
+
+    Inputs:
+    -------
+        pos1, vec1: start positions and tangents
+        pos2: target positions
+        dls: design DLS (degrees per 100 ft)
+        md1: start measured depths
+        position_tol: largest landing error (ft) of a valid solution
+
+    Output:
+    -------
+        [curve Section, curve Section, hold Section]; the curve is cut in
+        two halves, as a target behind or beside the start may need a turn
+        of more than pi. `valid` is False where the target is inside the
+        turning circle at that DLS
+    """
+    n = _batch_size(pos1, vec1, pos2)
+    pos1, pos2 = _as_batch(pos1, n), _as_batch(pos2, n)
+    vec1 = _unit(_as_batch(vec1, n))
+    md1 = np.broadcast_to(np.asarray(md1, dtype=float), (n,))
+    curvature = np.broadcast_to(_dls_to_curvature(dls), (n,))
+
+    vec_mid, vec_end, curve_length, hold_length, valid = _curve_hold(
+        pos1, vec1, pos2, curvature
+    )
+
+    curve1 = _arc(pos1, vec1, vec_mid, curve_length / 2, md1)
+    curve2 = _arc(curve1.pos2, vec_mid, vec_end, curve_length / 2, curve1.md2)
+    hold = _arc(curve2.pos2, vec_end, vec_end, hold_length, curve2.md2)
+
+    miss = hold.pos2 - pos2
+    valid &= np.sqrt(np.einsum("ij,ij->i", miss, miss)) <= position_tol
+    return [section._replace(valid=valid) for section in (curve1, curve2, hold)]
+
+
+def connect_position_vector(
+    pos1, vec1, pos2, vec2, dls, md1=0, iterations=50, tol=1e-6, position_tol=0.1
+):
+    """
+    Curve-hold-curve: lands on the target with the requested tangent
+
+    The hold direction is found by fixed point iteration; every iteration
+    updates the whole batch at once.
+
+    Inputs:
+    -------
+        pos1, vec1: start positions and tangents
+        pos2, vec2: target positions and tangents
+        dls: design DLS (degrees per 100 ft) of both curves
+        md1: start measured depths
+        iterations: maximum number of iterations
+        tol: convergence tolerance on the hold direction
+        position_tol: largest landing error (ft) of a valid solution
+
+    Output:
+    -------
+        [curve Section, hold Section, curve Section]; `valid` is False where
+        no solution lands on the target at that DLS
+    """
+    n = _batch_size(pos1, vec1, pos2, vec2)
+    pos1, pos2 = _as_batch(pos1, n), _as_batch(pos2, n)
+    vec1, vec2 = _unit(_as_batch(vec1, n)), _unit(_as_batch(vec2, n))
+    md1 = np.broadcast_to(np.asarray(md1, dtype=float), (n,))
+    curvature = np.broadcast_to(_dls_to_curvature(dls), (n,))
+
+    hold_vec = _unit(pos2 - pos1)
+    for _ in range(iterations):
+        dl1 = doglegs_between(vec1, hold_vec)
+        dl2 = doglegs_between(hold_vec, vec2)
+        arc1 = (dl1 / curvature * _ratio_factor(dl1) / 2)[:, None] * (vec1 + hold_vec)
+        arc2 = (dl2 / curvature * _ratio_factor(dl2) / 2)[:, None] * (hold_vec + vec2)
+        hold = pos2 - pos1 - arc1 - arc2
+        new_hold_vec = _unit(hold)
+        converged = np.max(np.abs(new_hold_vec - hold_vec)) < tol
+        hold_vec = new_hold_vec
+        if converged:
+            break
+
+    dl1 = doglegs_between(vec1, hold_vec)
+    dl2 = doglegs_between(hold_vec, vec2)
+    curve1 = _arc(pos1, vec1, hold_vec, dl1 / curvature, md1)
+    # A hold pointing away from the target means the curves overlap
+    remaining = pos2 - curve1.pos2 - (
+        (dl2 / curvature * _ratio_factor(dl2) / 2)[:, None] * (hold_vec + vec2)
+    )
+    hold_length = np.einsum("ij,ij->i", remaining, hold_vec)
+    valid = hold_length >= -tol
+    hold_length = np.maximum(hold_length, 0)
+
+    hold = _arc(curve1.pos2, hold_vec, hold_vec, hold_length, curve1.md2)
+    curve2 = _arc(hold.pos2, hold_vec, vec2, dl2 / curvature, hold.md2)
+
+    miss = curve2.pos2 - pos2
+    valid &= np.sqrt(np.einsum("ij,ij->i", miss, miss)) <= position_tol
+    return [section._replace(valid=valid) for section in (curve1, hold, curve2)]
+
+
+def chain(*legs):
+    """
+    Joins consecutive connector outputs into one list of sections
+    (use the previous leg's last section `pos2`/`vec2`/`md2` to start the next)
+    """
+    sections = []
+    for leg in legs:
+        sections.extend(leg)
+    return sections
+
+
+def survey(sections, step=10):
+    """
+    Emits stations every `step` feet of MD along batched sections
+
+    All sections of all problems are interpolated in one pass; no loop
+    over problems or stations.
+
+    Inputs:
+    -------
+        sections: list of `Section`s of the same batch, e.g. from `chain`
+        step: MD between stations; every section end is also a station
+
+    Output:
+    -------
+        DataFrame with columns well, X, Y, Z, inclination [rad],
+        azimuth [deg], md, dls [rad per `DOGLEG_AT_EVERY` ft] sorted by
+        well then md, the units of a plan. Invalid problems are left out.
+    """
+    pos1 = np.concatenate([s.pos1 for s in sections])
+    vec1 = np.concatenate([s.vec1 for s in sections])
+    vec2 = np.concatenate([s.vec2 for s in sections])
+    md1 = np.concatenate([s.md1 for s in sections])
+    md2 = np.concatenate([s.md2 for s in sections])
+    dogleg = np.concatenate([s.dogleg for s in sections])
+    well = np.concatenate([np.arange(len(s.md1)) for s in sections])
+    # A problem with any unsolved section is left out entirely
+    valid = np.logical_and.reduce([s.valid for s in sections])[well]
+    first = np.concatenate([np.full(len(s.md1), i == 0) for i, s in enumerate(sections)])
+
+    length = md2 - md1
+    # Stations strictly inside each section plus its end (and start for the first)
+    counts = np.where(valid, np.ceil(length / step).astype(int) + first, 0)
+    counts[valid & (length <= 0)] = first[valid & (length <= 0)].astype(int)
+    total = counts.sum()
+
+    section_idx = np.repeat(np.arange(len(md1)), counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    k = np.arange(total) - starts + (1 - first[section_idx])
+    offset = np.minimum(k * step, length[section_idx])
+
+    sec_len = length[section_idx]
+    theta = dogleg[section_idx]
+    frac = np.divide(offset, sec_len, out=np.zeros(total), where=sec_len > 0)
+
+    v1 = vec1[section_idx]
+    v2 = vec2[section_idx]
+    bent = theta > MIN_DOGLEG
+    # Reversed tangents (theta = pi) leave the arc plane open; any normal works
+    reversed_ = bent & (np.sin(theta) < MIN_DOGLEG)
+    turned = bent & ~reversed_
+    sin_theta = np.where(turned, np.sin(theta), 1)
+
+    # In plane normal of every arc, then the circular arc position/tangent
+    normal = np.where(
+        turned[:, None], (v2 - np.cos(theta)[:, None] * v1) / sin_theta[:, None], 0
+    )
+    normal[reversed_] = _perpendicular(v1[reversed_])
+    angle = frac * theta
+    radius = np.divide(sec_len, theta, out=np.zeros(total), where=bent)
+    along = np.where(bent, radius * np.sin(angle), offset)
+    across = np.where(bent, radius * (1 - np.cos(angle)), 0)
+    xyz = pos1[section_idx] + along[:, None] * v1 + across[:, None] * normal
+    tangents = np.where(
+        bent[:, None], np.cos(angle)[:, None] * v1 + np.sin(angle)[:, None] * normal, v1
+    )
+
+    md = md1[section_idx] + offset
+    order = np.lexsort((md, well[section_idx]))
+    xyz, tangents, md, wells = xyz[order], tangents[order], md[order], well[section_idx][order]
+    inclination, azimuth = vector_to_inc_azi(tangents)
+
+    dls = np.zeros(total)
+    same_well = wells[1:] == wells[:-1]
+    delta_md = np.diff(md)
+    moved = same_well & (delta_md > 0)
+    dls[1:][moved] = (
+        DOGLEG_AT_EVERY
+        * doglegs_between(tangents[:-1][moved], tangents[1:][moved])
+        / delta_md[moved]
+    )
+
+    return pd.DataFrame(
+        {
+            "well": wells,
+            "X": xyz[:, 0],
+            "Y": xyz[:, 1],
+            "Z": xyz[:, 2],
+            "inclination": inclination,
+            "azimuth": np.degrees(azimuth),
+            "md": md,
+            "dls": dls,
+        }
+    )
@@ -0,0 +1,222 @@
+"""
+Diff module
+
+This module compares two well paths, e.g. two `InterpWell` revisions or a
+plan against the stations yielded by `RSSDataGenerator.data()`.
+
+Both paths are resampled onto one common measured depth grid and compared
+station by station: 3D separation, inclination, azimuth and DLS deltas.
+Angles are in radians and DLS in radians per `DOGLEG_AT_EVERY` ft, the
+units of the `dls` columns of plans and simulated stations.
+"""
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+from .well_path import DOGLEG_AT_EVERY, WellPath, doglegs_between
+
+
+PathDiff = namedtuple(
+    "PathDiff",
+    [
+        "md",
+        "separation",
+        "delta_x",
+        "delta_y",
+        "delta_z",
+        "delta_inclination",
+        "delta_azimuth",
+        "delta_dls",
+        "summary",
+    ],
+)
+
+
+def path_arrays(path):
+    """
+    Extracts along-hole depths from the surface and coordinates of a path
+
+    Simulated stations carry their along-hole depth from the surface in
+    `md`, and the first of them is already one step below it. A plan's
+    `md` column is the distance from the origin, not along hole, so plans
+    are measured with `WellPath.along_hole_depth` from their first
+    station, the surface.
+
+    Inputs:
+    -------
+        path: `WellPath`, plan DataFrame/dict (as from `get_well_data`)
+            starting at the surface, or an iterable of `SimulatedStation`s
+
+    Output:
+    -------
+        (md, xyz) with shapes (n,) and (n, 3)
+    """
+    if isinstance(path, (WellPath, pd.DataFrame, dict)):
+        well_path = WellPath.from_well_data(path)
+        xyz = np.column_stack((well_path.x, well_path.y, well_path.z))
+        md = well_path.along_hole_depth
+    else:
+        stations = list(path)
+        xyz = np.array([station.coordinates for station in stations], dtype=float)
+        md = np.array([station.md for station in stations], dtype=float)
+
+    # Repeated stations would give a non increasing grid for np.interp
+    keep = np.concatenate(([True], np.diff(md) > 0))
+    return md[keep], xyz[keep]
+
+
+def _norm(vectors):
+    return np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+
+
+def _resample(md, xyz, grid):
+    return np.column_stack([np.interp(grid, md, xyz[:, i]) for i in range(3)])
+
+
+def _tangents(xyz):
+    """Unit tangents of a resampled path from central differences"""
+    tangents = np.empty_like(xyz)
+    tangents[1:-1] = xyz[2:] - xyz[:-2]
+    tangents[0] = xyz[1] - xyz[0]
+    tangents[-1] = xyz[-1] - xyz[-2]
+    norms = _norm(tangents)
+    norms[norms == 0] = 1
+    return tangents / norms[:, None]
+
+
+def _inc_azi(tangents):
+    inclination = np.arccos(np.clip(tangents[:, 2], -1, 1))
+    azimuth = np.arctan2(tangents[:, 0], tangents[:, 1])
+    return inclination, azimuth
+
+
+def _dls(tangents, grid):
+    """DLS in radians per 100 ft between consecutive grid stations"""
+    doglegs = doglegs_between(tangents[:-1], tangents[1:])
+    dls = np.zeros(len(grid))
+    dls[1:] = DOGLEG_AT_EVERY * doglegs / np.diff(grid)
+    return dls
+
+
+def common_grid(md_a, md_b, step=None):
+    """
+    Measured depth grid covering the overlap of two paths
+
+    Inputs:
+    -------
+        md_a, md_b: measured depths of both paths
+        step: grid spacing, defaults to the finer median station spacing
+
+    Output:
+    -------
+        np array of measured depths
+    """
+    start = max(md_a[0], md_b[0])
+    stop = min(md_a[-1], md_b[-1])
+    if stop <= start:
+        raise ValueError("The paths do not overlap in measured depth!")
+
+    if step is None:
+        step = min(np.median(np.diff(md_a)), np.median(np.diff(md_b)))
+
+    grid = np.arange(start, stop, step)
+    if grid[-1] < stop:
+        grid = np.append(grid, stop)
+    return grid
+
+
+def diff_paths(reference, compared, step=None, grid=None):
+    """
+    Compares two paths station by station on a common MD grid
+
+    Inputs:
+    -------
+        reference: path the other one is compared against (e.g. the plan)
+        compared: path to compare (e.g. a revision or simulated stations)
+        step: grid spacing (see `common_grid`)
+        grid: explicit MD grid, overrides `step`
+
+    Output:
+    -------
+        A `PathDiff`; every delta is compared - reference. Angles in radians,
+        DLS in radians per 100 ft. `summary` holds the headline statistics.
+    """
+    md_ref, xyz_ref = path_arrays(reference)
+    md_cmp, xyz_cmp = path_arrays(compared)
+
+    if grid is None:
+        grid = common_grid(md_ref, md_cmp, step)
+    grid = np.asarray(grid, dtype=float)
+
+    ref = _resample(md_ref, xyz_ref, grid)
+    cmp = _resample(md_cmp, xyz_cmp, grid)
+    delta = cmp - ref
+    separation = _norm(delta)
+
+    ref_tangents = _tangents(ref)
+    cmp_tangents = _tangents(cmp)
+    ref_inc, ref_azi = _inc_azi(ref_tangents)
+    cmp_inc, cmp_azi = _inc_azi(cmp_tangents)
+
+    delta_inc = cmp_inc - ref_inc
+    # Wrapped to [-pi, pi) so 359° vs 1° is a 2° change
+    delta_azi = (cmp_azi - ref_azi + np.pi) % (2 * np.pi) - np.pi
+    delta_dls = _dls(cmp_tangents, grid) - _dls(ref_tangents, grid)
+
+    return PathDiff(
+        md=grid,
+        separation=separation,
+        delta_x=delta[:, 0],
+        delta_y=delta[:, 1],
+        delta_z=delta[:, 2],
+        delta_inclination=delta_inc,
+        delta_azimuth=delta_azi,
+        delta_dls=delta_dls,
+        summary=summarize(grid, separation, delta_inc, delta_azi, delta_dls),
+    )
+
+
+def summarize(md, separation, delta_inclination, delta_azimuth, delta_dls):
+    """Headline statistics of a path diff"""
+    worst = int(np.argmax(separation))
+    return {
+        "stations": len(md),
+        "max separation": separation[worst],
+        "max separation md": md[worst],
+        "mean separation": separation.mean(),
+        "rms separation": np.sqrt(np.mean(separation**2)),
+        "p95 separation": np.percentile(separation, 95),
+        "final separation": separation[-1],
+        "max abs delta inclination": np.abs(delta_inclination).max(),
+        "max abs delta azimuth": np.abs(delta_azimuth).max(),
+        "max abs delta dls": np.abs(delta_dls).max(),
+    }
+
+
+def changed_intervals(path_diff, tolerance=1.0):
+    """
+    MD intervals where two paths separate by more than `tolerance`
+
+    Output:
+    -------
+        DataFrame with columns md_from, md_to, max_separation
+    """
+    outside = path_diff.separation > tolerance
+    edges = np.diff(outside.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+
+    max_separation = np.array([])
+    if len(starts):
+        # Every reduceat segment is one run followed by its gap, and the gap
+        # is masked out, so each maximum belongs to its run only
+        masked = np.where(outside, path_diff.separation, -np.inf)
+        max_separation = np.maximum.reduceat(masked, starts)
+
+    return pd.DataFrame(
+        {
+            "md_from": path_diff.md[starts],
+            "md_to": path_diff.md[ends],
+            "max_separation": max_separation,
+        }
+    )
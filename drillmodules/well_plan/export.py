@@ -0,0 +1,391 @@
+"""
+Export module
+
+This module streams well plans and simulated trajectories to CSV, LAS 2.0
+and a WITSML-like XML trajectory document.
+
+Every writer consumes its source chunk by chunk, so memory stays constant
+no matter how many stations are written. Sources can be:
+
+    - a pandas DataFrame (e.g. `InterpWell.output_data[0]`)
+    - a dict of equally long arrays
+    - an iterable of DataFrames or dicts (already chunked data)
+    - an iterable of `SimulatedStation`s (e.g. `RSSDataGenerator.data()`)
+
+Plans and simulated stations carry their angles in different units (see
+`PLAN_ANGLE_UNITS`, `STATION_ANGLE_UNITS`), so angles are converted to
+degrees, and DLS to degrees per 100 ft, before they are written.
+"""
+import io
+import os
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 65536
+BUFFER_SIZE = 1 << 20  # 1 MiB write buffer
+
+# Column name -> (LAS mnemonic, unit, description)
+CURVE_INFO = {
+    "md": ("DEPT", "F", "Measured depth"),
+    "X": ("EAST", "F", "Easting"),
+    "Y": ("NORTH", "F", "Northing"),
+    "Z": ("TVD", "F", "True vertical depth"),
+    "inclination": ("INCL", "DEG", "Inclination"),
+    "azimuth": ("AZIM", "DEG", "Azimuth"),
+    "dls": ("DLS", "DEG/100F", "Dogleg severity"),
+    "rop_axial": ("ROP", "F/HR", "Axial rate of penetration"),
+    "rop_lateral": ("ROPL", "F/HR", "Lateral rate of penetration"),
+    "tob": ("TOB", "F-LBS", "Torque on bit"),
+    "wob": ("WOB", "LBS", "Weight on bit"),
+    "rpm": ("RPM", "RPM", "Bit revolutions per minute"),
+    "buckling": ("BUCK", "LBS", "Paslay buckling force"),
+}
+
+# Column name -> WITSML trajectoryStation element
+WITSML_ELEMENTS = {
+    "md": ("md", "ft"),
+    "Z": ("tvd", "ft"),
+    "inclination": ("incl", "dega"),
+    "azimuth": ("azi", "dega"),
+    "Y": ("dispNs", "ft"),
+    "X": ("dispEw", "ft"),
+    "dls": ("dls", "dega/100ft"),
+}
+
+# Angle column -> "rad" or "deg" as carried by plans (`get_well_data`) and
+# by simulated stations; dls is per 100 ft
+PLAN_ANGLE_UNITS = {"inclination": "rad", "azimuth": "deg", "dls": "rad"}
+STATION_ANGLE_UNITS = {"inclination": "rad", "azimuth": "rad", "dls": "rad"}
+
+
+def _open(target, mode="w"):
+    """
+    Returns (file object, should_close) for a path or an open text buffer
+    """
+    if isinstance(target, (str, os.PathLike)):
+        return io.open(target, mode, buffering=BUFFER_SIZE, newline=""), True
+    return target, False
+
+
+def _frame_chunks(frame, chunk_size):
+    for start in range(0, len(frame), chunk_size):
+        chunk = frame.iloc[start : start + chunk_size]
+        yield {col: chunk[col].to_numpy() for col in chunk.columns}
+
+
+def _station_chunks(stations, chunk_size):
+    """Buffers `SimulatedStation`s into columnar chunks of `chunk_size`"""
+    buffer = []
+    for station in stations:
+        buffer.append(station)
+        if len(buffer) == chunk_size:
+            yield _stations_to_columns(buffer)
+            buffer = []
+    if buffer:
+        yield _stations_to_columns(buffer)
+
+
+def _stations_to_columns(stations):
+    coords = np.array([s.coordinates for s in stations], dtype=float)
+    columns = {"X": coords[:, 0], "Y": coords[:, 1], "Z": coords[:, 2]}
+    for field in stations[0]._fields:
+        if field != "coordinates":
+            columns[field] = np.array([getattr(s, field) for s in stations], dtype=float)
+    return columns
+
+
+def _in_degrees(chunks, angle_units):
+    """Chunks with their angle columns converted from `angle_units` to degrees"""
+    for chunk in chunks:
+        for column, unit in angle_units.items():
+            if unit == "rad" and column in chunk:
+                chunk[column] = np.degrees(np.asarray(chunk[column], dtype=float))
+        yield chunk
+
+
+def iter_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE, angle_units=None):
+    """
+    Yields the source as dicts of column arrays of at most `chunk_size` rows,
+    with angles in degrees and DLS in degrees per 100 ft
+
+    Inputs:
+    -------
+        source: DataFrame, dict of arrays, or iterable of chunks/stations
+        chunk_size: maximum number of rows per chunk
+        angle_units: {column: "rad" or "deg"} of the source's angles;
+            `STATION_ANGLE_UNITS` for simulated stations and
+            `PLAN_ANGLE_UNITS` for everything else by default
+
+    Output:
+    -------
+        Generator of {column name: np array}
+    """
+    if isinstance(source, (pd.DataFrame, dict)) or angle_units is not None:
+        yield from _in_degrees(
+            _raw_chunks(source, chunk_size), angle_units or PLAN_ANGLE_UNITS
+        )
+        return
+
+    iterator = iter(source)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return
+    angle_units = (
+        STATION_ANGLE_UNITS if hasattr(first, "_fields") else PLAN_ANGLE_UNITS
+    )
+    yield from _in_degrees(
+        _raw_chunks(_chain(first, iterator), chunk_size), angle_units
+    )
+
+
+def _raw_chunks(source, chunk_size):
+    """`iter_chunks` without the unit conversion"""
+    if isinstance(source, pd.DataFrame):
+        yield from _frame_chunks(source, chunk_size)
+        return
+    if isinstance(source, dict):
+        yield from _frame_chunks(pd.DataFrame(source, copy=False), chunk_size)
+        return
+
+    iterator = iter(source)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return
+
+    if hasattr(first, "_fields"):
+        yield from _station_chunks(_chain(first, iterator), chunk_size)
+        return
+
+    for chunk in _chain(first, iterator):
+        if isinstance(chunk, pd.DataFrame):
+            yield from _frame_chunks(chunk, chunk_size)
+        else:
+            yield from _frame_chunks(pd.DataFrame(chunk, copy=False), chunk_size)
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def _ordered_columns(chunk, columns):
+    """Column order for a chunk, MD first since it indexes the LAS/XML outputs"""
+    if columns is not None:
+        return list(columns)
+    names = list(chunk.keys())
+    if "md" in names:
+        names.remove("md")
+        names.insert(0, "md")
+    return names
+
+
+def _chunk_matrix(chunk, columns):
+    return np.column_stack([np.asarray(chunk[c], dtype=float) for c in columns])
+
+
+def _write_rows(fh, matrix, fmt, delimiter):
+    """Formats a whole chunk into one string and hands it to the buffer"""
+    row_fmt = delimiter.join([fmt] * matrix.shape[1])
+    fh.write("\n".join([row_fmt % row for row in map(tuple, matrix.tolist())]))
+    fh.write("\n")
+
+
+def write_csv(
+    source,
+    target,
+    columns=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    fmt="%.6f",
+    angle_units=None,
+):
+    """
+    Streams the source to a CSV file
+
+    Inputs:
+    -------
+        source: plan or trajectory source (see module docs)
+        target: path or writable text buffer
+        columns: columns to write, defaults to all columns of the first chunk
+        chunk_size: rows formatted per write
+        fmt: number format of every value
+        angle_units: angle units of the source (see `iter_chunks`)
+
+    Output:
+    -------
+        Number of rows written
+    """
+    fh, close = _open(target)
+    rows = 0
+    try:
+        for chunk in iter_chunks(source, chunk_size, angle_units):
+            if rows == 0:
+                columns = _ordered_columns(chunk, columns)
+                fh.write(",".join(columns) + "\n")
+            _write_rows(fh, _chunk_matrix(chunk, columns), fmt, ",")
+            rows += len(chunk[columns[0]])
+    finally:
+        if close:
+            fh.close()
+    return rows
+
+
+def _las_well_line(mnemonic, unit, value, description):
+    return f" {mnemonic:<4}.{unit:<8} {value:>20} : {description}\n"
+
+
+def write_las(
+    source,
+    target,
+    columns=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    well_name="WELL",
+    null_value=-999.25,
+    fmt="%.6f",
+    angle_units=None,
+):
+    """
+    Streams the source to a LAS 2.0 file indexed by measured depth
+
+    The STOP depth is only known after the last chunk, so it is written as a
+    fixed width placeholder and patched in place when the target is seekable.
+
+    Inputs:
+    -------
+        source: plan or trajectory source (see module docs)
+        target: path or writable text buffer
+        columns: curves to write; the first one is the index (md by default)
+        chunk_size: rows formatted per write
+        well_name: WELL value of the ~Well section
+        null_value: value written for NaNs
+        fmt: number format of every value
+        angle_units: angle units of the source (see `iter_chunks`)
+
+    Output:
+    -------
+        Number of rows written
+    """
+    fh, close = _open(target, "w+" if isinstance(target, (str, os.PathLike)) else "w")
+    rows = 0
+    stop_position = None
+    last_depth = null_value
+    try:
+        for chunk in iter_chunks(source, chunk_size, angle_units):
+            if rows == 0:
+                columns = _ordered_columns(chunk, columns)
+                index_unit = CURVE_INFO.get(columns[0], ("", "F", ""))[1]
+                fh.write("~Version Information\n")
+                fh.write(" VERS.                  2.0 : CWLS LOG ASCII STANDARD - VERSION 2.0\n")
+                fh.write(" WRAP.                   NO : One line per depth step\n")
+                fh.write("~Well Information\n")
+                fh.write(_las_well_line("STRT", index_unit, f"{chunk[columns[0]][0]:.4f}", "Start depth"))
+                try:
+                    stop_position = fh.tell()
+                except (OSError, io.UnsupportedOperation):
+                    stop_position = None
+                fh.write(_las_well_line("STOP", index_unit, f"{null_value:.4f}", "Stop depth"))
+                fh.write(_las_well_line("STEP", index_unit, f"{0:.4f}", "Irregular step"))
+                fh.write(_las_well_line("NULL", "", f"{null_value}", "Null value"))
+                fh.write(_las_well_line("WELL", "", well_name, "Well name"))
+                fh.write("~Curve Information\n")
+                for col in columns:
+                    mnemonic, unit, description = CURVE_INFO.get(col, (col.upper(), "", col))
+                    fh.write(f" {mnemonic:<4}.{unit:<8} : {description}\n")
+                fh.write("~ASCII\n")
+
+            matrix = _chunk_matrix(chunk, columns)
+            matrix[np.isnan(matrix)] = null_value
+            _write_rows(fh, matrix, fmt, " ")
+            rows += len(matrix)
+            last_depth = matrix[-1, 0]
+
+        if stop_position is not None and rows:
+            end = fh.tell()
+            fh.seek(stop_position)
+            # Same width as the placeholder so nothing after it moves
+            fh.write(_las_well_line("STOP", index_unit, f"{last_depth:.4f}", "Stop depth"))
+            fh.seek(end)
+    finally:
+        if close:
+            fh.close()
+    return rows
+
+
+def write_witsml(
+    source,
+    target,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    well_name="WELL",
+    trajectory_name="Plan",
+    angle_units=None,
+):
+    """
+    Streams the source to a WITSML 1.4 style trajectory XML document
+
+    Elements whose value is NaN are left out of their station.
+
+    Inputs:
+    -------
+        source: plan or trajectory source (see module docs)
+        target: path or writable text buffer
+        chunk_size: stations formatted per write
+        well_name: nameWell of the trajectory
+        trajectory_name: name of the trajectory
+        angle_units: angle units of the source (see `iter_chunks`)
+
+    Output:
+    -------
+        Number of stations written
+    """
+    fh, close = _open(target)
+    rows = 0
+    try:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        fh.write('<trajectorys xmlns="http://www.witsml.org/schemas/1series" version="1.4.1.1">\n')
+        fh.write(f'  <trajectory uidWell="{_xml_escape(well_name)}" uid="{_xml_escape(trajectory_name)}">\n')
+        fh.write(f"    <nameWell>{_xml_escape(well_name)}</nameWell>\n")
+        fh.write(f"    <name>{_xml_escape(trajectory_name)}</name>\n")
+
+        for chunk in iter_chunks(source, chunk_size, angle_units):
+            present = [col for col in WITSML_ELEMENTS if col in chunk]
+            elements = [
+                f"      <{WITSML_ELEMENTS[col][0]} uom=\"{WITSML_ELEMENTS[col][1]}\">{{:.6f}}</{WITSML_ELEMENTS[col][0]}>\n"
+                for col in present
+            ]
+            template = "".join(elements)
+            matrix = _chunk_matrix(chunk, present)
+            missing = np.isnan(matrix)
+            lines = []
+            for i, (values, gaps) in enumerate(
+                zip(matrix.tolist(), missing.tolist()), start=rows
+            ):
+                lines.append(f'    <trajectoryStation uid="ts{i}">\n')
+                if any(gaps):
+                    lines.extend(
+                        element.format(value)
+                        for element, value, gap in zip(elements, values, gaps)
+                        if not gap
+                    )
+                else:
+                    lines.append(template.format(*values))
+                lines.append("    </trajectoryStation>\n")
+            fh.write("".join(lines))
+            rows += len(matrix)
+
+        fh.write("  </trajectory>\n")
+        fh.write("</trajectorys>\n")
+    finally:
+        if close:
+            fh.close()
+    return rows
+
+
+def _xml_escape(text):
+    return (
+        str(text)
+        .replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+    )
@@ -0,0 +1,194 @@
+"""
+Landing module
+
+This module chooses where to land inside each target's tolerance window.
+
+Targets are tolerance shapes (`CylinderWindow`, `BoxWindow`) rather than
+exact points. Candidate landing points are sampled inside every window and
+whole plans through them are evaluated in batches with `batch_pchip`, the
+same curves `InterpWell` draws with the PchipInterpolator.
+"""
+import numpy as np
+
+from .interpolate import batch_pchip
+from .well_path import DOGLEG_AT_EVERY, doglegs_between
+
+GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+
+
+class CylinderWindow:
+    """
+    Vertical cylinder around a target
+
+    Attributes:
+    -----------
+        - center [x, y, z]
+        - radius: horizontal tolerance
+        - half_height: vertical tolerance above and below the center
+    """
+
+    def __init__(self, center, radius, half_height=0):
+        self.center = np.asarray(center, dtype=float)
+        self.radius = radius
+        self.half_height = half_height
+
+    def candidates(self, n):
+        """About `n` points spread inside the window, the center first"""
+        levels = max(1, int(round(n ** (1 / 3)))) if self.half_height > 0 else 1
+        per_level = max(1, n // levels)
+
+        # Sunflower spiral: evenly spread points on a disc
+        i = np.arange(per_level)
+        r = self.radius * np.sqrt(i / per_level)
+        angle = i * GOLDEN_ANGLE
+        dz = np.linspace(-self.half_height, self.half_height, levels)
+        if levels > 1:
+            # Keep the center level first so candidate 0 is the center
+            dz = dz[np.argsort(np.abs(dz), kind="stable")]
+
+        points = np.empty((levels, per_level, 3))
+        points[:, :, 0] = self.center[0] + r * np.sin(angle)
+        points[:, :, 1] = self.center[1] + r * np.cos(angle)
+        points[:, :, 2] = self.center[2] + dz[:, None]
+        return points.reshape(-1, 3)
+
+
+class BoxWindow:
+    """
+    Axis aligned box around a target
+
+    Attributes:
+    -----------
+        - center [x, y, z]
+        - half_sizes [dx, dy, dz]: tolerance on either side of the center
+    """
+
+    def __init__(self, center, half_sizes):
+        self.center = np.asarray(center, dtype=float)
+        self.half_sizes = np.asarray(half_sizes, dtype=float)
+
+    def candidates(self, n):
+        """About `n` points on a regular grid inside the box, the center first"""
+        free = self.half_sizes > 0
+        per_axis = max(1, int(round(n ** (1 / max(1, free.sum())))))
+        # Odd counts put a grid line through the center
+        per_axis += 1 - per_axis % 2
+        axes = [
+            np.linspace(c - h, c + h, per_axis) if h > 0 else np.array([c])
+            for c, h in zip(self.center, self.half_sizes)
+        ]
+        points = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+        center_idx = np.argmin(np.abs(points - self.center).sum(axis=1))
+        points[[0, center_idx]] = points[[center_idx, 0]]
+        return points
+
+
+def evaluate_plans(surface_coords, kop, targets, samples_per_segment=32):
+    """
+    Max DLS and MD of a batch of plans, each through its own targets
+
+    Inputs:
+    -------
+        surface_coords: [x, y, z] of the rig
+        kop: kick off depth
+        targets: array (plans, targets, 3) of landing points
+        samples_per_segment: curve samples between two targets
+
+    Output:
+    -------
+        (max_dls, md) arrays of shape (plans,). Plans whose targets do not
+        deepen monotonically get inf.
+
+    Note
+    ----
+        DLS here is in degrees per `DOGLEG_AT_EVERY` ft of the sampled
+        curve. The `dls` column of `InterpWell.output_data` is in radians
+        per `DOGLEG_AT_EVERY` ft, between the plan's stations, so the two
+        differ by 180 / pi and by the sampling.
+    """
+    targets = np.asarray(targets, dtype=float)
+    plans = targets.shape[0]
+    surface_x, surface_y, surface_z = surface_coords
+
+    kop_point = np.broadcast_to([surface_x, surface_y, kop], (plans, 1, 3))
+    knots = np.concatenate((kop_point, targets), axis=1)
+    z = knots[:, :, 2]
+    valid = np.all(np.diff(z, axis=1) > 0, axis=1)
+    # Keep invalid plans computable; they are masked at the end
+    z = np.where(valid[:, None], z, np.arange(z.shape[1]) + kop)
+
+    z_samples, xy = batch_pchip(z, knots[:, :, :2], samples_per_segment)
+    points = np.concatenate((xy, z_samples[:, :, None]), axis=2)
+
+    chords = np.diff(points, axis=1)
+    lengths = np.sqrt(np.einsum("pij,pij->pi", chords, chords))
+    directions = chords / np.where(lengths == 0, 1, lengths)[:, :, None]
+
+    # The vertical section above the KOP enters the first chord
+    vertical = np.broadcast_to([0.0, 0.0, 1.0], (plans, 1, 3))
+    directions = np.concatenate((vertical, directions), axis=1)
+    doglegs = np.degrees(doglegs_between(directions[:, :-1], directions[:, 1:]))
+    dls = DOGLEG_AT_EVERY * doglegs / np.where(lengths == 0, np.inf, lengths)
+
+    max_dls = np.where(valid, dls.max(axis=1), np.inf)
+    md = np.where(valid, (kop - surface_z) + lengths.sum(axis=1), np.inf)
+    return max_dls, md
+
+
+def optimize_landing(
+    surface_coords,
+    kop,
+    windows,
+    objective="max_dls",
+    candidates_per_target=2000,
+    sweeps=3,
+    samples_per_segment=32,
+):
+    """
+    Chooses the best landing point inside every target window
+
+    Targets are improved one at a time: all candidates of one window are
+    evaluated in one batch with the other targets held, and sweeps repeat
+    until no landing point changes.
+
+    Inputs:
+    -------
+        surface_coords: [x, y, z] of the rig
+        kop: kick off depth
+        windows: one tolerance window per target, in drilling order
+        objective: "max_dls" or "md"
+        candidates_per_target: about how many points to try in each window
+        sweeps: maximum passes over all targets
+        samples_per_segment: curve samples between two targets
+
+    Output:
+    -------
+        (landing points array (targets, 3), {"max_dls", "md"} of that plan)
+    """
+    if objective not in ("max_dls", "md"):
+        raise Exception(f"Invalid landing objective, '{objective}'!")
+
+    candidates = [window.candidates(candidates_per_target) for window in windows]
+    # Start from the window centers (candidate 0 of every window)
+    chosen = np.array([c[0] for c in candidates])
+
+    def costs(plans):
+        max_dls, md = evaluate_plans(surface_coords, kop, plans, samples_per_segment)
+        # Ties on the main objective are broken by the other one
+        return (max_dls, md) if objective == "max_dls" else (md, max_dls)
+
+    for _ in range(sweeps):
+        changed = False
+        for idx, target_candidates in enumerate(candidates):
+            plans = np.repeat(chosen[None], len(target_candidates), axis=0)
+            plans[:, idx] = target_candidates
+            primary, secondary = costs(plans)
+            best = np.lexsort((secondary, primary))[0]
+            if not np.array_equal(chosen[idx], target_candidates[best]):
+                chosen[idx] = target_candidates[best]
+                changed = True
+        if not changed:
+            break
+
+    max_dls, md = evaluate_plans(surface_coords, kop, chosen[None], samples_per_segment)
+    return chosen, {"max_dls": max_dls[0], "md": md[0]}
@@ -0,0 +1,151 @@
+"""
+Ordering module
+
+This module finds the cheapest order to drill a set of targets, for
+horizontal or fishhook wells where depth order is not the best order.
+
+Costs are analytic and precomputed for every pair and triple of targets:
+a leg costs its straight length (MD) and a target costs the DLS needed to
+turn from the incoming leg onto the outgoing one. A dynamic program over
+subsets of targets (Held-Karp) then finds the best order.
+"""
+from itertools import combinations
+import numpy as np
+
+from .well_path import DOGLEG_AT_EVERY
+
+# Cost of every degree/100 ft above the DLS limit, in feet of MD
+DLS_PENALTY = 1e6
+
+
+def pair_costs(kop_coords, targets):
+    """
+    Leg lengths and directions between every pair of points
+
+    Inputs:
+    -------
+        kop_coords: [x, y, z] of the kick off point
+        targets: array (n, 3) of target coordinates
+
+    Output:
+    -------
+        (lengths (n+1, n+1), unit directions (n+1, n+1, 3)); the kick off
+        point is the last index
+    """
+    points = np.vstack((np.asarray(targets, dtype=float), np.asarray(kop_coords, dtype=float)))
+    legs = points[None, :, :] - points[:, None, :]
+    lengths = np.sqrt(np.einsum("ijk,ijk->ij", legs, legs))
+    directions = legs / np.where(lengths == 0, 1, lengths)[:, :, None]
+    return lengths, directions
+
+
+def turn_dls(lengths, directions):
+    """
+    DLS of turning at j from leg i->j onto leg j->k, for every triple
+
+    The turn is spread over the shorter of the two legs.
+
+    Output:
+    -------
+        (kop_dls (n,), dls (n+1, n, n)) in degrees per 100 ft; kop_dls is
+        the build from vertical at the kick off point onto each first leg
+    """
+    n = lengths.shape[0] - 1
+    kop = n
+
+    vertical = np.array([0.0, 0.0, 1.0])
+    kop_angles = np.degrees(np.arccos(np.clip(directions[kop, :n] @ vertical, -1, 1)))
+    kop_dls = DOGLEG_AT_EVERY * kop_angles / np.where(lengths[kop, :n] == 0, np.inf, lengths[kop, :n])
+
+    incoming = directions[:, :n, None, :]  # i -> j
+    outgoing = directions[None, :n, :n, :]  # j -> k
+    angles = np.degrees(np.arccos(np.clip(np.sum(incoming * outgoing, axis=-1), -1, 1)))
+    spread = np.minimum(lengths[:, :n, None], lengths[None, :n, :n])
+    dls = DOGLEG_AT_EVERY * angles / np.where(spread == 0, np.inf, spread)
+    return kop_dls, dls
+
+
+def order_targets(kop_coords, targets, dls_limit=None):
+    """
+    Cheapest drillable order of a dozen or so targets
+
+    Minimizes total MD with every turn within `dls_limit`; when no order
+    is within the limit, the DLS overshoot is minimized first.
+
+    Inputs:
+    -------
+        kop_coords: [x, y, z] of the kick off point
+        targets: array (n, 3) of target coordinates
+        dls_limit: largest allowed DLS (degrees per 100 ft); None for no limit
+
+    Output:
+    -------
+        (order: indices of targets in drilling order,
+         {"md", "max_dls", "drillable"} of that order)
+    """
+    targets = np.asarray(targets, dtype=float)
+    n = len(targets)
+    if n == 0:
+        return np.array([], dtype=int), {"md": 0.0, "max_dls": 0.0, "drillable": True}
+
+    lengths, directions = pair_costs(kop_coords, targets)
+    kop_dls, dls = turn_dls(lengths, directions)
+    limit = np.inf if dls_limit is None else dls_limit
+
+    def penalty(values):
+        return DLS_PENALTY * np.maximum(values - limit, 0)
+
+    kop = n
+    # step[i, j, k]: turning at j (coming from i) onto leg j->k
+    step = penalty(dls) + lengths[None, :n, :n]
+    step[:, np.arange(n), np.arange(n)] = np.inf
+
+    # cost[mask, prev, last]: cheapest way to visit mask ending prev -> last
+    cost = np.full((1 << n, n + 1, n), np.inf)
+    first = np.arange(n)
+    cost[1 << first, kop, first] = lengths[kop, :n] + penalty(kop_dls)
+
+    for size in range(1, n):
+        masks = np.array([sum(1 << b for b in c) for c in combinations(range(n), size)])
+        # best[m, last, next] = min over prev of cost + turn at last
+        best = np.min(cost[masks][:, :, :, None] + step[None], axis=1)
+
+        in_mask = (masks[:, None] >> np.arange(n)) & 1
+        best = np.where(in_mask[:, None, :] == 1, np.inf, best)
+
+        new_masks = np.broadcast_to(
+            masks[:, None, None] | (1 << np.arange(n))[None, None, :], best.shape
+        )
+        lasts = np.broadcast_to(np.arange(n)[None, :, None], best.shape)
+        nexts = np.broadcast_to(np.arange(n)[None, None, :], best.shape)
+        np.minimum.at(cost, (new_masks.ravel(), lasts.ravel(), nexts.ravel()), best.ravel())
+
+    full = (1 << n) - 1
+    prev, last = np.unravel_index(np.argmin(cost[full]), cost[full].shape)
+    order = _backtrack(cost, step, full, prev, last, n)
+
+    legs = np.concatenate(([lengths[kop, order[0]]], lengths[order[:-1], order[1:]]))
+    turns = [kop_dls[order[0]]]
+    prevs = np.concatenate(([kop], order[:-1]))
+    if n > 1:
+        turns.extend(dls[prevs[:-1], order[:-1], order[1:]])
+    max_dls = float(np.max(turns))
+
+    return order, {
+        "md": float(legs.sum()),
+        "max_dls": max_dls,
+        "drillable": max_dls <= limit,
+    }
+
+
+def _backtrack(cost, step, mask, prev, last, n):
+    """Recovers the order by finding which state each state came from"""
+    order = [last]
+    while prev != n:
+        before = mask & ~(1 << last)
+        # the predecessor of (mask, prev, last) is (before, pp, prev)
+        candidates = cost[before, :, prev] + step[:, prev, last]
+        pp = int(np.argmin(candidates))
+        order.append(prev)
+        mask, prev, last = before, pp, prev
+    return np.array(order[::-1])
@@ -6,6 +6,7 @@ This module contains the class that defines a well
 import numpy as np
 import pandas as pd
 from .well_data import get_well_data
+from .landing import optimize_landing
 
 
 class InterpWell:
@@ -22,6 +23,8 @@ class InterpWell:
         - kop = 0
         - kop_form_aggr = 0.6 (Suitable formation aggresiveness for kickoff)
         - interp_args = {} Extra kwargs for the interpolator choosen
+        - formation_model = None (`FormationModel`, used instead of
+            form_aggr when set)
 
     Interpolator Choices
     --------------------
@@ -53,9 +56,17 @@ class InterpWell:
         self.interp_args = {}
         self.form_aggr = np.array([[0, 0]])
         self.ccs = np.array([[0, 0]])
+        self.formation_model = None
 
     def suggest_kop(self):
-        for station in self.form_aggr[:]:
+        form_aggr = self.form_aggr
+        if self.formation_model is not None:
+            # Formation tops right under the rig
+            form_aggr = self.formation_model.schedules_at(
+                self.surface_coordinates[0], self.surface_coordinates[1]
+            )["formation_aggressiveness"].to_pairs()
+
+        for station in form_aggr[:]:
             if (
                 station[0] >= self.min_kop
                 and station[1] >= self.kop_form_aggr
@@ -64,6 +75,37 @@ class InterpWell:
                 self.kop = station[0]
                 break
 
+    def land_in_windows(self, windows, objective="max_dls", **kwargs):
+        """
+        Planner mode for targets given as tolerance windows
+
+        Replaces the target coordinates with the best landing point inside
+        each window (see `landing.optimize_landing` for kwargs). The
+        landing points are chosen on PchipInterpolator curves, so the well
+        switches to that interpolator.
+
+        Inputs:
+        -------
+            windows: `CylinderWindow`/`BoxWindow` for each target, in order
+            objective: "max_dls" or "md"
+
+        Output:
+        -------
+            {"max_dls", "md"} of the chosen plan; max_dls is in degrees per
+            100 ft, where the `dls` column of `output_data` is in radians
+        """
+        landing, summary = optimize_landing(
+            surface_coords=self.surface_coordinates,
+            kop=self.kop,
+            windows=windows,
+            objective=objective,
+            **kwargs,
+        )
+        self.target_coordinates = landing
+        self.interpolator = "PchipInterpolator"
+
+        return summary
+
     @property
     def output_data(self):
         """
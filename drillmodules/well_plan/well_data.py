@@ -7,6 +7,7 @@ This module contains functions for generating the well data
 import pandas as pd
 import numpy as np
 from .interpolate import WPInterpolator
+from .well_path import WellPath
 
 
 def calAzimuthInc(x, y, z) -> dict:
@@ -72,28 +73,24 @@ def calWellDLS(measured_depth, inclination, azimuth):
     Inputs:
     -------
         md: measured depth
-        incli: inclination
-        azi: azimuth
+        incli: inclination (rad)
+        azi: azimuth (deg), as `calAzimuthInc` gives it
 
     Output:
     -------
         An np array of the dogleg sevierity at every station of the well
+        (rad per 100 feet)
     """
-    dls = np.array([])
-
-    pre_azi, pre_incli, pre_md = 0, 0, 0
-    for md, incli, azi in zip(measured_depth, inclination, azimuth):
-        dls_ = calDLS(
-            pre_md=pre_md,
-            md=md,
-            pre_azi=pre_azi,
-            azi=azi,
-            pre_incli=pre_incli,
-            incli=incli,
-        )
-        dls = np.concatenate((dls, np.array([dls_])), axis=0)
+    path = WellPath(
+        x=np.zeros(len(measured_depth)),
+        y=np.zeros(len(measured_depth)),
+        z=np.zeros(len(measured_depth)),
+        inclination=inclination,
+        azimuth=np.radians(azimuth),
+        md=measured_depth,
+    )
 
-    return dls
+    return path.dls
 
 
 def get_well_data(
@@ -118,7 +115,7 @@ def get_well_data(
     Output:
     -------
         Two Pd data frame with eastings, northings, depths,
-        inclination(rad) and azimuth (rad), dls (deg per 100 feet)
+        inclination(rad) and azimuth (deg), dls (rad per 100 feet)
     """
     surface_x, surface_y, surface_z = surface_coords
     kop_x, kop_y, kop_z = (
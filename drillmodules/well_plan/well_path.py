@@ -0,0 +1,149 @@
+"""
+Well Path module
+
+This module contains the geometry of a well path shared by the DLS,
+drill string and buckling computations
+"""
+from functools import cached_property
+import numpy as np
+
+DOGLEG_AT_EVERY = 100
+
+
+def tangent_vectors(sin_inc, cos_inc, sin_azi, cos_azi):
+    """
+    Unit tangents [east, north, down] from the trigonometry of inclination
+    and azimuth. Works on scalars and arrays alike.
+    """
+    return np.stack(
+        (sin_inc * sin_azi, sin_inc * cos_azi, cos_inc * np.ones_like(sin_azi)),
+        axis=-1,
+    )
+
+
+def doglegs_between(pre_tangents, tangents):
+    """
+    Dogleg angles between tangents; the same as
+    arccos(cos(i1)cos(i2) + sin(i1)sin(i2)cos(a2 - a1))
+    """
+    dots = np.sum(pre_tangents * tangents, axis=-1)
+    return np.arccos(np.clip(dots, -1, 1))
+
+
+class WellPath:
+    """
+    Stations of a well path with lazily computed, memoized trigonometry
+
+    Every derived array is computed on first access and then shared by
+    whoever asks for it, so evaluating a catalog of pipes against the same
+    path computes each sine and cosine once.
+
+    Attributes:
+    -----------
+        - x, y, z: Station coordinates
+        - inclination: Inclination at every station [rad]
+        - azimuth: Azimuth at every station [rad]
+        - md: Measured depth at every station
+    """
+
+    def __init__(self, x, y, z, inclination, azimuth, md):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.z = np.asarray(z, dtype=float)
+        self.inclination = np.asarray(inclination, dtype=float)
+        self.azimuth = np.asarray(azimuth, dtype=float)
+        self.md = np.asarray(md, dtype=float)
+
+    @classmethod
+    def from_well_data(cls, well_data):
+        """
+        Creates a path from `get_well_data`/`InterpWell.output_data` data with
+        columns ['X', 'Y', 'Z', 'inclination', 'azimuth', 'md']; the plan's
+        azimuth is in degrees and is converted to radians
+        """
+        if isinstance(well_data, cls):
+            return well_data
+
+        n = len(well_data["md"])
+        zeros = np.zeros(n)
+        return cls(
+            x=well_data["X"] if "X" in well_data else zeros,
+            y=well_data["Y"] if "Y" in well_data else zeros,
+            z=well_data["Z"] if "Z" in well_data else zeros,
+            inclination=well_data["inclination"],
+            azimuth=np.radians(np.asarray(well_data["azimuth"], dtype=float)),
+            md=well_data["md"],
+        )
+
+    def __len__(self):
+        return len(self.md)
+
+    @cached_property
+    def sin_inc(self):
+        return np.sin(self.inclination)
+
+    @cached_property
+    def cos_inc(self):
+        return np.cos(self.inclination)
+
+    @cached_property
+    def sin_azi(self):
+        return np.sin(self.azimuth)
+
+    @cached_property
+    def cos_azi(self):
+        return np.cos(self.azimuth)
+
+    @cached_property
+    def abs_azimuth(self):
+        return np.abs(self.azimuth)
+
+    @cached_property
+    def tangents(self):
+        """Unit tangent [east, north, down] at every station"""
+        return tangent_vectors(self.sin_inc, self.cos_inc, self.sin_azi, self.cos_azi)
+
+    @cached_property
+    def segment_lengths(self):
+        """MD from the previous station; 0 at the first station"""
+        return np.diff(self.md, prepend=self.md[:1])
+
+    @cached_property
+    def chord_lengths(self):
+        """Straight distance from the previous station; 0 at the first station"""
+        chords = np.zeros(len(self))
+        chords[1:] = np.sqrt(
+            np.diff(self.x) ** 2 + np.diff(self.y) ** 2 + np.diff(self.z) ** 2
+        )
+        return chords
+
+    @cached_property
+    def along_hole_depth(self):
+        """Cumulative chord length from the first station"""
+        return np.cumsum(self.chord_lengths)
+
+    @cached_property
+    def pre_sin_inc(self):
+        """Sine of the previous station's inclination"""
+        return np.concatenate((self.sin_inc[:1], self.sin_inc[:-1]))
+
+    @cached_property
+    def delta_inclination(self):
+        """Absolute inclination change from the previous station"""
+        return np.abs(np.diff(self.inclination, prepend=self.inclination[:1]))
+
+    @cached_property
+    def doglegs(self):
+        """Dogleg angle from the previous station; 0 at the first station"""
+        doglegs = np.zeros(len(self))
+        doglegs[1:] = doglegs_between(self.tangents[:-1], self.tangents[1:])
+        return doglegs
+
+    @cached_property
+    def dls(self):
+        """Dogleg severity per `DOGLEG_AT_EVERY` of MD"""
+        lengths = self.segment_lengths
+        dls = np.zeros(len(self))
+        moved = lengths != 0
+        dls[moved] = DOGLEG_AT_EVERY * self.doglegs[moved] / lengths[moved]
+        return dls
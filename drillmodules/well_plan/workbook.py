@@ -0,0 +1,222 @@
+"""
+Workbook module
+
+This module reads Drillbotics target/formation workbooks (e.g.
+`Pre tries/profiles/Drillbotics2021-Model-Targets-Virtual.xlsx`) into
+arrays, and builds an `InterpWell` and formation schedules from them.
+
+Workbooks are parsed once; the arrays are kept in a sidecar cache (see
+`drillmodules.sidecar`) so later runs never open Excel again.
+
+Expected layout (any sheet, tables may start on any row):
+
+    Target   | X Coordinate (m) | Y Coordinate (m) | Z Coordinate (m)
+    Target_1 | 238.21           | 137.53           | 1164.06
+
+and optionally a formation table with a depth/top column and property
+columns (aggressiveness, CCS, hardness):
+
+    Formation | Top (m) | Aggressiveness | CCS (psi)
+
+Coordinates and depths are converted to feet, the unit of the planner,
+from the unit in their headers (ft when there is none).
+"""
+from collections import namedtuple
+import re
+
+import numpy as np
+
+from drillmodules.formation.model import FormationModel
+from drillmodules.formation.schedule import DepthSchedule
+from drillmodules.sidecar import cached_arrays
+from .well import InterpWell
+
+Workbook = namedtuple(
+    "Workbook", ["target_names", "targets", "valid", "unit", "formations"]
+)
+
+# Length unit of a header -> feet per unit
+FEET_PER_UNIT = {
+    "": 1.0,
+    "ft": 1.0,
+    "feet": 1.0,
+    "m": 1 / 0.3048,
+    "meter": 1 / 0.3048,
+    "meters": 1 / 0.3048,
+    "metre": 1 / 0.3048,
+    "metres": 1 / 0.3048,
+}
+# Version of `parse_workbook`'s output in the sidecar cache
+WORKBOOK_VERSION = 2
+
+# Formation table header keyword -> property name
+FORMATION_PROPERTIES = {
+    "aggress": "formation_aggressiveness",
+    "ccs": "CCS",
+    "hard": "hardness",
+}
+
+
+def _number(value):
+    """Cell value as a float, NaN when it is not a number (e.g. 'c')"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _header(row):
+    return [str(cell).strip().lower() if cell is not None else "" for cell in row]
+
+
+def _unit(header):
+    """Unit in the parentheses of a header, e.g. 'm' for 'x coordinate (m)'"""
+    units = re.findall(r"\((.*?)\)", header)
+    return units[0].strip() if units else ""
+
+
+def _feet_per_unit(unit, path):
+    if unit not in FEET_PER_UNIT:
+        raise Exception(f"Unknown length unit '{unit}' in '{path}'!")
+    return FEET_PER_UNIT[unit]
+
+
+def _table(rows, start):
+    """Rows after a header row, up to the first empty one"""
+    table = []
+    for row in rows[start + 1 :]:
+        if all(cell is None or str(cell).strip() == "" for cell in row):
+            break
+        table.append(row)
+    return table
+
+
+def parse_workbook(path):
+    """
+    Parses a workbook with openpyxl into plain arrays
+
+    Output:
+    -------
+        {name: np array}, as stored in the sidecar cache
+    """
+    import openpyxl
+
+    book = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    rows = [row for sheet in book.worksheets for row in sheet.iter_rows(values_only=True)]
+    book.close()
+
+    names, coordinates, unit = [], [], ""
+    depths, depth_unit, properties = [], "", {}
+    for idx, row in enumerate(rows):
+        header = _header(row)
+        if not header:
+            continue
+
+        if header[0] == "target" and not names:
+            columns = [
+                next(i for i, h in enumerate(header) if h.startswith(axis))
+                for axis in ("x", "y", "z")
+            ]
+            unit = _unit(header[columns[0]])
+            for cells in _table(rows, idx):
+                names.append(str(cells[0]))
+                coordinates.append([_number(cells[c]) for c in columns])
+
+        elif any(key in h for h in header for key in FORMATION_PROPERTIES) and not depths:
+            depth_col = next(
+                (i for i, h in enumerate(header) if "top" in h or "depth" in h), None
+            )
+            if depth_col is None:
+                continue
+            columns = {
+                FORMATION_PROPERTIES[key]: i
+                for i, h in enumerate(header)
+                for key in FORMATION_PROPERTIES
+                if key in h
+            }
+            depth_unit = _unit(header[depth_col])
+            table = _table(rows, idx)
+            depths = [_number(cells[depth_col]) for cells in table]
+            properties = {
+                name: [_number(cells[col]) for cells in table]
+                for name, col in columns.items()
+            }
+
+    return {
+        "target_names": np.array(names, dtype=str),
+        "targets": np.array(coordinates, dtype=float).reshape(-1, 3),
+        "unit": np.array(unit),
+        "depth_unit": np.array(depth_unit),
+        "formation_depths": np.array(depths, dtype=float),
+        "formation_properties": np.array(list(properties), dtype=str),
+        "formation_values": np.array(list(properties.values()), dtype=float).reshape(
+            len(properties), len(depths)
+        ),
+    }
+
+
+def load_workbook(path):
+    """
+    Targets and formations of a workbook, from the sidecar cache when the
+    workbook is unchanged
+
+    Output:
+    -------
+        Workbook(
+            target_names,
+            targets: array (n, 3) [ft], NaN where a cell is not a number,
+            valid: bool array (n,), targets with three numbers,
+            unit: coordinate unit of the sheet's headers, e.g. "m",
+            formations: {property: DepthSchedule} over depths [ft],
+        )
+
+        Units other than those of `FEET_PER_UNIT` are refused.
+    """
+    arrays = cached_arrays(path, parse_workbook, version=WORKBOOK_VERSION)
+    unit = str(arrays["unit"]).lower()
+    targets = arrays["targets"] * _feet_per_unit(unit, path)
+    depths = arrays["formation_depths"] * _feet_per_unit(
+        str(arrays["depth_unit"]).lower(), path
+    )
+
+    formations = {}
+    for name, values in zip(arrays["formation_properties"].tolist(), arrays["formation_values"]):
+        known = np.isfinite(depths) & np.isfinite(values)
+        formations[name] = DepthSchedule(depths[known], values[known])
+
+    return Workbook(
+        target_names=arrays["target_names"].tolist(),
+        targets=targets,
+        valid=np.all(np.isfinite(targets), axis=1),
+        unit=unit,
+        formations=formations,
+    )
+
+
+def load_well(path, well=None):
+    """
+    `InterpWell` with the targets and formations of a workbook
+
+    Targets with a cell that is not a number are left out.
+
+    Inputs:
+    -------
+        path: workbook path
+        well: `InterpWell` to update; a new one by default
+    """
+    workbook = load_workbook(path)
+    well = InterpWell() if well is None else well
+
+    if not workbook.valid.any():
+        raise Exception(f"No valid target in '{path}'!")
+    well.target_coordinates = np.array(workbook.targets[workbook.valid])
+
+    formations = workbook.formations
+    if "formation_aggressiveness" in formations:
+        well.form_aggr = formations["formation_aggressiveness"].to_pairs()
+    if "CCS" in formations:
+        well.ccs = formations["CCS"].to_pairs()
+    if formations:
+        well.formation_model = FormationModel.from_schedules(**formations)
+
+    return well